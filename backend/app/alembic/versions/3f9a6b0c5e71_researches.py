@@ -0,0 +1,68 @@
+"""Researches
+
+Revision ID: 3f9a6b0c5e71
+Revises: e4a8c2d17f05
+Create Date: 2025-09-06 11:48:52.270631
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6b0c5e71'
+down_revision: Union[str, None] = 'e4a8c2d17f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'researches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('response_id', sa.String(), nullable=False),
+        sa.Column('business_id', sa.Integer(), nullable=True),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'CREATED',
+                'IN_PROGRESS',
+                'COMPLETED',
+                'FAILED',
+                name='researchrequeststatusenum',
+            ),
+            nullable=True,
+        ),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+        sa.Column('completion_tokens', sa.Integer(), nullable=True),
+        sa.Column('total_tokens', sa.Integer(), nullable=True),
+        sa.Column('citation_tokens', sa.Integer(), nullable=True),
+        sa.Column('num_search_queries', sa.Integer(), nullable=True),
+        sa.Column('reasoning_tokens', sa.Integer(), nullable=True),
+        sa.Column('research', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('stored_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['business_id'],
+            ['businesses.id'],
+            ondelete='SET NULL',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('response_id'),
+    )
+    op.create_index(
+        op.f('ix_researches_business_id'),
+        'researches',
+        ['business_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_researches_business_id'), table_name='researches')
+    op.drop_table('researches')
+    op.execute('DROP TYPE researchrequeststatusenum')
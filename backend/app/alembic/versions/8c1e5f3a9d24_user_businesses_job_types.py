@@ -0,0 +1,37 @@
+"""User businesses job types
+
+Revision ID: 8c1e5f3a9d24
+Revises: 3f9a6b0c5e71
+Create Date: 2025-09-08 09:35:14.608127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1e5f3a9d24'
+down_revision: Union[str, None] = '3f9a6b0c5e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # New values of an enum can not be used in the transaction adding them, so they
+    # are committed first.
+    with op.get_context().autocommit_block():
+        op.execute(
+            'ALTER TYPE jobtypeenum ADD VALUE IF NOT EXISTS '
+            "'user_businesses_deep_research'"
+        )
+        op.execute(
+            'ALTER TYPE jobtypeenum ADD VALUE IF NOT EXISTS '
+            "'user_businesses_research_deletion'"
+        )
+
+
+def downgrade() -> None:
+    # Note: Values can not be removed from an enum, so the job types are kept.
+    pass
@@ -0,0 +1,47 @@
+"""Payment webhook events
+
+Revision ID: a2f47d6e8b13
+Revises: 8c1e5f3a9d24
+Create Date: 2025-09-10 16:03:41.257384
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2f47d6e8b13'
+down_revision: Union[str, None] = '8c1e5f3a9d24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'payment_webhook_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.String(length=100), nullable=False),
+        sa.Column('type', sa.String(length=100), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum(
+                'processing',
+                'processed',
+                'failed',
+                name='paymentwebhookeventstatusenum',
+            ),
+            nullable=False,
+        ),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('payment_webhook_events')
+    op.execute('DROP TYPE paymentwebhookeventstatusenum')
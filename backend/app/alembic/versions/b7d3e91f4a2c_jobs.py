@@ -0,0 +1,59 @@
+"""Jobs
+
+Revision ID: b7d3e91f4a2c
+Revises: 5c8dbd2b8239
+Create Date: 2025-09-02 10:12:31.482915
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e91f4a2c'
+down_revision: Union[str, None] = '5c8dbd2b8239'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column(
+            'type',
+            sa.Enum('business_deep_research', name='jobtypeenum'),
+            nullable=False,
+        ),
+        sa.Column(
+            'status',
+            sa.Enum('pending', 'running', 'completed', 'failed', name='jobstatusenum'),
+            nullable=False,
+        ),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['user_id'],
+            ['users.id'],
+            ondelete='SET NULL',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_jobs_user_id'), 'jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_jobs_user_id'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_status'), table_name='jobs')
+    op.drop_table('jobs')
+    op.execute('DROP TYPE jobstatusenum')
+    op.execute('DROP TYPE jobtypeenum')
@@ -0,0 +1,56 @@
+"""Chat messages keyset index
+
+Revision ID: d5b8e2f1c047
+Revises: a2f47d6e8b13
+Create Date: 2025-09-12 10:21:08.532117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5b8e2f1c047'
+down_revision: Union[str, None] = 'a2f47d6e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The index is created without locking the table for writes, which can not be
+    # done inside a transaction. It replaces the index on chat_id, which it covers.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_messages_chat_id_time_id',
+            'chat_messages',
+            ['chat_id', 'time', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_chat_messages_chat_id',
+            table_name='chat_messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_messages_chat_id',
+            'chat_messages',
+            ['chat_id'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_chat_messages_chat_id_time_id',
+            table_name='chat_messages',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
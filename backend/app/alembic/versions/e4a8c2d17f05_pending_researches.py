@@ -0,0 +1,59 @@
+"""Pending researches
+
+Revision ID: e4a8c2d17f05
+Revises: b7d3e91f4a2c
+Create Date: 2025-09-04 18:27:05.913204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c2d17f05'
+down_revision: Union[str, None] = 'b7d3e91f4a2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'pending_researches',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('research_id', sa.String(), nullable=False),
+        sa.Column('business_id', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('next_check_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['business_id'],
+            ['businesses.id'],
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('research_id'),
+    )
+    op.create_index(
+        op.f('ix_pending_researches_next_check_at'),
+        'pending_researches',
+        ['next_check_at'],
+        unique=False,
+    )
+    # New values of an enum can not be used in the transaction adding them, so it is
+    # committed first.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TYPE jobtypeenum ADD VALUE IF NOT EXISTS 'business_research_store'"
+        )
+
+
+def downgrade() -> None:
+    # Note: Values can not be removed from an enum, so the job type is kept.
+    op.drop_index(
+        op.f('ix_pending_researches_next_check_at'),
+        table_name='pending_researches',
+    )
+    op.drop_table('pending_researches')
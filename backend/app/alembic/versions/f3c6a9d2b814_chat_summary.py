@@ -0,0 +1,32 @@
+"""Chat summary
+
+Revision ID: f3c6a9d2b814
+Revises: d5b8e2f1c047
+Create Date: 2025-09-14 11:37:52.604219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c6a9d2b814'
+down_revision: Union[str, None] = 'd5b8e2f1c047'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chats', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column(
+        'chats',
+        sa.Column('summary_until_message_id', sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('chats', 'summary_until_message_id')
+    op.drop_column('chats', 'summary')
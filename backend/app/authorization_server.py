@@ -1,7 +1,7 @@
 from fastapi import Depends, HTTPException, status
 
 from app.deps import get_current_active_user
-from app.domain import Business as BusinessDomain, User as UserDomain
+from app.domain import Business as BusinessDomain, Job as JobDomain, User as UserDomain
 from app.enums import UserRoleEnum
 from app.helpers import check_auth_token
 from app.schemas import TokenData
@@ -43,6 +43,10 @@ def user_can_update_business(business: BusinessDomain, user: UserDomain) -> bool
     return user.role == UserRoleEnum.SERVICE or business.user_id == user.id
 
 
+def user_can_read_job(job: JobDomain, user: UserDomain) -> bool:
+    return user.role == UserRoleEnum.SERVICE or job.user_id == user.id
+
+
 def user_can_read_chat(business: BusinessDomain, user: UserDomain) -> bool:
     return business.user_id == user.id
 
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.enums import JobStatusEnum, JobTypeEnum
+from app.repositories import JobRepository
+from app.settings import BackgroundJobsSettings
+
+logger = logging.getLogger(__name__)
+
+settings = BackgroundJobsSettings()
+
+JobHandler = Callable[[dict[str, Any], AsyncSession], Awaitable[dict[str, Any] | None]]
+
+
+class BackgroundJobQueue:
+    """In-process queue that runs the jobs stored in the database with workers.
+
+    Jobs are created with `JobRepository` before being enqueued, so the queue only
+    holds their IDs, and their status and result can be polled from the database.
+    Each job type is run by the handler registered for it, which receives the job
+    params and a database session, and returns the job result.
+
+    Pending jobs are enqueued again when the queue is started, so they are not lost
+    if the process stops. Jobs are claimed atomically before running them, so each
+    one runs only once even if several processes enqueue it.
+    """
+
+    def __init__(
+        self,
+        num_workers: int = settings.NUM_WORKERS,
+        stale_after_seconds: int = settings.STALE_AFTER_SECONDS,
+        session_factory: Callable[[], AsyncSession] = async_session,
+    ):
+        self.num_workers = num_workers
+        self.stale_after_seconds = stale_after_seconds
+        self._session_factory = session_factory
+        self._handlers: dict[JobTypeEnum, JobHandler] = {}
+        self._queue: asyncio.Queue[int] | None = None
+        self._workers: list[asyncio.Task] = []
+
+    def register(self, job_type: JobTypeEnum, handler: JobHandler) -> None:
+        self._handlers[job_type] = handler
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        await self._recover()
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.num_workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers. Jobs being run are recovered when the queue starts."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+
+    def enqueue(self, job_id: int) -> None:
+        if self._queue is None:
+            logger.warning(
+                f'Background job queue not started. Job {job_id} will be run when it '
+                'starts.'
+            )
+            return
+        self._queue.put_nowait(job_id)
+
+    async def run_job(self, job_id: int) -> None:
+        """Run a job, if it is still pending, and store its result or error."""
+        async with self._session_factory() as session:
+            jobs_repo = JobRepository(session)
+            job = await jobs_repo.claim(job_id=job_id)
+            if job is None:
+                return
+            try:
+                handler = self._handlers.get(job.type)
+                if handler is None:
+                    raise ValueError(f'Unexpected job type: {job.type}')
+                result = await handler(job.params, session)
+            except Exception as e:
+                logger.exception(f'Background job {job_id} failed')
+                await session.rollback()
+                await jobs_repo.finish(
+                    job_id=job_id,
+                    status=JobStatusEnum.FAILED,
+                    error=str(e),
+                )
+            else:
+                await jobs_repo.finish(
+                    job_id=job_id,
+                    status=JobStatusEnum.COMPLETED,
+                    result=result,
+                )
+
+    async def _recover(self) -> None:
+        async with self._session_factory() as session:
+            jobs_repo = JobRepository(session)
+            await jobs_repo.reset_stale(
+                started_before=(
+                    datetime.now(timezone.utc)
+                    - timedelta(seconds=self.stale_after_seconds)
+                ),
+            )
+            pending_jobs = await jobs_repo.get_multi(status=JobStatusEnum.PENDING)
+        for job in pending_jobs:
+            if job.id is not None:
+                self.enqueue(job.id)
+
+    async def _work(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                await self.run_job(job_id=job_id)
+            except Exception:
+                # The job could not be claimed or finished, for example because the
+                # database is unreachable. It is recovered when the queue starts.
+                logger.exception(f'Background job {job_id} could not be run')
+            finally:
+                queue.task_done()
+
+
+job_queue = BackgroundJobQueue()
@@ -0,0 +1,182 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """Thread-safe in-memory cache that evicts the least recently used entries.
+
+    Examples
+    --------
+    >>> cache = LRUCache(max_entries=2)
+    >>> cache.set('a', 1)
+    >>> cache.set('b', 2)
+    >>> cache.get('a')
+    1
+    >>> cache.set('c', 3)
+    >>> cache.get('b') is None
+    True
+    >>> len(cache)
+    2
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key: K, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe in-memory cache whose entries expire after a time to live.
+
+    When the cache is full, the oldest entries are evicted first.
+
+    Examples
+    --------
+    >>> now = 0.0
+    >>> cache = TTLCache(max_entries=2, ttl_seconds=10, timer=lambda: now)
+    >>> cache.set('a', 1)
+    >>> cache.get('a')
+    1
+    >>> now = 11.0
+    >>> cache.get('a') is None
+    True
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._timer = timer
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if self._timer() >= expires_at:
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """Set an entry, expiring after ttl_seconds or the TTL of the cache."""
+        if ttl_seconds is None:
+            ttl_seconds = self.ttl_seconds
+        if self.max_entries <= 0 or ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._timer() + ttl_seconds, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionedCache(Generic[K, V]):
+    """Thread-safe in-memory TTL cache whose entries are stamped with a version.
+
+    Each key has a version, which is bumped when the key is invalidated. Values are
+    only set if the version of their key has not changed since it was read, so a
+    value read from the source before an invalidation is not cached after it.
+
+    Examples
+    --------
+    >>> cache = VersionedCache(max_entries=10, ttl_seconds=60)
+    >>> version = cache.version('a')
+    >>> cache.invalidate('a')
+    >>> cache.set('a', 1, version=version)
+    >>> cache.get('a') is None
+    True
+    >>> cache.set('a', 2, version=cache.version('a'))
+    >>> cache.get('a')
+    2
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self._entries: TTLCache[K, tuple[int, V]] = TTLCache(
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+            timer=timer,
+        )
+        # Keys whose version is evicted get version 0 again, so the entries stamped
+        # with their previous version are no longer returned.
+        self._versions: LRUCache[K, int] = LRUCache(max_entries=max_entries)
+        self._lock = Lock()
+
+    def version(self, key: K) -> int:
+        """Return the version of a key. Read it before reading the value to set."""
+        return self._versions.get(key) or 0
+
+    def get(self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, value = entry
+        if version != self.version(key):
+            return None
+        return value
+
+    def set(self, key: K, value: V, version: int) -> None:
+        with self._lock:
+            if version != self.version(key):
+                return
+            self._entries.set(key, (version, value))
+
+    def invalidate(self, key: K) -> None:
+        with self._lock:
+            self._versions.set(key, self.version(key) + 1)
+            self._entries.delete(key)
@@ -1,6 +1,6 @@
 from typing import Callable, Type
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.postgresql import get_session
@@ -24,9 +24,20 @@ def get_repository(repo_type: Type[BaseRepository]) -> Callable:
 
 
 async def get_current_user(
+    request: Request,
     token_data: TokenData = Depends(check_auth_token),
     users_repo: UserRepository = Depends(get_repository(UserRepository)),
 ) -> UserExtendedDomain:
+    """Get the user of the request token.
+
+    The user is kept in the request state, so it is looked up only once per request,
+    also when this is not resolved from the dependencies cache of FastAPI.
+    """
+    current_user: UserExtendedDomain | None = getattr(
+        request.state, 'current_user', None
+    )
+    if current_user is not None:
+        return current_user
     user_external_id = (
         token_data.impersonated_user_external_id
         if token_data.is_impersonation and token_data.impersonated_user_external_id
@@ -38,6 +49,7 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail='Could not validate credentials',
         )
+    request.state.current_user = user
     return user
 
 
@@ -21,6 +21,10 @@ class Chat(BaseModel):
     title: str
     start_time: datetime
     business_id: int
+    summary: str | None = None
+    summary_until_message_id: int | None = None
     messages: list[ChatMessage] | None = None
+    # Number of messages of the chat, which may be more than the messages loaded
+    num_messages: int | None = None
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+from app.enums import JobStatusEnum, JobTypeEnum
+
+
+class Job(BaseModel):
+    id: int | None = None
+    type: JobTypeEnum
+    status: JobStatusEnum = JobStatusEnum.PENDING
+    params: dict[str, Any]
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    user_id: int | None = None
+    created_at: datetime | None = None
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
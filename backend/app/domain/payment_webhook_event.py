@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.enums import PaymentWebhookEventStatusEnum
+
+
+class PaymentWebhookEvent(BaseModel):
+    id: int | None = None
+    event_id: str
+    type: str
+    status: PaymentWebhookEventStatusEnum
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
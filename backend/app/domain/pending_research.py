@@ -0,0 +1,14 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PendingResearch(BaseModel):
+    id: int | None = None
+    research_id: str
+    business_id: int
+    attempts: int = 0
+    created_at: datetime
+    next_check_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
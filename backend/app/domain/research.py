@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.enums import ResearchRequestStatusEnum
+
+
+class Research(BaseModel):
+    id: int | None = None
+    response_id: str
+    business_id: int | None = None
+    status: ResearchRequestStatusEnum | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    total_tokens: int | None = None
+    citation_tokens: int | None = None
+    num_search_queries: int | None = None
+    reasoning_tokens: int | None = None
+    research: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    stored_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,6 +1,9 @@
 from .admin import AuthMethodEnum
 from .business import BusinessStageEnum
 from .chat import ChatMessageSenderEnum
+from .job import JobStatusEnum, JobTypeEnum
+from .payment import PaymentWebhookEventStatusEnum
+from .rag import ChunkingStrategyEnum, RAGUploadModeEnum
 from .research import ResearchRequestStatusEnum
 from .services import (
     ChatAIModelProviderEnum,
@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class JobStatusEnum(str, Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+class JobTypeEnum(str, Enum):
+    BUSINESS_DEEP_RESEARCH = 'business_deep_research'
+    BUSINESS_RESEARCH_STORE = 'business_research_store'
+    USER_BUSINESSES_DEEP_RESEARCH = 'user_businesses_deep_research'
+    USER_BUSINESSES_RESEARCH_DELETION = 'user_businesses_research_deletion'
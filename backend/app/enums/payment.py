@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class PaymentWebhookEventStatusEnum(str, Enum):
+    PROCESSING = 'processing'
+    PROCESSED = 'processed'
+    FAILED = 'failed'
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class RAGUploadModeEnum(str, Enum):
+    # Re-embed all the chunks of a text and replace the vectors of the namespace.
+    REPLACE = 'replace'
+    # Only embed and upsert the new chunks, and delete the stale ones.
+    INCREMENTAL = 'incremental'
+
+
+class ChunkingStrategyEnum(str, Enum):
+    # Fixed windows of tokens, with overlap.
+    TOKEN_WINDOW = 'token_window'
+    # Whole sentences packed up to the max tokens, with overlap.
+    SENTENCE = 'sentence'
+    # Sentences packed within the sections delimited by headings, prefixed with the
+    # heading of the section.
+    HEADING = 'heading'
@@ -12,6 +12,7 @@ class DeepResearchProviderEnum(str, Enum):
 
 class DeepResearchHandlerProviderEnum(str, Enum):
     AWS_STEP_FUNCTION = 'aws_step_function'
+    LOCAL = 'local'
 
 
 class EmbeddingProviderEnum(str, Enum):
@@ -32,3 +33,5 @@ class StorageProviderEnum(str, Enum):
 
 class VectorDatabaseProviderEnum(str, Enum):
     PINECONE = 'pinecone'
+    PINECONE_TIERED = 'pinecone_tiered'
+    LOCAL = 'local'
@@ -4,6 +4,8 @@ from .helpers_chat import (
     add_store_message_and_get_store_response,
     add_store_message_and_get_store_response_stream,
     create_chat_in_service,
+    get_chat_for_new_message,
+    get_chat_messages_page,
     get_chat_title,
     subtract_user_credits_for_new_message_in_chat,
 )
@@ -16,11 +18,18 @@ from .helpers_rag import (
     delete_scheduled_deep_research_for_business,
     get_business_rag,
     get_general_rag,
+    get_rag_context,
+    get_research,
+    run_business_deep_research_job,
+    run_business_research_store_job,
     schedule_deep_research_for_business,
+    store_research_for_business,
 )
 from .helpers_payment import (
     create_checkout_session,
     get_checkout_session,
     get_portal_session,
     handle_subscription_webhook,
+    run_user_businesses_deep_research_job,
+    run_user_businesses_research_deletion_job,
 )
@@ -1,3 +1,6 @@
+import base64
+import binascii
+import logging
 from datetime import datetime
 from typing import AsyncGenerator
 
@@ -10,10 +13,12 @@ from app.domain import (
     User as UserDomain,
 )
 from app.enums import ChatMessageSenderEnum
-from app.helpers.helpers_rag import get_business_rag, get_general_rag
+from app.helpers.helpers_rag import get_rag_context
 from app.repositories import ChatRepository, PlanRepository, UserRepository
+from app.schemas import ChatMessage, ChatMessagePage
 from app.services import ServicesFactory
 
+logger = logging.getLogger(__name__)
 
 chat_ai_model_service = ServicesFactory().get_chat_ai_model_provider()
 
@@ -27,16 +32,13 @@ async def add_store_message_and_get_store_response(
     plans_repo: PlanRepository,
 ) -> ChatMessageDomain | None:
     """Register message and get the AI response."""
-    business_rag = get_business_rag(business_id=chat.business_id, query=message.content)
-    should_context_include_general_rag = await _should_chat_context_include_general_rag(
+    business_rag, general_rag = await _get_rag_context(
+        chat=chat,
+        message=message,
         user=user,
         plans_repo=plans_repo,
     )
-    general_rag = (
-        get_general_rag(query=message.content)
-        if should_context_include_general_rag
-        else ''
-    )
+    chat = await _update_chat_summary(chat=chat, chats_repo=chats_repo)
     response_content = await chat_ai_model_service.add_message_to_chat_and_get_response(
         business=business,
         chat=chat,
@@ -44,24 +46,19 @@ async def add_store_message_and_get_store_response(
         business_rag=business_rag,
         general_rag=general_rag,
     )
-    # Note: By storing the message after the AI response, we ensure that the message
-    # is only saved after the response is successfully generated.
-    await chats_repo.add_message(message)
-    # ToDo (pduran): Parallelize these two operations
-    # _, response_content = await asyncio.gather(
-    #     chats_repo.add_message(message),
-    #     add_message_to_chat_and_get_response(
-    #         chat_internal_id=chat.internal_id,
-    #         content=message.content,
-    #     ),
-    # )
     response_message = ChatMessageDomain(
         chat_id=message.chat_id,
         time=datetime.now(),
         sender=ChatMessageSenderEnum.AI_MODEL,
         content=response_content,
     )
-    return await chats_repo.add_message(response_message)
+    # Note: By storing the message after the AI response, we ensure that the message
+    # is only saved after the response is successfully generated. Both are stored
+    # together, in a single transaction.
+    new_messages = await chats_repo.add_messages([message, response_message])
+    if new_messages is None:
+        return None
+    return new_messages[1]
 
 
 async def add_store_message_and_get_store_response_stream(
@@ -72,16 +69,13 @@ async def add_store_message_and_get_store_response_stream(
     chats_repo: ChatRepository,
     plans_repo: PlanRepository,
 ) -> AsyncGenerator[str, None]:
-    await chats_repo.add_message(message)
-
-    business_rag = get_business_rag(business_id=chat.business_id, query=message.content)
-    should_include_general_rag = await _should_chat_context_include_general_rag(
+    business_rag, general_rag = await _get_rag_context(
+        chat=chat,
+        message=message,
         user=user,
         plans_repo=plans_repo,
     )
-    general_rag = (
-        get_general_rag(query=message.content) if should_include_general_rag else ''
-    )
+    chat = await _update_chat_summary(chat=chat, chats_repo=chats_repo)
     stream_gen = chat_ai_model_service.add_message_to_chat_and_get_response_stream(
         business=business,
         chat=chat,
@@ -101,7 +95,8 @@ async def add_store_message_and_get_store_response_stream(
         sender=ChatMessageSenderEnum.AI_MODEL,
         content=full_response,
     )
-    await chats_repo.add_message(response_message)
+    # As when the response is not streamed, the message is stored with its response
+    await chats_repo.add_messages([message, response_message])
 
 
 async def create_chat_in_service() -> str:
@@ -110,6 +105,19 @@ async def create_chat_in_service() -> str:
     return chat_internal_id
 
 
+async def get_chat_for_new_message(
+    business_id: int,
+    chat_id: int,
+    chats_repo: ChatRepository,
+) -> ChatDomain | None:
+    """Get a chat with what the AI model needs to answer a new message in it."""
+    return await chats_repo.get_for_new_message(
+        business_id=business_id,
+        chat_id=chat_id,
+        include_messages=chat_ai_model_service.sends_messages_history,
+    )
+
+
 async def get_chat_title(business: BusinessDomain, chats_repo: ChatRepository) -> str:
     """Get the chat title based on the business."""
     business_chats = await chats_repo.get_multi(business_id=business.id)
@@ -117,6 +125,107 @@ async def get_chat_title(business: BusinessDomain, chats_repo: ChatRepository) -
     return f'Chat {num_chat}'
 
 
+async def get_chat_messages_page(
+    chat_id: int,
+    limit: int,
+    cursor: str | None,
+    chats_repo: ChatRepository,
+) -> ChatMessagePage:
+    """Get a page of the messages of a chat, starting from the latest ones.
+
+    The messages of the page are in chronological order. The cursor of the page with
+    the previous messages is returned with it, if there are more.
+    """
+    before = _decode_messages_cursor(cursor) if cursor is not None else None
+    # One more message is read to know if there are more pages
+    messages = await chats_repo.get_messages(
+        chat_id=chat_id,
+        limit=limit + 1,
+        before=before,
+    )
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = _encode_messages_cursor(messages[-1])
+    return ChatMessagePage(
+        messages=[
+            ChatMessage.model_validate(message, from_attributes=True)
+            for message in reversed(messages)
+        ],
+        next_cursor=next_cursor,
+    )
+
+
+def _encode_messages_cursor(message: ChatMessageDomain) -> str:
+    cursor = f'{message.time.isoformat()}|{message.id}'
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def _decode_messages_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        time, message_id = base64.urlsafe_b64decode(cursor).decode().split('|')
+        decoded_cursor = datetime.fromisoformat(time), int(message_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor.',
+        ) from e
+    # Message times are stored with time zone, so they can not be compared with a
+    # naive time.
+    if decoded_cursor[0].tzinfo is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid cursor.',
+        )
+    return decoded_cursor
+
+
+async def _get_rag_context(
+    chat: ChatDomain,
+    message: ChatMessageDomain,
+    user: UserDomain,
+    plans_repo: PlanRepository,
+) -> tuple[str, str]:
+    """Get the business and general RAG context for a new message in a chat."""
+    should_include_general_rag = await _should_chat_context_include_general_rag(
+        user=user,
+        plans_repo=plans_repo,
+    )
+    return await get_rag_context(
+        business_id=chat.business_id,
+        query=message.content,
+        include_general_rag=should_include_general_rag,
+    )
+
+
+async def _update_chat_summary(
+    chat: ChatDomain,
+    chats_repo: ChatRepository,
+) -> ChatDomain:
+    """Update the summary of the oldest messages of a chat, and store it if changed.
+
+    If the summary can not be made, the chat is returned as it is, as the history
+    sent to the AI model is kept within its budget anyway.
+    """
+    try:
+        updated_chat = await chat_ai_model_service.update_chat_summary(chat=chat)
+    except Exception:
+        logger.exception(f'Failed to summarize chat {chat.id}')
+        return chat
+    if (
+        chat.id is not None
+        and updated_chat.summary is not None
+        and updated_chat.summary_until_message_id is not None
+        and updated_chat.summary_until_message_id != chat.summary_until_message_id
+    ):
+        await chats_repo.update_summary(
+            chat_id=chat.id,
+            summary=updated_chat.summary,
+            summary_until_message_id=updated_chat.summary_until_message_id,
+        )
+    return updated_chat
+
+
 async def _should_chat_context_include_general_rag(
     user: UserDomain,
     plans_repo: PlanRepository,
@@ -139,25 +248,23 @@ async def subtract_user_credits_for_new_message_in_chat(
 
     Note:
     - If the user has `None` credits, no credits will be subtracted nor exception raised.
+    - The credits of the user are checked in the database, not in `user`, which may
+      be a cached copy.
 
     Raises
     ------
     HTTPException
         If the user has not enough credits to cover sending the message.
     """
-    if user.available_credits is None:
-        return
-
     message_credit_cost = chat_ai_model_service.get_new_message_credit_cost(chat=chat)
-    if user.available_credits < message_credit_cost:
+    if not await users_repo.subtract_credits(
+        user_id=user.id,
+        credits=message_credit_cost,
+    ):
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
             detail=(
                 f'User {user.id} does not have enough credits to send a message in chat '
-                f'{chat.id}. User has {user.available_credits} credits, but the message '
-                f'costs {message_credit_cost} credits.'
+                f'{chat.id}. The message costs {message_credit_cost} credits.'
             ),
         )
-
-    user.available_credits -= message_credit_cost
-    await users_repo.update(user_id=user.id, user_update=user)
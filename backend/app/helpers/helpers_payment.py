@@ -1,9 +1,22 @@
+import asyncio
 import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable
 
+import stripe
 from fastapi import HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain import Plan as PlanDomain, User as UserDomain
-from app.enums import UserPlanEnum
+from app.background_jobs import job_queue
+from app.database import async_session
+from app.domain import (
+    BusinessIdea as BusinessIdeaDomain,
+    EstablishedBusiness as EstablishedBusinessDomain,
+    Job as JobDomain,
+    Plan as PlanDomain,
+    User as UserDomain,
+)
+from app.enums import JobTypeEnum, PaymentWebhookEventStatusEnum, UserPlanEnum
 from app.exceptions.subscriptions import (
     SubscriptionWebhookBusinessError,
     SubscriptionWebhookErrors,
@@ -14,7 +27,14 @@ from app.helpers import (
     delete_scheduled_deep_research_for_business,
     schedule_deep_research_for_business,
 )
-from app.repositories import BusinessRepository, PlanRepository, UserRepository
+from app.repositories import (
+    BusinessRepository,
+    JobRepository,
+    PaymentWebhookEventRepository,
+    PlanRepository,
+    ResearchRepository,
+    UserRepository,
+)
 from app.schemas import (
     CheckoutSession,
     CheckoutSessionResponse,
@@ -30,10 +50,19 @@ from app.services.stripe import (
     get_subscription,
     verify_webhook_signature,
 )
+from app.settings import BackgroundJobsSettings, StripeSettings
 
 
 logger = logging.getLogger(__name__)
 
+background_jobs_settings = BackgroundJobsSettings()
+stripe_settings = StripeSettings()
+
+BusinessTask = Callable[
+    [BusinessIdeaDomain | EstablishedBusinessDomain, int],
+    Awaitable[None],
+]
+
 
 async def get_checkout_session(session_id: str) -> CheckoutSessionResponse | None:
     session = await stripe_get_checkout_session(session_id)
@@ -109,12 +138,18 @@ async def get_portal_session(user: UserDomain, data: SubscriptionHandleRequest):
     return SubscriptionHandleResponse(url=session.url)
 
 
-async def handle_subscription_webhook(  # noqa: C901
+async def handle_subscription_webhook(
     request: Request,
     users_repo: UserRepository,
     plans_repo: PlanRepository,
-    business_repo: BusinessRepository,
+    jobs_repo: JobRepository,
+    payment_webhook_events_repo: PaymentWebhookEventRepository,
 ) -> None:
+    """Handle a subscription webhook event.
+
+    Events are recorded before they are processed, so the retries of an event
+    processed or being processed are skipped. Failed events are processed again.
+    """
     payload = await request.body()
     sig_header = request.headers.get('stripe-signature')
     if sig_header is None:
@@ -131,6 +166,52 @@ async def handle_subscription_webhook(  # noqa: C901
             detail='Invalid signature',
         ) from e
 
+    processing_timeout = timedelta(
+        seconds=stripe_settings.WEBHOOK_PROCESSING_TIMEOUT_SECONDS,
+    )
+    claimed = await payment_webhook_events_repo.claim(
+        event_id=event.id,
+        event_type=event.type,
+        processing_started_before=datetime.now(timezone.utc) - processing_timeout,
+    )
+    if not claimed:
+        logger.info(f'Webhook event {event.id} already processed. Skipping it.')
+        return
+
+    try:
+        await _handle_subscription_event(
+            event=event,
+            users_repo=users_repo,
+            plans_repo=plans_repo,
+            jobs_repo=jobs_repo,
+        )
+    except Exception:
+        # The session is shared with the handler, so its transaction may have failed.
+        # Otherwise, the event could not be marked as failed.
+        await payment_webhook_events_repo.rollback()
+        await payment_webhook_events_repo.update_status(
+            event_id=event.id,
+            status=PaymentWebhookEventStatusEnum.FAILED,
+        )
+        raise
+    await payment_webhook_events_repo.update_status(
+        event_id=event.id,
+        status=PaymentWebhookEventStatusEnum.PROCESSED,
+    )
+
+
+async def _handle_subscription_event(  # noqa: C901
+    event: stripe.Event,
+    users_repo: UserRepository,
+    plans_repo: PlanRepository,
+    jobs_repo: JobRepository,
+) -> None:
+    """Handle a subscription event.
+
+    The plan of the user is updated right away, and the research of their
+    businesses is started or removed by a background job, so the webhook is
+    acknowledged without waiting for it.
+    """
     object = event.data.object
     logger.info(f'Handle subscription webhook object {object}')
 
@@ -142,9 +223,7 @@ async def handle_subscription_webhook(  # noqa: C901
             detail='User not found for the given customer ID.',
         )
     user = users[0]
-    user_businesses = await business_repo.get_multi(user_id=user.id)
 
-    errors: list[SubscriptionWebhookBusinessError] = []
     if event.type in ('checkout.session.completed', 'invoice.payment_succeeded'):
         # These events are received when a user subscribes to a paid plan
         subscription_id = (
@@ -158,47 +237,19 @@ async def handle_subscription_webhook(  # noqa: C901
             )
         subscription = await get_subscription(subscription_id=subscription_id)
         stripe_price_id = subscription['items']['data'][0]['price']['id']
-        plans = await plans_repo.get_multi(
-            is_active=True,
+        plan = await plans_repo.get_active_by_payment_service_price_id(
             payment_service_price_id=stripe_price_id,
         )
-        if len(plans) != 1:
+        if plan is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail='Plan not found for the given Stripe price ID.',
             )
-        plan = plans[0]
         plan_id = plan.id
         available_credits = plan.monthly_credits
 
         # Deep research for all businesses of the user and schedule the next ones
-        for business in user_businesses:
-            if business.id is None:
-                continue
-            research_params = ResearchParams(max_tokens=50000, business_id=business.id)
-
-            try:
-                deep_research_for_business_async(
-                    business=business,
-                    params=research_params,
-                )
-            except Exception as e:
-                error = SubscriptionWebhookBusinessError(
-                    user_id=user.id,
-                    business_id=business.id,
-                    error=e,
-                )
-                errors.append(error)
-
-            try:
-                await schedule_deep_research_for_business(params=research_params)
-            except Exception as e:
-                error = SubscriptionWebhookBusinessError(
-                    user_id=user.id,
-                    business_id=business.id,
-                    error=e,
-                )
-                errors.append(error)
+        job_type = JobTypeEnum.USER_BUSINESSES_DEEP_RESEARCH
 
     elif event.type == 'customer.subscription.deleted':
         # This event is received when a user cancels their subscription, so it has
@@ -217,30 +268,7 @@ async def handle_subscription_webhook(  # noqa: C901
             available_credits = user.available_credits
 
         # Remove deep research for all businesses of the user (actual & scheduled)
-        for business in user_businesses:
-            if business.id is None:
-                continue
-
-            try:
-                delete_business_rag(business_id=business.id)
-            except Exception as e:
-                error = SubscriptionWebhookBusinessError(
-                    user_id=user.id,
-                    business_id=business.id,
-                    error=e,
-                )
-                errors.append(error)
-            try:
-                await delete_scheduled_deep_research_for_business(
-                    business_id=business.id,
-                )
-            except Exception as e:
-                error = SubscriptionWebhookBusinessError(
-                    user_id=user.id,
-                    business_id=business.id,
-                    error=e,
-                )
-                errors.append(error)
+        job_type = JobTypeEnum.USER_BUSINESSES_RESEARCH_DELETION
 
     else:
         raise HTTPException(
@@ -252,5 +280,115 @@ async def handle_subscription_webhook(  # noqa: C901
     user.available_credits = available_credits
     await users_repo.update(user_id=user.id, user_update=user)
 
+    job = await jobs_repo.create(
+        JobDomain(type=job_type, params={'user_id': user.id}, user_id=user.id),
+    )
+    if job.id is not None:
+        job_queue.enqueue(job.id)
+
+
+async def run_user_businesses_deep_research_job(
+    params: dict[str, Any],
+    db: AsyncSession,
+) -> None:
+    """Start and schedule deep research for all businesses of a user, as a job.
+
+    The params are the `user_id`.
+    """
+    await _run_for_user_businesses(
+        user_id=params['user_id'],
+        business_repo=BusinessRepository(db),
+        tasks=[_start_business_research, _schedule_business_research],
+    )
+
+
+async def run_user_businesses_research_deletion_job(
+    params: dict[str, Any],
+    db: AsyncSession,
+) -> None:
+    """Remove the research and scheduled research of all businesses of a user, as a job.
+
+    The params are the `user_id`.
+    """
+    await _run_for_user_businesses(
+        user_id=params['user_id'],
+        business_repo=BusinessRepository(db),
+        tasks=[_delete_business_research, _delete_scheduled_business_research],
+    )
+
+
+async def _run_for_user_businesses(
+    user_id: int,
+    business_repo: BusinessRepository,
+    tasks: list[BusinessTask],
+) -> None:
+    """Run the tasks for each business of a user, for several businesses at a time.
+
+    A failed task does not stop the rest. Their errors are raised together at the end.
+    """
+    businesses = await business_repo.get_multi(user_id=user_id)
+    semaphore = asyncio.Semaphore(background_jobs_settings.BUSINESSES_CONCURRENCY)
+    errors: list[SubscriptionWebhookBusinessError] = []
+
+    async def _run_for_business(
+        business: BusinessIdeaDomain | EstablishedBusinessDomain,
+        business_id: int,
+    ) -> None:
+        async with semaphore:
+            for task in tasks:
+                try:
+                    await task(business, business_id)
+                except Exception as e:
+                    errors.append(
+                        SubscriptionWebhookBusinessError(
+                            user_id=user_id,
+                            business_id=business_id,
+                            error=e,
+                        )
+                    )
+
+    await asyncio.gather(
+        *[
+            _run_for_business(business, business.id)
+            for business in businesses
+            if business.id is not None
+        ]
+    )
     if errors:
-        raise SubscriptionWebhookErrors(user_id=user.id, errors=errors)
+        raise SubscriptionWebhookErrors(user_id=user_id, errors=errors)
+
+
+async def _start_business_research(
+    business: BusinessIdeaDomain | EstablishedBusinessDomain,
+    business_id: int,
+) -> None:
+    # Businesses are researched concurrently, so each one uses its own session.
+    async with async_session() as session:
+        await deep_research_for_business_async(
+            business=business,
+            params=ResearchParams(max_tokens=50000, business_id=business_id),
+            researches_repo=ResearchRepository(session),
+        )
+
+
+async def _schedule_business_research(
+    business: BusinessIdeaDomain | EstablishedBusinessDomain,
+    business_id: int,
+) -> None:
+    await schedule_deep_research_for_business(
+        params=ResearchParams(max_tokens=50000, business_id=business_id),
+    )
+
+
+async def _delete_business_research(
+    business: BusinessIdeaDomain | EstablishedBusinessDomain,
+    business_id: int,
+) -> None:
+    await asyncio.to_thread(delete_business_rag, business_id=business_id)
+
+
+async def _delete_scheduled_business_research(
+    business: BusinessIdeaDomain | EstablishedBusinessDomain,
+    business_id: int,
+) -> None:
+    await delete_scheduled_deep_research_for_business(business_id=business_id)
@@ -1,15 +1,29 @@
+import asyncio
+import hashlib
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import tee
+from typing import Any, Callable, Iterable, Iterator
 
 from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain import (
     BusinessIdea as BusinessIdeaDomain,
     EstablishedBusiness as EstablishedBusinessDomain,
+    Research as ResearchDomain,
 )
+from app.enums import (
+    ChunkingStrategyEnum,
+    RAGUploadModeEnum,
+    ResearchRequestStatusEnum,
+)
+from app.repositories import BusinessRepository, ResearchRepository
 from app.schemas import ResearchExtended, ResearchParams
 from app.services import ServicesFactory
 
-from tiktoken import encoding_for_model
+from tiktoken import Encoding, encoding_for_model
 
 from app.settings import GeneralRAGSettings, OpenAIEmbeddingSettings, RAGSettings
 
@@ -18,7 +32,7 @@ rag_settings = RAGSettings()
 general_rag_settings = GeneralRAGSettings()
 
 
-def deep_research_for_business(
+async def deep_research_for_business(
     business: BusinessIdeaDomain | EstablishedBusinessDomain,
     params: ResearchParams,
 ) -> ResearchExtended:
@@ -26,27 +40,148 @@ def deep_research_for_business(
     research_context = business.get_information()
     research_instructions = _get_deep_search_instructions()
     deep_research_provider = ServicesFactory().get_deep_research_provider()
-    return deep_research_provider.do_deep_research(
+    return await deep_research_provider.do_deep_research(
         prompt=f'{research_context} {research_instructions}',
         max_tokens=params.max_tokens,
     )
 
 
-def get_deep_research_async(request_id: str) -> ResearchExtended | None:
+async def run_business_deep_research_job(
+    params: dict[str, Any],
+    db: AsyncSession,
+) -> dict[str, Any]:
+    """Do deep research for a business and upload it to its RAG, as a background job.
+
+    The params are the `ResearchParams` of the research. The research, without its
+    text, is returned as the job result.
+    """
+    research_params = ResearchParams.model_validate(params)
+    if research_params.business_id is None:
+        raise ValueError('Business ID is required for business deep research.')
+    business = await BusinessRepository(db).get_child(
+        business_id=research_params.business_id,
+    )
+    if business is None:
+        raise ValueError(f'Business {research_params.business_id} not found.')
+    research_info = await deep_research_for_business(
+        business=business,
+        params=research_params,
+    )
+    researches_repo = ResearchRepository(db)
+    await researches_repo.upsert(
+        ResearchDomain(
+            **research_info.model_dump(exclude={'status'}),
+            business_id=research_params.business_id,
+            # Synchronous research responses have no status, as they are completed.
+            status=research_info.status or ResearchRequestStatusEnum.COMPLETED,
+        )
+    )
+    research = await store_research_for_business(
+        research_id=research_info.response_id,
+        business_id=research_params.business_id,
+        researches_repo=researches_repo,
+    )
+    return research.model_dump(mode='json', exclude={'research'})
+
+
+async def run_business_research_store_job(
+    params: dict[str, Any],
+    db: AsyncSession,
+) -> dict[str, Any]:
+    """Upload a completed research to the RAG of its business, as a background job.
+
+    The params are the `research_id` and the `business_id`. The research, without
+    its text, is returned as the job result.
+    """
+    research = await store_research_for_business(
+        research_id=params['research_id'],
+        business_id=params['business_id'],
+        researches_repo=ResearchRepository(db),
+    )
+    return research.model_dump(mode='json', exclude={'research'})
+
+
+async def get_research(
+    research_id: str,
+    researches_repo: ResearchRepository,
+) -> ResearchDomain | None:
+    """Get a research, keeping it up to date in the database.
+
+    Finished researches are served from the database. Otherwise, the research is
+    got from the deep research provider, and stored.
+    """
+    research = await researches_repo.get(response_id=research_id)
+    if research is not None and research.status in (
+        ResearchRequestStatusEnum.COMPLETED,
+        ResearchRequestStatusEnum.FAILED,
+    ):
+        return research
+    research_info = await get_deep_research_async(request_id=research_id)
+    if research_info is None:
+        return research
+    return await researches_repo.upsert(
+        ResearchDomain.model_validate(research_info.model_dump()),
+    )
+
+
+async def store_research_for_business(
+    research_id: str,
+    business_id: int,
+    researches_repo: ResearchRepository,
+) -> ResearchDomain:
+    """Upload a completed research to the RAG of a business, if not uploaded yet."""
+    research = await get_research(
+        research_id=research_id,
+        researches_repo=researches_repo,
+    )
+    if research is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Research not found',
+        )
+    if research.stored_at is not None:
+        return research
+    if research.status is not ResearchRequestStatusEnum.COMPLETED:
+        research_status = research.status.value if research.status else 'unknown'
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                'Research request is not completed yet. Current status is '
+                f'{research_status}'
+            ),
+        )
+    if research.research is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Research text empty (although status is {research.status}).',
+        )
+    await asyncio.to_thread(
+        chunk_and_upload_text,
+        text=research.research,
+        business_id=business_id,
+    )
+    return await researches_repo.mark_stored(
+        response_id=research_id,
+        business_id=business_id,
+    )
+
+
+async def get_deep_research_async(request_id: str) -> ResearchExtended | None:
     """Get deep research result asynchronously."""
     deep_research_provider = ServicesFactory().get_deep_research_provider()
-    return deep_research_provider.get_deep_research_async(request_id=request_id)
+    return await deep_research_provider.get_deep_research_async(request_id=request_id)
 
 
-def deep_research_for_business_async(
+async def deep_research_for_business_async(
     business: BusinessIdeaDomain | EstablishedBusinessDomain,
     params: ResearchParams,
+    researches_repo: ResearchRepository,
 ) -> ResearchExtended:
     """Perform deep research for a business asynchronously."""
     research_context = business.get_information()
     research_instructions = _get_deep_search_instructions()
     deep_research_provider = ServicesFactory().get_deep_research_provider()
-    research_info = deep_research_provider.do_deep_research_async(
+    research_info = await deep_research_provider.do_deep_research_async(
         prompt=f'{research_context} {research_instructions}',
         max_tokens=params.max_tokens,
     )
@@ -56,7 +191,10 @@ def deep_research_for_business_async(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Business ID not found.',
         )
-    dr_handler_provider.track_and_store_research(
+    await researches_repo.upsert(
+        ResearchDomain(**research_info.model_dump(), business_id=business.id),
+    )
+    await dr_handler_provider.track_and_store_research(
         research_id=research_info.response_id,
         business_id=business.id,
     )
@@ -121,46 +259,237 @@ def chunk_and_upload_text(text: str, business_id: int | None = None) -> None:
 
 
 def _chunk_and_upload_text(text: str, settings: RAGSettings, namespace: str) -> None:
-    chunks = chunk_text(
+    # Chunks are generated, embedded and uploaded lazily, so the upload can start as
+    # soon as the first batch of chunks has been embedded.
+    chunker = _CHUNKERS[settings.CHUNKING_STRATEGY]
+    chunks = chunker(
         text=text,
         max_tokens=settings.MAX_TOKENS,
         overlap=settings.OVERLAP,
     )
-    vectors_to_upsert: list[tuple[str, list[float], dict[str, str]]] = []
-    for chunk_index, chunk in enumerate(chunks):
-        vector_id = settings.VECTOR_ID.format(
-            doc_index=0,
-            chunk_index=chunk_index,
-        )
-        vector = embed_text(text=chunk)
-        metadata = {'text': chunk}
-        vectors_to_upsert.append((vector_id, vector, metadata))
+    # IDs of all the chunks of the text. It is filled as the chunks are generated.
+    vector_ids: set[str] = set()
+    identified_chunks = _identify_chunks(
+        chunks=chunks,
+        settings=settings,
+        vector_ids=vector_ids,
+    )
     vector_database_provider = ServicesFactory().get_vector_database_provider()
-    vector_database_provider.upload_vectors(
+    if settings.UPLOAD_MODE == RAGUploadModeEnum.REPLACE:
+        vector_database_provider.upload_vectors(
+            index_name=settings.INDEX_NAME,
+            namespace=namespace,
+            vectors=_embed_chunks(identified_chunks=identified_chunks),
+        )
+        return
+
+    stored_vector_ids = vector_database_provider.list_vector_ids(
         index_name=settings.INDEX_NAME,
         namespace=namespace,
-        vectors=vectors_to_upsert,
     )
+    vector_database_provider.upsert_vectors(
+        index_name=settings.INDEX_NAME,
+        namespace=namespace,
+        vectors=_embed_chunks(
+            identified_chunks=(
+                (vector_id, chunk)
+                for vector_id, chunk in identified_chunks
+                if vector_id not in stored_vector_ids
+            )
+        ),
+    )
+    # Stale vectors are deleted only after the new ones have been stored, so the
+    # namespace is never left empty while the text is being uploaded.
+    stale_vector_ids = stored_vector_ids - vector_ids
+    if stale_vector_ids:
+        vector_database_provider.delete_vectors_by_id(
+            index_name=settings.INDEX_NAME,
+            namespace=namespace,
+            vector_ids=stale_vector_ids,
+        )
+
+
+def _identify_chunks(
+    chunks: Iterable[str],
+    settings: RAGSettings,
+    vector_ids: set[str],
+) -> Iterator[tuple[str, str]]:
+    """Yield the chunks with their vector IDs, skipping the duplicated ones.
+
+    Vectors are identified by the hash of their content, so the same chunk always
+    has the same ID and duplicated chunks are only stored once. The IDs of the
+    yielded chunks are added to `vector_ids`.
+    """
+    for chunk in chunks:
+        vector_id = _get_vector_id(chunk=chunk, settings=settings)
+        if vector_id not in vector_ids:
+            vector_ids.add(vector_id)
+            yield vector_id, chunk
+
+
+def _embed_chunks(
+    identified_chunks: Iterable[tuple[str, str]],
+) -> Iterator[tuple[str, list[float], dict[str, str]]]:
+    """Embed the chunks in batches and yield them as vectors ready to be uploaded."""
+    chunks_to_yield, chunks_to_embed = tee(identified_chunks)
+    embeddings = embed_texts(texts=(chunk for _, chunk in chunks_to_embed))
+    for (vector_id, chunk), vector in zip(chunks_to_yield, embeddings):
+        yield vector_id, vector, {'text': chunk}
+
+
+def _get_vector_id(chunk: str, settings: RAGSettings) -> str:
+    # The embedding model is part of the hash, so changing the model invalidates all
+    # the stored vectors.
+    embedding_provider = ServicesFactory().get_embedding_provider()
+    content = f'{embedding_provider.model_name}\n{chunk}'.encode()
+    return settings.VECTOR_ID.format(content_hash=hashlib.sha256(content).hexdigest())
 
 
 def chunk_text(text: str, max_tokens: int, overlap: int) -> list[str]:
     """Chunk text into smaller fragments of max_tokens size with overlap."""
-    tokenizer = encoding_for_model(model_name=open_ai_embedding_settings.MODEL_NAME)
-    tokens = tokenizer.encode(text)
-    chunks = []
-    if len(tokens) <= max_tokens:
-        chunks.append(text)
-    else:
-        step = max_tokens - overlap
-        for i in range(0, len(tokens), step):
-            segment = tokens[i : i + max_tokens]
-            if not segment:
-                break
-            chunked_text = tokenizer.decode(segment)
-            chunks.append(chunked_text)
-            if i + max_tokens >= len(tokens):
-                break
-    return chunks
+    return list(iter_chunk_text(text=text, max_tokens=max_tokens, overlap=overlap))
+
+
+def iter_chunk_text(text: str, max_tokens: int, overlap: int) -> Iterator[str]:
+    """Yield fragments of max_tokens size with overlap as the text is tokenized.
+
+    The text is tokenized paragraph by paragraph, and each chunk is yielded as soon
+    as its tokens are available, so chunks can be processed (e.g. embedded) before the
+    whole text has been tokenized. Chunks are slices of the original text, delimited
+    by the character offsets of their first and last tokens, so no tokens have to be
+    decoded back to text.
+    """
+    step = max_tokens - overlap
+    if step <= 0:
+        raise ValueError('The overlap must be smaller than the max tokens of a chunk.')
+    tokenizer = _get_tokenizer()
+    # Character offset of the start of each token that has not been chunked yet.
+    token_offsets: list[int] = []
+    segment_offset = 0
+    for segment in re.split(r'(?<=\n\n)', text):
+        segment_tokens = tokenizer.encode_ordinary(segment)
+        _, segment_token_offsets = tokenizer.decode_with_offsets(segment_tokens)
+        token_offsets.extend(segment_offset + offset for offset in segment_token_offsets)
+        segment_offset += len(segment)
+        # Only chunks that do not reach the end of the tokens seen so far are yielded,
+        # as the last chunk may still grow with the tokens of the next segments.
+        start = 0
+        while len(token_offsets) - start > max_tokens:
+            yield text[token_offsets[start] : token_offsets[start + max_tokens]]
+            start += step
+        del token_offsets[:start]
+    if token_offsets:
+        yield text[token_offsets[0] :]
+
+
+def iter_chunk_text_by_sentences(
+    text: str,
+    max_tokens: int,
+    overlap: int,
+) -> Iterator[str]:
+    """Yield fragments of whole sentences packed up to max_tokens, with overlap.
+
+    Sentences are added to a chunk while they fit in max_tokens. The next chunk starts
+    with the last sentences of the previous one that fit in the overlap. Sentences
+    longer than max_tokens are split in token windows.
+    """
+    tokenizer = _get_tokenizer()
+    chunk_sentences: list[tuple[str, int]] = []
+    for sentence in _SENTENCE_PATTERN.findall(text):
+        sentence_tokens = len(tokenizer.encode_ordinary(sentence))
+        if sentence_tokens > max_tokens:
+            if chunk_sentences:
+                yield _join_sentences(chunk_sentences)
+                chunk_sentences = []
+            yield from iter_chunk_text(
+                text=sentence.strip(),
+                max_tokens=max_tokens,
+                overlap=overlap,
+            )
+            continue
+        if sum(tokens for _, tokens in chunk_sentences) + sentence_tokens > max_tokens:
+            yield _join_sentences(chunk_sentences)
+            chunk_sentences = _get_overlap_sentences(
+                sentences=chunk_sentences,
+                overlap=min(overlap, max_tokens - sentence_tokens),
+            )
+        chunk_sentences.append((sentence, sentence_tokens))
+    if chunk_sentences:
+        yield _join_sentences(chunk_sentences)
+
+
+def iter_chunk_text_by_headings(
+    text: str,
+    max_tokens: int,
+    overlap: int,
+) -> Iterator[str]:
+    """Yield fragments of the sections of the text, prefixed with their heading.
+
+    The text is split in sections by its (markdown) headings, and each section is
+    chunked by sentences, so no chunk mixes content of different sections. The
+    heading of the section is prepended to each of its chunks, to keep its context.
+    """
+    tokenizer = _get_tokenizer()
+    for heading, section in _iter_sections(text=text):
+        if not section.strip():
+            continue
+        heading_tokens = len(tokenizer.encode_ordinary(f'{heading}\n'))
+        if max_tokens - heading_tokens <= overlap:
+            # The heading does not leave room for the content, so it is not prepended.
+            heading, heading_tokens = '', 0
+        for chunk in iter_chunk_text_by_sentences(
+            text=section,
+            max_tokens=max_tokens - heading_tokens,
+            overlap=overlap,
+        ):
+            yield f'{heading}\n{chunk}' if heading else chunk
+
+
+def _iter_sections(text: str) -> Iterator[tuple[str, str]]:
+    """Yield the heading and the content of each section of the text."""
+    heading, section_start = '', 0
+    for heading_match in _HEADING_PATTERN.finditer(text):
+        yield heading, text[section_start : heading_match.start()]
+        heading, section_start = heading_match.group().strip(), heading_match.end()
+    yield heading, text[section_start:]
+
+
+def _get_overlap_sentences(
+    sentences: list[tuple[str, int]],
+    overlap: int,
+) -> list[tuple[str, int]]:
+    """Return the last sentences whose tokens fit in the overlap."""
+    overlap_sentences: list[tuple[str, int]] = []
+    overlap_tokens = 0
+    for sentence, sentence_tokens in reversed(sentences):
+        if overlap_tokens + sentence_tokens > overlap:
+            break
+        overlap_sentences.insert(0, (sentence, sentence_tokens))
+        overlap_tokens += sentence_tokens
+    return overlap_sentences
+
+
+def _join_sentences(sentences: list[tuple[str, int]]) -> str:
+    return ''.join(sentence for sentence, _ in sentences).strip()
+
+
+# A sentence ends with punctuation followed by whitespace, or with a line break.
+_SENTENCE_PATTERN = re.compile(r'.+?(?:[.!?]+(?=\s)|\n|$)\s*', flags=re.DOTALL)
+# Markdown headings (e.g. "## Title") and lines that are fully bold (e.g. "**Title**").
+_HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:#{1,6}[ \t]+[^\n]+|\*\*[^*\n]+\*\*:?)[ \t]*$',
+    flags=re.MULTILINE,
+)
+_CHUNKERS: dict[ChunkingStrategyEnum, Callable[..., Iterator[str]]] = {
+    ChunkingStrategyEnum.TOKEN_WINDOW: iter_chunk_text,
+    ChunkingStrategyEnum.SENTENCE: iter_chunk_text_by_sentences,
+    ChunkingStrategyEnum.HEADING: iter_chunk_text_by_headings,
+}
+
+
+@lru_cache
+def _get_tokenizer() -> Encoding:
+    return encoding_for_model(model_name=open_ai_embedding_settings.MODEL_NAME)
 
 
 def embed_text(text: str) -> list[float]:
@@ -169,27 +498,65 @@ def embed_text(text: str) -> list[float]:
     return embedding_provider.create_embedding(text=text)
 
 
-def get_business_rag(business_id: int, query: str) -> str:
-    """Get RAG for a business based on the query."""
+async def async_embed_text(text: str) -> list[float]:
+    """Embed text without blocking the event loop."""
+    embedding_provider = ServicesFactory().get_embedding_provider()
+    return await embedding_provider.async_create_embedding(text=text)
+
+
+def embed_texts(texts: Iterable[str]) -> Iterator[list[float]]:
+    """Embed several texts in batches, preserving their order."""
+    embedding_provider = ServicesFactory().get_embedding_provider()
+    return embedding_provider.create_embeddings(texts=texts)
+
+
+async def get_rag_context(
+    business_id: int,
+    query: str,
+    include_general_rag: bool,
+) -> tuple[str, str]:
+    """Get the business and general RAG context based on the query.
+
+    The query is embedded only once, and the vector is reused to search both the
+    business and the general namespaces concurrently.
+    """
+    query_vector = await async_embed_text(query)
+    if not include_general_rag:
+        business_rag = await get_business_rag(
+            business_id=business_id,
+            query_vector=query_vector,
+        )
+        return business_rag, ''
+    business_rag, general_rag = await asyncio.gather(
+        get_business_rag(business_id=business_id, query_vector=query_vector),
+        get_general_rag(query_vector=query_vector),
+    )
+    return business_rag, general_rag
+
+
+async def get_business_rag(business_id: int, query_vector: list[float]) -> str:
+    """Get RAG for a business based on the embedded query."""
     # ToDo (pduran): Should we handle the case when a business has not a RAG
-    context_vectors = search_vectors_for_business(
+    context_vectors = await search_vectors_for_business(
         business_id=business_id,
-        query=query,
+        query_vector=query_vector,
     )
     return '\n'.join(context_vectors)
 
 
-def get_general_rag(query: str) -> str:
-    """Get general RAG based on the query."""
-    context_vectors = search_vectors_for_general(query=query)
+async def get_general_rag(query_vector: list[float]) -> str:
+    """Get general RAG based on the embedded query."""
+    context_vectors = await search_vectors_for_general(query_vector=query_vector)
     return '\n'.join(context_vectors)
 
 
-def search_vectors_for_business(business_id: int, query: str) -> list[str]:
+async def search_vectors_for_business(
+    business_id: int,
+    query_vector: list[float],
+) -> list[str]:
     """Search vectors in Pinecone."""
-    query_vector = embed_text(query)
     vector_database_provider = ServicesFactory().get_vector_database_provider()
-    return vector_database_provider.search_vectors(
+    return await vector_database_provider.async_search_vectors(
         index_name=rag_settings.INDEX_NAME,
         namespace=rag_settings.NAMESPACE_ID.format(business_id=business_id),
         query_vector=query_vector,
@@ -197,11 +564,10 @@ def search_vectors_for_business(business_id: int, query: str) -> list[str]:
     )
 
 
-def search_vectors_for_general(query: str) -> list[str]:
+async def search_vectors_for_general(query_vector: list[float]) -> list[str]:
     """Search vectors in Pinecone for general research."""
-    query_vector = embed_text(query)
     vector_database_provider = ServicesFactory().get_vector_database_provider()
-    return vector_database_provider.search_vectors(
+    return await vector_database_provider.async_search_vectors(
         index_name=general_rag_settings.INDEX_NAME,
         namespace=general_rag_settings.NAMESPACE_ID,
         query_vector=query_vector,
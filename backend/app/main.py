@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,6 +11,14 @@ from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
+from app.background_jobs import job_queue
+from app.enums import JobTypeEnum
+from app.helpers import (
+    run_business_deep_research_job,
+    run_business_research_store_job,
+    run_user_businesses_deep_research_job,
+    run_user_businesses_research_deletion_job,
+)
 from app.routers import (
     admin_router,
     business_router,
@@ -20,15 +29,47 @@ from app.routers import (
     tests_router,
     users_router,
 )
+from app.services import ServicesFactory
 from app.settings import FirebaseAuthSettings
 
 firebase_auth_settings = FirebaseAuthSettings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    job_queue.register(
+        JobTypeEnum.BUSINESS_DEEP_RESEARCH,
+        run_business_deep_research_job,
+    )
+    job_queue.register(
+        JobTypeEnum.BUSINESS_RESEARCH_STORE,
+        run_business_research_store_job,
+    )
+    job_queue.register(
+        JobTypeEnum.USER_BUSINESSES_DEEP_RESEARCH,
+        run_user_businesses_deep_research_job,
+    )
+    job_queue.register(
+        JobTypeEnum.USER_BUSINESSES_RESEARCH_DELETION,
+        run_user_businesses_research_deletion_job,
+    )
+    dr_handler_provider = ServicesFactory().get_deep_research_handler_provider()
+    identity_provider = ServicesFactory().get_identity_provider()
+    await job_queue.start()
+    await dr_handler_provider.start()
+    await identity_provider.start()
+    yield
+    await identity_provider.stop()
+    await dr_handler_provider.stop()
+    await job_queue.stop()
+
+
 app = FastAPI(
     title='Veyra Backend API',
     description='Backend module of Veyra Artificial Intelligence.',
     root_path=os.getenv('ROOT_PATH', ''),
     docs_url=None,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -1,5 +1,9 @@
 from .business import Business, BusinessIdea, EstablishedBusiness
 from .chat import Chat, ChatMessage
+from .job import Job
+from .payment_webhook_event import PaymentWebhookEvent
+from .pending_research import PendingResearch
 from .plan import Plan
+from .research import Research
 from .test import Test
 from .user import User
@@ -33,14 +33,14 @@ class Business(Base):
         'polymorphic_on': stage,
     }
 
-    # Relationships
+    # Relationships. They are only loaded when a query asks for them.
     chats = relationship(
         'Chat',
         back_populates='business',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete-orphan',
     )
-    user = relationship('User', back_populates='businesses', lazy='selectin')
+    user = relationship('User', back_populates='businesses', lazy='raise')
 
 
 class BusinessIdea(Business):
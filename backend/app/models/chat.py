@@ -2,7 +2,7 @@ from sqlalchemy.orm import relationship
 
 from app.database import Base
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 
 from app.enums import ChatMessageSenderEnum
 
@@ -15,22 +15,26 @@ class Chat(Base):
     title = Column(String, nullable=False)
     start_time = Column(DateTime(timezone=True), nullable=False)
     business_id = Column(Integer, ForeignKey('businesses.id'), nullable=False)
+    # Rolling summary of the oldest messages, up to and including the given one
+    summary = Column(Text, nullable=True)
+    summary_until_message_id = Column(Integer, nullable=True)
 
-    # Relationships
+    # Relationships. They are only loaded when a query asks for them.
     messages = relationship(
         'ChatMessage',
         back_populates='chat',
-        lazy='selectin',
+        order_by='[ChatMessage.time, ChatMessage.id]',
+        lazy='raise',
         cascade='all, delete-orphan',
     )
-    business = relationship('Business', back_populates='chats', lazy='selectin')
+    business = relationship('Business', back_populates='chats', lazy='raise')
 
 
 class ChatMessage(Base):
     __tablename__ = 'chat_messages'
 
     id = Column(Integer, primary_key=True)
-    chat_id = Column(Integer, ForeignKey('chats.id'), nullable=True, index=True)
+    chat_id = Column(Integer, ForeignKey('chats.id'), nullable=True)
     time = Column(DateTime(timezone=True), nullable=False)
     sender: Column[Enum] = Column(
         Enum(
@@ -40,5 +44,8 @@ class ChatMessage(Base):
     )
     content = Column(String, nullable=False)
 
-    # Relationships
-    chat = relationship('Chat', back_populates='messages')
+    # Relationships. They are only loaded when a query asks for them.
+    chat = relationship('Chat', back_populates='messages', lazy='raise')
+
+    # Messages of a chat are paginated by time, with the ID as tiebreaker
+    __table_args__ = (Index('ix_chat_messages_chat_id_time_id', chat_id, time, id),)
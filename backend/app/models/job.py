@@ -0,0 +1,38 @@
+from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, String
+
+from app.database import Base
+from app.enums import JobStatusEnum, JobTypeEnum
+
+
+class Job(Base):
+    __tablename__ = 'jobs'
+
+    id = Column(Integer, primary_key=True)
+    type: Column[Enum] = Column(
+        Enum(
+            JobTypeEnum,
+            values_callable=(lambda enum_class: [type_.value for type_ in enum_class]),
+        ),
+        nullable=False,
+    )
+    status: Column[Enum] = Column(
+        Enum(
+            JobStatusEnum,
+            values_callable=(lambda enum_class: [status.value for status in enum_class]),
+        ),
+        nullable=False,
+        index=True,
+    )
+    params = Column(JSON, nullable=False)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    # Jobs are kept when their user is deleted, as a history of the jobs run
+    user_id = Column(
+        Integer,
+        ForeignKey('users.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True,
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Enum, Integer, String
+
+from app.database import Base
+from app.enums import PaymentWebhookEventStatusEnum
+
+
+class PaymentWebhookEvent(Base):
+    __tablename__ = 'payment_webhook_events'
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(String(100), nullable=False, unique=True)
+    type = Column(String(100), nullable=False)
+    status: Column[Enum] = Column(
+        Enum(
+            PaymentWebhookEventStatusEnum,
+            values_callable=(lambda enum_class: [status.value for status in enum_class]),
+        ),
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+
+from app.database import Base
+
+
+class PendingResearch(Base):
+    __tablename__ = 'pending_researches'
+
+    id = Column(Integer, primary_key=True)
+    research_id = Column(String, nullable=False, unique=True)
+    business_id = Column(
+        Integer,
+        ForeignKey('businesses.id', ondelete='CASCADE'),
+        nullable=False,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    next_check_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -21,10 +21,10 @@ class Plan(Base):
     payment_service_price_id = Column(String(100), nullable=True)
     monthly_credits = Column(Integer, nullable=True, default=0)
 
-    # Relationships
+    # Relationships. They are only loaded when a query asks for them.
     users = relationship(
         'User',
         back_populates='plan',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete-orphan',
     )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String
+
+from app.database import Base
+from app.enums import ResearchRequestStatusEnum
+
+
+class Research(Base):
+    __tablename__ = 'researches'
+
+    id = Column(Integer, primary_key=True)
+    response_id = Column(String, nullable=False, unique=True)
+    # Researches are kept when their business is deleted, as a record of their usage
+    business_id = Column(
+        Integer,
+        ForeignKey('businesses.id', ondelete='SET NULL'),
+        nullable=True,
+        index=True,
+    )
+    status: Column[Enum] = Column(
+        Enum(
+            ResearchRequestStatusEnum,
+            values_callable=(lambda enum_class: [status.value for status in enum_class]),
+        ),
+        nullable=True,
+    )
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    total_tokens = Column(Integer, nullable=True)
+    citation_tokens = Column(Integer, nullable=True)
+    num_search_queries = Column(Integer, nullable=True)
+    reasoning_tokens = Column(Integer, nullable=True)
+    research = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    # When the research was uploaded to the RAG of the business.
+    stored_at = Column(DateTime(timezone=True), nullable=True)
@@ -32,11 +32,11 @@ class User(Base):
     payment_service_user_id = Column(String(100), nullable=True)
     available_credits = Column(Integer, nullable=True)
 
-    # Relationships
+    # Relationships. They are only loaded when a query asks for them.
     businesses = relationship(
         'Business',
         back_populates='user',
-        lazy='selectin',
+        lazy='raise',
         cascade='all, delete-orphan',
     )
-    plan = relationship('Plan', back_populates='users', lazy='selectin')
+    plan = relationship('Plan', back_populates='users', lazy='raise')
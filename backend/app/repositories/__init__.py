@@ -1,6 +1,10 @@
 from .base import BaseRepository
 from .businesses import BusinessRepository
 from .chats import ChatRepository
+from .jobs import JobRepository
+from .payment_webhook_events import PaymentWebhookEventRepository
+from .pending_researches import PendingResearchRepository
 from .plans import PlanRepository
+from .researches import ResearchRepository
 from .tests import TestRepository
 from .user import UserRepository
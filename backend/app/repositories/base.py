@@ -20,6 +20,9 @@ class BaseRepository:
             await self._db.rollback()
             raise
 
+    async def rollback(self):
+        await self._db.rollback()
+
     @staticmethod
     def update_model(model: Base, update: dict[str, Any]):
         for field, value in update.items():
@@ -1,33 +1,63 @@
-from sqlalchemy.orm import with_polymorphic
+from sqlalchemy.orm import selectinload, with_polymorphic
 
-from app.models import Business, BusinessIdea, EstablishedBusiness
+from app.models import Business, BusinessIdea, Chat, EstablishedBusiness
 from app.domain import (
     Business as BusinessDomain,
     BusinessIdea as BusinessIdeaDomain,
     EstablishedBusiness as EstablishedBusinessDomain,
 )
 from app.repositories import BaseRepository
+from app.cache import VersionedCache
+from app.settings import EntityCacheSettings
 
 from sqlalchemy import select
 
+settings = EntityCacheSettings()
+
+# Businesses by ID, with their whole hierarchy, looked up on most business requests
+_businesses_by_id: VersionedCache[
+    int,
+    BusinessIdeaDomain | EstablishedBusinessDomain,
+] = VersionedCache(
+    max_entries=settings.MAX_ENTRIES if settings.ENABLED else 0,
+    ttl_seconds=settings.TTL_SECONDS,
+)
+
 
 class BusinessRepository(BaseRepository):
     async def get(self, business_id: int) -> BusinessDomain | None:
+        cached_business = _businesses_by_id.get(business_id)
+        if cached_business is not None:
+            return BusinessDomain.model_validate(cached_business.model_dump())
         business = await self._get(business_id=business_id)
         if business is None:
             return None
         return BusinessDomain.model_validate(business)
 
-    # ToDo (pduran): Improve this method.
     async def get_child(
         self,
         business_id: int,
     ) -> BusinessIdeaDomain | EstablishedBusinessDomain | None:
-        business_idea = await self.get_idea(business_id=business_id)
-        if business_idea is not None:
-            return business_idea
-        established_business = await self.get_established(business_id=business_id)
-        return established_business
+        """Get a business with its whole hierarchy.
+
+        The business is fetched with a single polymorphic query, and its type is the
+        one of its stage.
+
+        Businesses are cached, if enabled, until they are updated or deleted. Copies
+        are returned, so changes to them are not applied to the cache.
+        """
+        cached_business = _businesses_by_id.get(business_id)
+        if cached_business is not None:
+            return cached_business.model_copy()
+        version = _businesses_by_id.version(business_id)
+        business_model = await self._get(business_id=business_id, load_hierarchy=True)
+        if business_model is None or not isinstance(
+            business_model, (BusinessIdea, EstablishedBusiness)
+        ):
+            return None
+        business = self._to_domain(business_model)
+        _businesses_by_id.set(business_id, business.model_copy(), version)
+        return business
 
     async def get_multi(
         self,
@@ -120,6 +150,7 @@ class BusinessRepository(BaseRepository):
             update=business_update.model_dump(exclude_unset=True),
         )
         await self.commit()
+        _businesses_by_id.invalidate(business_id)
         await self._db.refresh(business)
         return BusinessIdeaDomain.model_validate(business)
 
@@ -136,32 +167,48 @@ class BusinessRepository(BaseRepository):
             update=business_update.model_dump(exclude_unset=True),
         )
         await self.commit()
+        _businesses_by_id.invalidate(business_id)
         await self._db.refresh(business)
         return EstablishedBusinessDomain.model_validate(business)
 
     async def delete_idea(self, business_id: int) -> None:
-        business = await self._get(business_id=business_id)
+        business = await self._get(business_id=business_id, load_relationships=True)
         if business is None or not isinstance(business, BusinessIdea):
             return None
         await self._db.delete(business)
         await self.commit()
+        _businesses_by_id.invalidate(business_id)
 
     async def delete_established(self, business_id: int) -> None:
-        business = await self._get(business_id=business_id)
+        business = await self._get(business_id=business_id, load_relationships=True)
         if business is None or not isinstance(business, EstablishedBusiness):
             return None
         await self._db.delete(business)
         await self.commit()
+        _businesses_by_id.invalidate(business_id)
 
     async def _get(
         self,
         business_id: int,
         load_hierarchy: bool = False,
+        load_relationships: bool = False,
     ) -> BusinessIdea | EstablishedBusiness | None:
+        """Get a business model.
+
+        The chats of the business and their messages are only loaded if
+        load_relationships is set, as they are not part of its domain model. They are
+        needed to delete the business, as they are deleted with it.
+        """
         business_to_select = (
             with_polymorphic(Business, '*') if load_hierarchy else Business
         )
         query = select(business_to_select).where(Business.id == business_id)
+        if load_relationships:
+            query = query.options(
+                selectinload(Business.chats).selectinload(Chat.messages),
+            )
+            # The business may have been loaded in the session without them.
+            query = query.execution_options(populate_existing=True)
         result = await self._db.execute(query)
         return result.scalars().one_or_none()
 
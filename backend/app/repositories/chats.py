@@ -1,18 +1,66 @@
+from datetime import datetime
+
 from sqlalchemy.orm import selectinload
 
 from app.models import Chat, ChatMessage
 from app.domain import Chat as ChatDomain, ChatMessage as ChatMessageDomain
 from app.repositories import BaseRepository
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, literal, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 
 
 class ChatRepository(BaseRepository):
-    async def get(self, business_id: int, chat_id: int) -> ChatDomain | None:
-        chat = await self._get(chat_id=chat_id, include_messages=True)
+    async def get(
+        self,
+        business_id: int,
+        chat_id: int,
+        include_messages: bool = True,
+    ) -> ChatDomain | None:
+        chat = await self._get(chat_id=chat_id, include_messages=include_messages)
         if chat is None or chat.business_id != business_id:
             return None
-        return ChatDomain.model_validate(chat)
+        return self._chat_model_to_domain(chat, include_messages=include_messages)
+
+    async def get_for_new_message(
+        self,
+        business_id: int,
+        chat_id: int,
+        include_messages: bool = True,
+    ) -> ChatDomain | None:
+        """Get a chat with the number of its messages and the ones not in its summary.
+
+        The summarized messages are only counted, not read, so the chat history read
+        for each new message stays bounded as the chat gets longer.
+        """
+        num_messages = (
+            select(func.count()).where(ChatMessage.chat_id == Chat.id).scalar_subquery()
+        )
+        result = await self._db.execute(
+            select(Chat, num_messages).where(Chat.id == chat_id)
+        )
+        row = result.one_or_none()
+        if row is None or row[0].business_id != business_id:
+            return None
+        chat, chat_num_messages = row
+        messages = None
+        if include_messages:
+            query = (
+                select(ChatMessage)
+                .where(ChatMessage.chat_id == chat_id)
+                .order_by(ChatMessage.time, ChatMessage.id)
+            )
+            if chat.summary_until_message_id is not None:
+                query = query.where(ChatMessage.id > chat.summary_until_message_id)
+            result = await self._db.execute(query)
+            messages = [
+                ChatMessageDomain.model_validate(message)
+                for message in result.scalars().all()
+            ]
+        chat_domain = self._chat_model_to_domain(chat, include_messages=False)
+        chat_domain.messages = messages
+        chat_domain.num_messages = chat_num_messages
+        return chat_domain
 
     async def get_multi(self, business_id: int | None = None) -> list[ChatDomain]:
         query = select(Chat)
@@ -20,7 +68,39 @@ class ChatRepository(BaseRepository):
             query = query.where(Chat.business_id == business_id)
         result = await self._db.execute(query)
         chats = result.scalars().all()
-        return [ChatDomain.model_validate(chat) for chat in chats]
+        return [
+            self._chat_model_to_domain(chat, include_messages=False) for chat in chats
+        ]
+
+    async def get_messages(
+        self,
+        chat_id: int,
+        limit: int,
+        before: tuple[datetime, int] | None = None,
+    ) -> list[ChatMessageDomain]:
+        """Get the latest messages of a chat, newest first.
+
+        Only the messages sent before the given (time, ID) are returned, if any. The
+        messages are paginated by keyset on the (chat_id, time, id) index, so reading
+        a page takes the same time regardless of the length of the chat.
+        """
+        query = (
+            select(ChatMessage)
+            .where(ChatMessage.chat_id == chat_id)
+            .order_by(ChatMessage.time.desc(), ChatMessage.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            query = query.where(
+                tuple_(ChatMessage.time, ChatMessage.id)
+                < tuple_(
+                    literal(before[0], ChatMessage.time.type),
+                    literal(before[1], ChatMessage.id.type),
+                )
+            )
+        result = await self._db.execute(query)
+        messages = result.scalars().all()
+        return [ChatMessageDomain.model_validate(message) for message in messages]
 
     async def create(self, chat_in: ChatDomain) -> ChatDomain:
         new_chat = Chat(
@@ -32,24 +112,66 @@ class ChatRepository(BaseRepository):
         self._db.add(new_chat)
         await self.commit()
         await self._db.refresh(new_chat)
-        return ChatDomain.model_validate(new_chat)
+        return self._chat_model_to_domain(new_chat, include_messages=False)
 
     async def add_message(
         self,
         message: ChatMessageDomain,
     ) -> ChatMessageDomain | None:
-        chat = await self._get(chat_id=message.chat_id, include_messages=False)
-        if chat is None:
+        """Add a message to its chat. Return None if the chat does not exist."""
+        new_messages = await self.add_messages([message])
+        if new_messages is None:
+            return None
+        return new_messages[0]
+
+    async def add_messages(
+        self,
+        messages: list[ChatMessageDomain],
+    ) -> list[ChatMessageDomain] | None:
+        """Add messages to their chats in a single statement and transaction.
+
+        The messages are inserted without loading their chats, and the new rows are
+        returned by the insert in the same order. Return None, and add none of the
+        messages, if any of their chats does not exist.
+        """
+        if not messages:
+            return []
+        query = insert(ChatMessage).returning(ChatMessage, sort_by_parameter_order=True)
+        try:
+            result = await self._db.execute(
+                query,
+                [
+                    {
+                        'chat_id': message.chat_id,
+                        'time': message.time,
+                        'sender': message.sender,
+                        'content': message.content,
+                    }
+                    for message in messages
+                ],
+            )
+        except IntegrityError:
+            # The chat of a message does not exist
+            await self._db.rollback()
             return None
-        new_message = ChatMessage(
-            chat_id=message.chat_id,
-            time=message.time,
-            sender=message.sender,
-            content=message.content,
+        new_messages = result.scalars().all()
+        await self.commit()
+        return [ChatMessageDomain.model_validate(message) for message in new_messages]
+
+    async def update_summary(
+        self,
+        chat_id: int,
+        summary: str,
+        summary_until_message_id: int,
+    ) -> None:
+        """Store the summary of the messages of a chat up to the given message."""
+        query = (
+            update(Chat)
+            .where(Chat.id == chat_id)
+            .values(summary=summary, summary_until_message_id=summary_until_message_id)
         )
-        chat.messages.append(new_message)
+        await self._db.execute(query)
         await self.commit()
-        return ChatMessageDomain.model_validate(new_message)
 
     async def _get(self, chat_id: int, include_messages: bool) -> Chat | None:
         query = select(Chat).where(Chat.id == chat_id)
@@ -57,3 +179,28 @@ class ChatRepository(BaseRepository):
             query = query.options(selectinload(Chat.messages))
         result = await self._db.execute(query)
         return result.scalars().one_or_none()
+
+    @staticmethod
+    def _chat_model_to_domain(chat: Chat, include_messages: bool) -> ChatDomain:
+        """Map a chat model to its domain model.
+
+        The messages are only read if include_messages is set, as they are not loaded
+        otherwise.
+        """
+        return ChatDomain.model_validate(
+            {
+                'id': chat.id,
+                'internal_id': chat.internal_id,
+                'title': chat.title,
+                'start_time': chat.start_time,
+                'business_id': chat.business_id,
+                'summary': chat.summary,
+                'summary_until_message_id': chat.summary_until_message_id,
+                'messages': (
+                    [ChatMessageDomain.model_validate(m) for m in chat.messages]
+                    if include_messages
+                    else None
+                ),
+                'num_messages': len(chat.messages) if include_messages else None,
+            }
+        )
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, select, update
+
+from app.domain import Job as JobDomain
+from app.enums import JobStatusEnum
+from app.models import Job
+from app.repositories import BaseRepository
+
+
+class JobRepository(BaseRepository):
+    async def get(self, job_id: int) -> JobDomain | None:
+        query = select(Job).where(Job.id == job_id)
+        result = await self._db.execute(query)
+        job = result.scalars().one_or_none()
+        if job is None:
+            return None
+        return JobDomain.model_validate(job)
+
+    async def get_multi(self, status: JobStatusEnum | None = None) -> list[JobDomain]:
+        query = select(Job).order_by(Job.id)
+        if status is not None:
+            query = query.where(Job.status == status)
+        result = await self._db.execute(query)
+        jobs = result.scalars().all()
+        return [JobDomain.model_validate(job) for job in jobs]
+
+    async def create(self, job_in: JobDomain) -> JobDomain:
+        new_job = Job(
+            type=job_in.type,
+            status=job_in.status,
+            params=job_in.params,
+            user_id=job_in.user_id,
+            created_at=job_in.created_at or datetime.now(timezone.utc),
+        )
+        self._db.add(new_job)
+        await self.commit()
+        await self._db.refresh(new_job)
+        return JobDomain.model_validate(new_job)
+
+    async def claim(self, job_id: int) -> JobDomain | None:
+        """Mark a pending job as running. Return None if it was not pending.
+
+        The status is checked and updated in a single statement, so a job is only
+        claimed once even if several workers try to claim it at the same time.
+        """
+        query = (
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatusEnum.PENDING)
+            .values(status=JobStatusEnum.RUNNING, started_at=datetime.now(timezone.utc))
+            .returning(Job)
+        )
+        result = await self._db.execute(query)
+        job = result.scalars().one_or_none()
+        await self.commit()
+        if job is None:
+            return None
+        return JobDomain.model_validate(job)
+
+    async def finish(
+        self,
+        job_id: int,
+        status: JobStatusEnum,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> None:
+        query = (
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=status,
+                result=result,
+                error=error,
+                finished_at=datetime.now(timezone.utc),
+            )
+        )
+        await self._db.execute(query)
+        await self.commit()
+
+    async def reset_stale(self, started_before: datetime) -> int:
+        """Mark running jobs started before the given time as pending again.
+
+        It is used to recover the jobs of processes stopped while running them.
+        Return the number of jobs reset.
+        """
+        query = (
+            update(Job)
+            .where(Job.status == JobStatusEnum.RUNNING)
+            .where(Job.started_at < started_before)
+            .values(status=JobStatusEnum.PENDING, started_at=None)
+        )
+        result = await self._db.execute(query)
+        await self.commit()
+        return cast(CursorResult, result).rowcount
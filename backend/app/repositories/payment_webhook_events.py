@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.enums import PaymentWebhookEventStatusEnum
+from app.models import PaymentWebhookEvent
+from app.repositories import BaseRepository
+
+
+class PaymentWebhookEventRepository(BaseRepository):
+    async def claim(
+        self,
+        event_id: str,
+        event_type: str,
+        processing_started_before: datetime,
+    ) -> bool:
+        """Record that an event is being processed. Return False if it must be skipped.
+
+        A single statement inserts the event, or updates it only if its previous
+        processing failed or started before processing_started_before. So an event
+        processed or being processed is never claimed again.
+        """
+        now = datetime.now(timezone.utc)
+        insert_query = insert(PaymentWebhookEvent).values(
+            event_id=event_id,
+            type=event_type,
+            status=PaymentWebhookEventStatusEnum.PROCESSING,
+            created_at=now,
+            updated_at=now,
+        )
+        query = insert_query.on_conflict_do_update(
+            index_elements=[PaymentWebhookEvent.event_id],
+            set_={'status': PaymentWebhookEventStatusEnum.PROCESSING, 'updated_at': now},
+            where=or_(
+                PaymentWebhookEvent.status == PaymentWebhookEventStatusEnum.FAILED,
+                and_(
+                    PaymentWebhookEvent.status
+                    == PaymentWebhookEventStatusEnum.PROCESSING,
+                    PaymentWebhookEvent.updated_at < processing_started_before,
+                ),
+            ),
+        ).returning(PaymentWebhookEvent)
+        result = await self._db.execute(query)
+        claimed = result.scalars().one_or_none() is not None
+        await self.commit()
+        return claimed
+
+    async def update_status(
+        self,
+        event_id: str,
+        status: PaymentWebhookEventStatusEnum,
+    ) -> None:
+        query = (
+            update(PaymentWebhookEvent)
+            .where(PaymentWebhookEvent.event_id == event_id)
+            .values(status=status, updated_at=datetime.now(timezone.utc))
+        )
+        await self._db.execute(query)
+        await self.commit()
@@ -0,0 +1,95 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain import PendingResearch as PendingResearchDomain
+from app.models import PendingResearch
+from app.repositories import BaseRepository
+
+
+class PendingResearchRepository(BaseRepository):
+    async def create(self, pending_research_in: PendingResearchDomain) -> None:
+        """Track a research. Nothing is done if it is already tracked."""
+        query = (
+            insert(PendingResearch)
+            .values(
+                research_id=pending_research_in.research_id,
+                business_id=pending_research_in.business_id,
+                attempts=pending_research_in.attempts,
+                created_at=pending_research_in.created_at,
+                next_check_at=pending_research_in.next_check_at,
+            )
+            .on_conflict_do_nothing(index_elements=[PendingResearch.research_id])
+        )
+        await self._db.execute(query)
+        await self.commit()
+
+    async def claim_due(
+        self,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+    ) -> list[PendingResearchDomain]:
+        """Get the researches due to be checked, and postpone them until lease_until.
+
+        Researches are selected skipping the ones locked by other transactions, so
+        concurrent pollers never claim the same research.
+        """
+        due_ids = (
+            select(PendingResearch.id)
+            .where(PendingResearch.next_check_at <= now)
+            .order_by(PendingResearch.next_check_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        query = (
+            update(PendingResearch)
+            .where(PendingResearch.id.in_(due_ids))
+            .values(next_check_at=lease_until)
+            .returning(PendingResearch)
+        )
+        result = await self._db.execute(query)
+        pending_researches = result.scalars().all()
+        await self.commit()
+        return [
+            PendingResearchDomain.model_validate(pending_research)
+            for pending_research in pending_researches
+        ]
+
+    async def get(self, pending_research_id: int) -> PendingResearchDomain | None:
+        query = select(PendingResearch).where(PendingResearch.id == pending_research_id)
+        result = await self._db.execute(query)
+        pending_research = result.scalars().one_or_none()
+        if pending_research is None:
+            return None
+        return PendingResearchDomain.model_validate(pending_research)
+
+    async def get_next_due(self) -> PendingResearchDomain | None:
+        """Get the research that is due to be checked first."""
+        query = select(PendingResearch).order_by(PendingResearch.next_check_at).limit(1)
+        result = await self._db.execute(query)
+        pending_research = result.scalars().one_or_none()
+        if pending_research is None:
+            return None
+        return PendingResearchDomain.model_validate(pending_research)
+
+    async def reschedule(
+        self,
+        pending_research_id: int,
+        attempts: int,
+        next_check_at: datetime,
+    ) -> None:
+        query = (
+            update(PendingResearch)
+            .where(PendingResearch.id == pending_research_id)
+            .values(attempts=attempts, next_check_at=next_check_at)
+        )
+        await self._db.execute(query)
+        await self.commit()
+
+    async def delete(self, pending_research_id: int) -> None:
+        query = delete(PendingResearch).where(PendingResearch.id == pending_research_id)
+        await self._db.execute(query)
+        await self.commit()
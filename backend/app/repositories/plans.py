@@ -1,8 +1,20 @@
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
+from app.cache import TTLCache
 from app.domain import Plan as PlanDomain, PlanBase as PlanBaseDomain
+from app.models import Business, Chat, User
 from app.models.plan import Plan
 from app.repositories import BaseRepository
+from app.settings import PlanCacheSettings
+
+settings = PlanCacheSettings()
+
+# Active plans by their payment service price ID, looked up on every payment webhook
+_active_plans_by_price_id: TTLCache[str, PlanDomain] = TTLCache(
+    max_entries=settings.MAX_ENTRIES,
+    ttl_seconds=settings.TTL_SECONDS,
+)
 
 
 class PlanRepository(BaseRepository):
@@ -32,6 +44,26 @@ class PlanRepository(BaseRepository):
         plans = result.scalars().all()
         return [PlanDomain.model_validate(plan) for plan in plans]
 
+    async def get_active_by_payment_service_price_id(
+        self,
+        payment_service_price_id: str,
+    ) -> PlanDomain | None:
+        """Get the active plan with the given payment service price ID.
+
+        Plans are cached for a while, as they rarely change.
+        """
+        plan = _active_plans_by_price_id.get(payment_service_price_id)
+        if plan is not None:
+            return plan
+        plans = await self.get_multi(
+            is_active=True,
+            payment_service_price_id=payment_service_price_id,
+        )
+        if len(plans) != 1:
+            return None
+        _active_plans_by_price_id.set(payment_service_price_id, plans[0])
+        return plans[0]
+
     async def create(self, plan_in: PlanBaseDomain) -> PlanDomain:
         new_plan = Plan(
             name=plan_in.name,
@@ -43,6 +75,7 @@ class PlanRepository(BaseRepository):
         self._db.add(new_plan)
         await self.commit()
         await self._db.refresh(new_plan)
+        _active_plans_by_price_id.clear()
         return PlanDomain.model_validate(new_plan)
 
     async def update(self, plan_id: int, plan_in: PlanBaseDomain) -> PlanDomain | None:
@@ -55,15 +88,31 @@ class PlanRepository(BaseRepository):
 
         await self.commit()
         await self._db.refresh(plan)
+        _active_plans_by_price_id.clear()
         return PlanDomain.model_validate(plan)
 
     async def delete(self, plan_id: int) -> None:
-        plan = await self._get(plan_id=plan_id)
+        # The users of the plan are deleted with it, with their businesses, chats
+        # and messages, so they are loaded to be deleted by the session.
+        query = (
+            select(Plan)
+            .where(Plan.id == plan_id)
+            .options(
+                selectinload(Plan.users)
+                .selectinload(User.businesses)
+                .selectinload(Business.chats)
+                .selectinload(Chat.messages)
+            )
+            .execution_options(populate_existing=True)
+        )
+        result = await self._db.execute(query)
+        plan = result.scalars().one_or_none()
         if not plan:
             return None
 
         await self._db.delete(plan)
         await self.commit()
+        _active_plans_by_price_id.clear()
         return None
 
     async def _get(self, plan_id: int) -> Plan | None:
@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain import Research as ResearchDomain
+from app.models import Research
+from app.repositories import BaseRepository
+
+
+class ResearchRepository(BaseRepository):
+    async def get(self, response_id: str) -> ResearchDomain | None:
+        query = select(Research).where(Research.response_id == response_id)
+        result = await self._db.execute(query)
+        research = result.scalars().one_or_none()
+        if research is None:
+            return None
+        return ResearchDomain.model_validate(research)
+
+    async def get_multi(self, business_id: int | None = None) -> list[ResearchDomain]:
+        query = select(Research).order_by(Research.id)
+        if business_id is not None:
+            query = query.where(Research.business_id == business_id)
+        result = await self._db.execute(query)
+        researches = result.scalars().all()
+        return [ResearchDomain.model_validate(research) for research in researches]
+
+    async def upsert(self, research_in: ResearchDomain) -> ResearchDomain:
+        """Create or update a research by its response ID.
+
+        Fields that are not set (None) keep their stored value, so a research
+        response without usage or text does not clear them.
+        """
+        now = datetime.now(timezone.utc)
+        values = research_in.model_dump(
+            exclude={'id', 'created_at', 'updated_at', 'stored_at'},
+        )
+        insert_query = insert(Research).values(**values, created_at=now, updated_at=now)
+        query = insert_query.on_conflict_do_update(
+            index_elements=[Research.response_id],
+            set_={
+                **{
+                    field: func.coalesce(
+                        insert_query.excluded[field],
+                        Research.__table__.c[field],
+                    )
+                    for field in values
+                    if field != 'response_id'
+                },
+                'updated_at': now,
+            },
+        ).returning(Research)
+        result = await self._db.execute(query)
+        research = result.scalars().one()
+        await self.commit()
+        return ResearchDomain.model_validate(research)
+
+    async def mark_stored(self, response_id: str, business_id: int) -> ResearchDomain:
+        now = datetime.now(timezone.utc)
+        query = (
+            update(Research)
+            .where(Research.response_id == response_id)
+            .values(business_id=business_id, stored_at=now, updated_at=now)
+            .returning(Research)
+        )
+        result = await self._db.execute(query)
+        research = result.scalars().one()
+        await self.commit()
+        return ResearchDomain.model_validate(research)
@@ -1,12 +1,22 @@
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 
 from app.domain import (
     UserBase as UserBaseDomain,
     UserExtended as UserExtendedDomain,
     UserWithSecret as UserWithSecretDomain,
 )
+from app.cache import VersionedCache
 from app.models import User
 from app.repositories import BaseRepository
+from app.settings import EntityCacheSettings
+
+settings = EntityCacheSettings()
+
+# Users by external ID, looked up on every authenticated request
+_users_by_external_id: VersionedCache[str, UserExtendedDomain] = VersionedCache(
+    max_entries=settings.MAX_ENTRIES if settings.ENABLED else 0,
+    ttl_seconds=settings.TTL_SECONDS,
+)
 
 
 class UserRepository(BaseRepository):
@@ -31,10 +41,21 @@ class UserRepository(BaseRepository):
         return await self._user_model_to_domain(user)
 
     async def get_by_external_id(self, external_id: str) -> UserExtendedDomain | None:
+        """Get a user by its external ID.
+
+        Users are cached, if enabled, until they are updated. Copies are returned, so
+        changes to them are not applied to the cache.
+        """
+        cached_user = _users_by_external_id.get(external_id)
+        if cached_user is not None:
+            return cached_user.model_copy()
+        version = _users_by_external_id.version(external_id)
         user = await self._get_by_external_id(external_id=external_id)
         if user is None:
             return None
-        return await self._user_model_to_domain(user)
+        user_domain = await self._user_model_to_domain(user)
+        _users_by_external_id.set(external_id, user_domain.model_copy(), version)
+        return user_domain
 
     async def get_multi(
         self,
@@ -96,11 +117,43 @@ class UserRepository(BaseRepository):
         except KeyError:
             pass
 
+        previous_user = await self._user_model_to_domain(user)
         self.update_model(model=user, update=user_dict)
 
         await self.commit()
         await self._db.refresh(user)
-        return await self._user_model_to_domain(user)
+        updated_user = await self._user_model_to_domain(user)
+        for external_id in {previous_user.external_id, updated_user.external_id}:
+            if external_id is not None:
+                _users_by_external_id.invalidate(external_id)
+        return updated_user
+
+    async def subtract_credits(self, user_id: int, credits: int) -> bool:
+        """Subtract credits from a user, if the user has enough of them.
+
+        The credits are checked and subtracted in a single statement, so they are
+        never written back from a stale copy of the user, and concurrent requests
+        cannot spend the same credits. Users with `None` credits are not limited, so
+        they are left unchanged.
+
+        Returns whether the user had enough credits.
+        """
+        query = (
+            update(User)
+            .where(
+                User.id == user_id,
+                or_(User.available_credits.is_(None), User.available_credits >= credits),
+            )
+            .values(available_credits=User.available_credits - credits)
+            .returning(User.external_id)
+        )
+        result = await self._db.execute(query)
+        external_ids = result.scalars().all()
+        await self.commit()
+        for external_id in external_ids:
+            if external_id is not None:
+                _users_by_external_id.invalidate(external_id)
+        return len(external_ids) > 0
 
     async def _get(self, user_id: int) -> User | None:
         query = select(User).where(User.id == user_id)
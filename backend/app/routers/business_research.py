@@ -3,19 +3,24 @@
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 
 from app import schemas
-from app.authorization_server import RoleChecker, user_can_read_business
+from app.authorization_server import (
+    RoleChecker,
+    user_can_read_business,
+    user_can_read_job,
+)
+from app.background_jobs import job_queue
 from app.deps import get_current_active_user, get_repository
-from app.domain import User as UserDomain
-from app.enums import ResearchRequestStatusEnum, UserRoleEnum
+from app.domain import Job as JobDomain, User as UserDomain
+from app.enums import JobTypeEnum, UserRoleEnum
 from app.helpers import (
     chunk_and_upload_text,
-    deep_research_for_business,
     deep_research_for_business_async,
+    get_research,
     schedule_deep_research_for_business,
+    store_research_for_business,
 )
-from app.helpers.helpers_rag import get_deep_research_async
-from app.repositories import BusinessRepository
-from app.schemas import ResearchExtended, ResearchParams, ResearchStoreById
+from app.repositories import BusinessRepository, JobRepository, ResearchRepository
+from app.schemas import Job, ResearchExtended, ResearchParams, ResearchStoreById
 
 router = APIRouter(
     tags=['Research'],
@@ -38,12 +43,15 @@ router = APIRouter(
 )
 async def get_research_by_id(
     research_id: str,
+    researches_repo: ResearchRepository = Depends(get_repository(ResearchRepository)),
 ):
     """Get research by ID."""
-    # ToDo (pduran): Implement authorization check for research access. This would
-    #  require to store the mapping of research IDs to business IDs or user IDs, which
-    #  is not currently implemented.
-    research = get_deep_research_async(request_id=research_id)
+    # ToDo (pduran): Implement authorization check for research access, now that
+    #  researches are mapped to their business, to allow basic users to read them.
+    research = await get_research(
+        research_id=research_id,
+        researches_repo=researches_repo,
+    )
     if research is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -52,6 +60,47 @@ async def get_research_by_id(
     return research
 
 
+@router.get(
+    '/jobs/{job_id}',
+    summary='Get research job by ID',
+    response_model=Job,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {'model': schemas.HTTP401Unauthorized},
+        status.HTTP_403_FORBIDDEN: {'model': schemas.HTTP403Forbidden},
+        status.HTTP_404_NOT_FOUND: {'model': schemas.HTTP404NotFound},
+    },
+    dependencies=[
+        Depends(
+            RoleChecker(
+                allowed_roles=[
+                    UserRoleEnum.ADMIN,
+                    UserRoleEnum.BASIC,
+                    UserRoleEnum.SERVICE,
+                ]
+            )
+        ),
+    ],
+)
+async def get_research_job_by_id(
+    job_id: int,
+    jobs_repo: JobRepository = Depends(get_repository(JobRepository)),
+    current_user: UserDomain = Depends(get_current_active_user),
+):
+    """Get research job by ID."""
+    job = await jobs_repo.get(job_id=job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Job not found',
+        )
+    if not user_can_read_job(job, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='User does not have enough privileges.',
+        )
+    return job
+
+
 @router.post(
     '/{research_id}/store',
     summary='Store research by ID',
@@ -66,46 +115,26 @@ async def get_research_by_id(
         Depends(RoleChecker(allowed_roles=[UserRoleEnum.ADMIN, UserRoleEnum.SERVICE]))
     ],
 )
-async def store_research_by_id(  # noqa: C901
+async def store_research_by_id(
     research_id: str,
     research_store_params: ResearchStoreById,
+    researches_repo: ResearchRepository = Depends(get_repository(ResearchRepository)),
 ):
-    """Store research by ID."""
-    research_info = get_deep_research_async(request_id=research_id)
-    if research_info is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Research not found',
-        )
-    if research_info.status is not ResearchRequestStatusEnum.COMPLETED:
-        research_status = (
-            research_info.status.value if research_info.status else 'unknown'
-        )
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                'Research request is not completed yet. Current status is '
-                f'{research_status}'
-            ),
-        )
-    if research_info.research is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=(
-                f'Research text empty (although status is {research_info.status}).',
-            ),
-        )
-    research_text = research_info.research
-    chunk_and_upload_text(
-        text=research_text,
+    """Store research by ID.
+
+    A research already stored is not stored again, so repeated calls do nothing.
+    """
+    await store_research_for_business(
+        research_id=research_id,
         business_id=research_store_params.business_id,
+        researches_repo=researches_repo,
     )
 
 
 @router.post(
     '',
     summary='Create a research',
-    response_model=ResearchExtended,
+    response_model=ResearchExtended | Job,
     status_code=status.HTTP_201_CREATED,
     responses={
         status.HTTP_401_UNAUTHORIZED: {'model': schemas.HTTP401Unauthorized},
@@ -127,9 +156,16 @@ async def store_research_by_id(  # noqa: C901
 async def create_research(
     research_params: ResearchParams,
     business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+    jobs_repo: JobRepository = Depends(get_repository(JobRepository)),
+    researches_repo: ResearchRepository = Depends(get_repository(ResearchRepository)),
     current_user: UserDomain = Depends(get_current_active_user),
 ):
-    """Create a research."""
+    """Create a research.
+
+    If the research is generated synchronously, it is done by a background job,
+    which is returned so its status can be polled. The research is uploaded to the
+    business RAG when it finishes.
+    """
     if research_params.business_id is None:
         raise HTTPException(
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -149,14 +185,22 @@ async def create_research(
                 detail='User does not have enough privileges.',
             )
         if research_params.sync_generation:
-            research = deep_research_for_business(
-                business=business,
-                params=research_params,
+            job = await jobs_repo.create(
+                JobDomain(
+                    type=JobTypeEnum.BUSINESS_DEEP_RESEARCH,
+                    params=research_params.model_dump(mode='json'),
+                    user_id=current_user.id,
+                )
             )
+            if job.id is None:
+                raise ValueError('Job ID not found. This error should never happen.')
+            job_queue.enqueue(job.id)
+            return job
         else:
-            research = deep_research_for_business_async(
+            research = await deep_research_for_business_async(
                 business=business,
                 params=research_params,
+                researches_repo=researches_repo,
             )
     return research
 
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 
 from app import schemas
@@ -23,6 +23,8 @@ from app.helpers import (
     add_store_message_and_get_store_response,
     add_store_message_and_get_store_response_stream,
     create_chat_in_service,
+    get_chat_for_new_message,
+    get_chat_messages_page,
     get_chat_title,
     subtract_user_credits_for_new_message_in_chat,
 )
@@ -32,7 +34,13 @@ from app.repositories import (
     PlanRepository,
     UserRepository,
 )
-from app.schemas import Chat, ChatBase, ChatMessage, ChatMessageContent
+from app.schemas import (
+    Chat,
+    ChatBase,
+    ChatMessage,
+    ChatMessageContent,
+    ChatMessagePage,
+)
 
 router = APIRouter(
     tags=['Chat'],
@@ -97,6 +105,56 @@ async def get_chat_by_id(
     return chat
 
 
+@router.get(
+    '/{chat_id}/messages',
+    summary='List messages of a chat',
+    response_model=ChatMessagePage,
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {'model': schemas.HTTP400BadRequest},
+        status.HTTP_401_UNAUTHORIZED: {'model': schemas.HTTP401Unauthorized},
+        status.HTTP_403_FORBIDDEN: {'model': schemas.HTTP403Forbidden},
+        status.HTTP_404_NOT_FOUND: {'model': schemas.HTTP404NotFound},
+    },
+)
+async def list_chat_messages(
+    business_id: int,
+    chat_id: int,
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: str | None = None,
+    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+    chats_repo: ChatRepository = Depends(get_repository(ChatRepository)),
+    current_user: UserDomain = Depends(get_current_active_user),
+):
+    """List the messages of a chat by pages, starting from the latest ones.
+
+    The messages of a page are in chronological order. Pass the `next_cursor` of a
+    page as `cursor` to get the previous messages.
+    """
+    await get_business(
+        business_id=business_id,
+        user=current_user,
+        business_repo=business_repo,
+        permission_func=user_can_read_chat,
+    )
+    chat = await chats_repo.get(
+        business_id=business_id,
+        chat_id=chat_id,
+        include_messages=False,
+    )
+    if chat is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Chat not found',
+        )
+    return await get_chat_messages_page(
+        chat_id=chat_id,
+        limit=limit,
+        cursor=cursor,
+        chats_repo=chats_repo,
+    )
+
+
 @router.post(
     '',
     summary='Create chat',
@@ -170,7 +228,11 @@ async def add_message(
         sender=ChatMessageSenderEnum.USER,
         content=message_content.content,
     )
-    chat = await chats_repo.get(business_id=business_id, chat_id=chat_id)
+    chat = await get_chat_for_new_message(
+        business_id=business_id,
+        chat_id=chat_id,
+        chats_repo=chats_repo,
+    )
     if chat is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -235,7 +297,11 @@ async def add_message_stream(
         sender=ChatMessageSenderEnum.USER,
         content=message_content.content,
     )
-    chat = await chats_repo.get(business_id=business_id, chat_id=chat_id)
+    chat = await get_chat_for_new_message(
+        business_id=business_id,
+        chat_id=chat_id,
+        chats_repo=chats_repo,
+    )
     if chat is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
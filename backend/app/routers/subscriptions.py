@@ -12,7 +12,12 @@ from app.helpers import (
     get_portal_session,
     handle_subscription_webhook,
 )
-from app.repositories import BusinessRepository, PlanRepository, UserRepository
+from app.repositories import (
+    JobRepository,
+    PaymentWebhookEventRepository,
+    PlanRepository,
+    UserRepository,
+)
 from app.schemas import (
     CheckoutSession,
     CheckoutSessionResponse,
@@ -112,12 +117,16 @@ async def subscription_webhook(
     request: Request,
     users_repo: UserRepository = Depends(get_repository(UserRepository)),
     plans_repo: PlanRepository = Depends(get_repository(PlanRepository)),
-    business_repo: BusinessRepository = Depends(get_repository(BusinessRepository)),
+    jobs_repo: JobRepository = Depends(get_repository(JobRepository)),
+    payment_webhook_events_repo: PaymentWebhookEventRepository = Depends(
+        get_repository(PaymentWebhookEventRepository)
+    ),
 ):
     """Subscriptions webhook."""
     return await handle_subscription_webhook(
         request=request,
         users_repo=users_repo,
         plans_repo=plans_repo,
-        business_repo=business_repo,
+        jobs_repo=jobs_repo,
+        payment_webhook_events_repo=payment_webhook_events_repo,
     )
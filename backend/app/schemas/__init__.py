@@ -9,7 +9,8 @@ from .business import (
     EstablishedBusinessPartialUpdate,
 )
 from .business_research import ResearchExtended, ResearchParams, ResearchStoreById
-from .chat import Chat, ChatBase, ChatMessage, ChatMessageContent
+from .chat import Chat, ChatBase, ChatMessage, ChatMessageContent, ChatMessagePage
+from .job import Job
 from .errors import (
     HTTP400BadRequest,
     HTTP401Unauthorized,
@@ -26,3 +26,9 @@ class ChatBase(BaseModel):
 
 class Chat(ChatBase):
     messages: list[ChatMessage]
+
+
+class ChatMessagePage(BaseModel):
+    messages: list[ChatMessage]
+    # Cursor of the page with the previous messages, if any
+    next_cursor: str | None = None
@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.enums import JobStatusEnum, JobTypeEnum
+
+
+class Job(BaseModel):
+    id: int
+    type: JobTypeEnum
+    status: JobStatusEnum
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
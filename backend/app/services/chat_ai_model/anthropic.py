@@ -12,6 +12,11 @@ from app.domain import (
 )
 from app.enums import ChatMessageSenderEnum
 from app.services.chat_ai_model.base import ChatAIModelProvider
+from app.services.chat_ai_model.context import (
+    estimate_tokens,
+    get_unsummarized_messages,
+    split_messages_by_budget,
+)
 from app.settings import AnthropicSettings
 
 
@@ -21,6 +26,8 @@ settings = AnthropicSettings()
 class ChatAIModelAnthropic(ChatAIModelProvider):
     """Anthropic chat model provider using explicit message history."""
 
+    sends_messages_history = True
+
     def __init__(self):
         self.client = AsyncAnthropic(api_key=settings.API_KEY)
         self.tools = [
@@ -68,21 +75,10 @@ class ChatAIModelAnthropic(ChatAIModelProvider):
         business_rag: str,
         general_rag: str,
     ) -> str:
-        messages = [self._business_info_to_anthropic_message(business=business)]
-        if chat.messages is not None:
-            messages.extend(
-                [
-                    self._chat_message_domain_to_anthropic_message(msg)
-                    for msg in chat.messages
-                ]
-            )
-
-        # Add user message to history
-        messages.append(
-            {
-                'role': ChatMessageSenderEnum.USER.value,
-                'content': [{'type': 'text', 'text': content}],
-            }
+        messages = self._build_messages_history(
+            business=business,
+            chat=chat,
+            content=content,
         )
 
         response = await self.client.messages.create(
@@ -111,19 +107,10 @@ class ChatAIModelAnthropic(ChatAIModelProvider):
         general_rag: str,
     ) -> AsyncGenerator[str, None]:
         """Streams Claude's response, handling tool_use blocks (RAG injection)."""
-        messages_history = [self._business_info_to_anthropic_message(business=business)]
-        if chat.messages:
-            messages_history.extend(
-                [
-                    self._chat_message_domain_to_anthropic_message(msg)
-                    for msg in chat.messages
-                ]
-            )
-        messages_history.append(
-            {
-                'role': 'user',
-                'content': [{'type': 'text', 'text': content}],
-            }
+        messages_history = self._build_messages_history(
+            business=business,
+            chat=chat,
+            content=content,
         )
 
         system_prompt = self.get_instructions_prompt()
@@ -217,14 +204,43 @@ class ChatAIModelAnthropic(ChatAIModelProvider):
         async for chunk in stream_from_anthropic_internal(messages_history):
             yield chunk
 
+    async def update_chat_summary(self, chat: ChatDomain) -> ChatDomain:
+        """Summarize the oldest messages of the chat if its history is too long.
+
+        Once the messages not in the summary exceed the context budget, the oldest ones
+        are added to the summary, keeping the latest ones within the recent budget.
+        """
+        messages = get_unsummarized_messages(chat)
+        messages_tokens = sum(estimate_tokens(message.content) for message in messages)
+        if messages_tokens <= settings.CONTEXT_MAX_TOKENS:
+            return chat
+        oldest_messages, _ = split_messages_by_budget(
+            messages,
+            max_tokens=settings.CONTEXT_RECENT_TOKENS,
+        )
+        if not oldest_messages:
+            return chat
+        summary = await self._summarize_messages(
+            summary=chat.summary,
+            messages=oldest_messages,
+        )
+        return chat.model_copy(
+            update={
+                'summary': summary,
+                'summary_until_message_id': max(
+                    message.id for message in oldest_messages if message.id is not None
+                ),
+            }
+        )
+
     @staticmethod
     def get_new_message_credit_cost(chat: ChatDomain) -> int:
-        if chat.messages is None:
+        if chat.num_messages is None:
             raise ValueError(
                 'Credit cost cannot be calculated for a chat without messages '
                 'information.'
             )
-        new_message_num = len(chat.messages) + 1
+        new_message_num = chat.num_messages + 1
         if new_message_num == 1:
             return 2
         elif 2 <= new_message_num <= 6:
@@ -311,6 +327,77 @@ class ChatAIModelAnthropic(ChatAIModelProvider):
 
         return full_response
 
+    def _build_messages_history(
+        self,
+        business: BusinessDomain,
+        chat: ChatDomain,
+        content: str,
+    ) -> list[dict]:
+        """Build the messages sent to the model for a new message in a chat.
+
+        The history starts with the business info and the chat summary, followed by
+        the latest messages not in the summary that fit in the context budget.
+        """
+        first_message = self._business_info_to_anthropic_message(business=business)
+        if chat.summary:
+            first_message['content'].append(
+                {
+                    'type': 'text',
+                    'text': f'Resumen de la conversación anterior:\n{chat.summary}',
+                }
+            )
+        _, latest_messages = split_messages_by_budget(
+            get_unsummarized_messages(chat),
+            max_tokens=settings.CONTEXT_MAX_TOKENS,
+        )
+        return [
+            first_message,
+            *[
+                self._chat_message_domain_to_anthropic_message(msg)
+                for msg in latest_messages
+            ],
+            {
+                'role': ChatMessageSenderEnum.USER.value,
+                'content': [{'type': 'text', 'text': content}],
+            },
+        ]
+
+    async def _summarize_messages(
+        self,
+        summary: str | None,
+        messages: list[ChatMessageDomain],
+    ) -> str:
+        """Summarize chat messages, extending the previous summary if any."""
+        speakers = {
+            ChatMessageSenderEnum.USER: 'Emprendedor',
+            ChatMessageSenderEnum.AI_MODEL: 'Mentor',
+        }
+        conversation = '\n\n'.join(
+            f'{speakers[msg.sender]}: {msg.content}' for msg in messages
+        )
+        prompt = (
+            'Resume la siguiente conversación entre un emprendedor y su mentor. '
+            'Conserva los datos del negocio, las decisiones tomadas, las '
+            'recomendaciones dadas y las preguntas pendientes. Responde solo con el '
+            'resumen.'
+        )
+        if summary:
+            prompt += f'\n\nResumen de la conversación anterior:\n{summary}'
+        response = await self.client.messages.create(
+            model=settings.SUMMARY_MODEL_NAME,
+            max_tokens=settings.SUMMARY_MAX_TOKENS,
+            messages=[
+                {
+                    'role': 'user',
+                    'content': [
+                        {'type': 'text', 'text': prompt},
+                        {'type': 'text', 'text': conversation},
+                    ],
+                }
+            ],
+        )
+        return ''.join(block.text for block in response.content if block.type == 'text')
+
     @staticmethod
     def _handle_tool_call(tool_name: str, business_rag: str, general_rag: str) -> str:
         if tool_name == 'get_internal_knowledge':
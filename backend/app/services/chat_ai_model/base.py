@@ -7,6 +7,10 @@ from app.domain import Business as BusinessDomain, Chat as ChatDomain
 class ChatAIModelProvider(ABC):
     """Base class for chat AI model providers."""
 
+    # Whether the chat history is sent to the model with each message. Providers that
+    # keep the history themselves only need the number of messages of the chat.
+    sends_messages_history: bool = False
+
     @staticmethod
     @abstractmethod
     async def create_chat() -> str:
@@ -36,6 +40,14 @@ class ChatAIModelProvider(ABC):
         """Add a message to a chat and return the response of the AI model as stream."""
         raise NotImplementedError
 
+    async def update_chat_summary(self, chat: ChatDomain) -> ChatDomain:
+        """Return the chat with the summary of its oldest messages updated if needed.
+
+        Providers that keep the chat history themselves do not need a summary, so the
+        chat is returned as it is by default.
+        """
+        return chat
+
     def get_instructions_prompt(self) -> str:
         base_instructions = """
         System prompt: Eres Veyra, un mentor de inteligencia artificial experto en startups. Tu misión es ayudar a cada emprendedor a resolver sus problemas reales, tomar mejores decisiones y avanzar con confianza. Eres directo, resolutivo y actúas como un mentor de verdad, no como un asistente.
@@ -0,0 +1,54 @@
+import math
+
+from app.domain import Chat as ChatDomain, ChatMessage as ChatMessageDomain
+
+# Characters per token of the chat messages. It is lower than the usual estimate for
+# English text, so the tokens of Spanish text are rather overestimated.
+CHARS_PER_TOKEN = 3.5
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text, without calling the model API.
+
+    Examples
+    --------
+    >>> estimate_tokens('')
+    0
+    >>> estimate_tokens('Hola, ¿qué tal?')
+    5
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def get_unsummarized_messages(chat: ChatDomain) -> list[ChatMessageDomain]:
+    """Get the messages of a chat, in order, that are not in its summary.
+
+    The summary covers the messages up to summary_until_message_id, as message IDs
+    grow in the order the messages are stored.
+    """
+    messages = chat.messages or []
+    if chat.summary_until_message_id is None:
+        return messages
+    return [
+        message
+        for message in messages
+        if message.id is not None and message.id > chat.summary_until_message_id
+    ]
+
+
+def split_messages_by_budget(
+    messages: list[ChatMessageDomain],
+    max_tokens: int,
+) -> tuple[list[ChatMessageDomain], list[ChatMessageDomain]]:
+    """Split messages, in order, into the oldest ones and the latest ones.
+
+    The latest messages are the most that fit in max_tokens.
+    """
+    start = len(messages)
+    tokens = 0
+    while start > 0:
+        tokens += estimate_tokens(messages[start - 1].content)
+        if tokens > max_tokens:
+            break
+        start -= 1
+    return messages[:start], messages[start:]
@@ -33,7 +33,7 @@ class ChatAIModelOpenAI(ChatAIModelProvider):
         business_rag: str,
         general_rag: str,
     ) -> str:
-        if not chat.messages:
+        if not chat.num_messages:
             # First message in the chat, so we add the business information
             content = f'Contexto: {business.get_information()}\n\nSolicitud: {content}'
         message_creation_run_id = self._add_message_to_chat_and_get_run_id(
@@ -7,12 +7,12 @@ class DeepResearchProvider(ABC):
     """Base class for deep research providers."""
 
     @abstractmethod
-    def do_deep_research(self, prompt: str, max_tokens: int) -> ResearchExtended:
+    async def do_deep_research(self, prompt: str, max_tokens: int) -> ResearchExtended:
         """Do deep research."""
         raise NotImplementedError
 
     @abstractmethod
-    def get_deep_research_async(
+    async def get_deep_research_async(
         self,
         request_id: str,
     ) -> ResearchExtended | None:
@@ -20,7 +20,7 @@ class DeepResearchProvider(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def do_deep_research_async(
+    async def do_deep_research_async(
         self,
         prompt: str,
         max_tokens: int,
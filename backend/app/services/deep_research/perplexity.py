@@ -1,6 +1,6 @@
 from typing import Any
 
-import requests
+import httpx
 
 from app.schemas import ResearchExtended
 from app.services.deep_research.base import DeepResearchProvider
@@ -11,15 +11,33 @@ settings = PerplexitySettings()
 
 
 class DeepResearchPerplexity(DeepResearchProvider):
-    """Implementation of DeepResearchProvider using Perplexity AI."""
+    """Implementation of DeepResearchProvider using Perplexity AI.
 
-    headers = {
-        'Authorization': f'Bearer {settings.API_KEY}',
-        'Content-Type': 'application/json',
-        'Accept': 'application/json',
-    }
+    Requests are sent with a single `httpx.AsyncClient`, whose connection pool keeps
+    connections to the API alive between requests, so they never block the event
+    loop nor pay a new TLS handshake each.
+    """
 
-    def do_deep_research(self, prompt: str, max_tokens: int) -> ResearchExtended:
+    def __init__(self):
+        super().__init__()
+        self.client = httpx.AsyncClient(
+            headers={
+                'Authorization': f'Bearer {settings.API_KEY}',
+                'Content-Type': 'application/json',
+                'Accept': 'application/json',
+            },
+            timeout=httpx.Timeout(
+                settings.TIMEOUT_SECONDS,
+                connect=settings.CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    async def do_deep_research(self, prompt: str, max_tokens: int) -> ResearchExtended:
         payload = {
             'model': 'sonar-deep-research',
             'messages': [
@@ -27,7 +45,15 @@ class DeepResearchPerplexity(DeepResearchProvider):
             ],
             'max_tokens': max_tokens,
         }
-        response = requests.post(settings.API_URL, headers=self.headers, json=payload)
+        # The research is generated while the request is open, which takes minutes.
+        response = await self.client.post(
+            settings.API_URL,
+            json=payload,
+            timeout=httpx.Timeout(
+                settings.DEEP_RESEARCH_TIMEOUT_SECONDS,
+                connect=settings.CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
         response.raise_for_status()
         response_output = response.json()
         return ResearchExtended(
@@ -42,21 +68,25 @@ class DeepResearchPerplexity(DeepResearchProvider):
             research=response_output['choices'][0]['message']['content'],
         )
 
-    def get_deep_research_async(self, request_id: str) -> ResearchExtended | None:
-        response = requests.get(
-            settings.API_URL_ASYNC + f'/{request_id}',
-            headers=self.headers,
-        )
+    async def get_deep_research_async(
+        self,
+        request_id: str,
+    ) -> ResearchExtended | None:
+        response = await self.client.get(settings.API_URL_ASYNC + f'/{request_id}')
         try:
             response.raise_for_status()
-        except requests.HTTPError as e:
+        except httpx.HTTPStatusError as e:
             if response.status_code == 404:
                 return None
             raise e
         response_output = response.json()
         return self._perplexity_async_response_to_research_schema(response_output)
 
-    def do_deep_research_async(self, prompt: str, max_tokens: int) -> ResearchExtended:
+    async def do_deep_research_async(
+        self,
+        prompt: str,
+        max_tokens: int,
+    ) -> ResearchExtended:
         payload = {
             'request': {
                 'model': 'sonar-deep-research',
@@ -66,11 +96,7 @@ class DeepResearchPerplexity(DeepResearchProvider):
                 'max_tokens': max_tokens,
             }
         }
-        response = requests.post(
-            settings.API_URL_ASYNC,
-            headers=self.headers,
-            json=payload,
-        )
+        response = await self.client.post(settings.API_URL_ASYNC, json=payload)
         response.raise_for_status()
         response_output = response.json()
         return self._perplexity_async_response_to_research_schema(response_output)
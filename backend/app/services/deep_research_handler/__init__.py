@@ -1,2 +1,3 @@
 from .base import DeepResearchHandlerProvider
 from .aws_step_function import DeepResearchHandlerAWSStepFunction
+from .local import DeepResearchHandlerLocal
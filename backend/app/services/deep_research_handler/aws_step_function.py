@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 from boto3 import client
@@ -20,9 +21,15 @@ class DeepResearchHandlerAWSStepFunction(DeepResearchHandlerProvider):
             aws_secret_access_key=settings.SECRET_ACCESS_KEY,
         )
 
-    def track_and_store_research(self, research_id: str, business_id: int) -> None:
+    async def track_and_store_research(
+        self,
+        research_id: str,
+        business_id: int,
+    ) -> None:
         try:
-            self.step_function_client.start_execution(
+            # The boto3 client is blocking, so it is run in a thread.
+            await asyncio.to_thread(
+                self.step_function_client.start_execution,
                 stateMachineArn=settings.STATE_MACHINE_ARN,
                 input=json.dumps(
                     {
@@ -5,6 +5,16 @@ class DeepResearchHandlerProvider(ABC):
     """Base class for deep research handler providers."""
 
     @abstractmethod
-    def track_and_store_research(self, research_id: str, business_id: int) -> None:
+    async def track_and_store_research(
+        self,
+        research_id: str,
+        business_id: int,
+    ) -> None:
         """Track and store research."""
         raise NotImplementedError
+
+    async def start(self) -> None:
+        """Start the background work of the handler, if any."""
+
+    async def stop(self) -> None:
+        """Stop the background work of the handler, if any."""
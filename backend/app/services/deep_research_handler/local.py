@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.background_jobs import job_queue
+from app.database import async_session
+from app.domain import Job as JobDomain, PendingResearch as PendingResearchDomain
+from app.enums import JobTypeEnum, ResearchRequestStatusEnum
+from app.repositories import JobRepository, PendingResearchRepository
+from app.schemas import ResearchExtended
+from app.services.deep_research import DeepResearchProvider
+from app.services.deep_research_handler import DeepResearchHandlerProvider
+from app.settings import DeepResearchHandlerLocalSettings
+
+logger = logging.getLogger(__name__)
+
+settings = DeepResearchHandlerLocalSettings()
+
+
+class DeepResearchHandlerLocal(DeepResearchHandlerProvider):
+    """Implementation of DeepResearchHandlerProvider polling researches in process.
+
+    Tracked researches are stored in the pending researches table. A poller checks
+    the ones due in batches, and checks each research again with exponential backoff
+    until it is finished. Completed researches are stored in the RAG of their
+    business by a background job.
+    """
+
+    def __init__(
+        self,
+        deep_research_provider: DeepResearchProvider,
+        poll_interval_seconds: float = settings.POLL_INTERVAL_SECONDS,
+        initial_backoff_seconds: float = settings.INITIAL_BACKOFF_SECONDS,
+        max_backoff_seconds: float = settings.MAX_BACKOFF_SECONDS,
+        batch_size: int = settings.BATCH_SIZE,
+        lease_seconds: float = settings.LEASE_SECONDS,
+        expire_after_seconds: float = settings.EXPIRE_AFTER_SECONDS,
+        session_factory: Callable[[], AsyncSession] = async_session,
+    ):
+        self.deep_research_provider = deep_research_provider
+        self.poll_interval_seconds = poll_interval_seconds
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.expire_after_seconds = expire_after_seconds
+        self._session_factory = session_factory
+        self._poller: asyncio.Task | None = None
+
+    async def track_and_store_research(
+        self,
+        research_id: str,
+        business_id: int,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as session:
+            await PendingResearchRepository(session).create(
+                PendingResearchDomain(
+                    research_id=research_id,
+                    business_id=business_id,
+                    created_at=now,
+                    next_check_at=now + timedelta(seconds=self.initial_backoff_seconds),
+                )
+            )
+
+    async def start(self) -> None:
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll_forever())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            await asyncio.gather(self._poller, return_exceptions=True)
+            self._poller = None
+
+    async def poll(self) -> float:
+        """Check the researches due. Return the seconds until the next poll."""
+        now = datetime.now(timezone.utc)
+        async with self._session_factory() as session:
+            pending_researches_repo = PendingResearchRepository(session)
+            pending_researches = await pending_researches_repo.claim_due(
+                now=now,
+                limit=self.batch_size,
+                lease_until=now + timedelta(seconds=self.lease_seconds),
+            )
+            # Only the requests to the provider are concurrent, as the session can
+            # not be used concurrently.
+            researches = await asyncio.gather(
+                *[
+                    self.deep_research_provider.get_deep_research_async(
+                        request_id=pending_research.research_id,
+                    )
+                    for pending_research in pending_researches
+                ],
+                return_exceptions=True,
+            )
+            for pending_research, research in zip(pending_researches, researches):
+                if isinstance(research, BaseException):
+                    logger.warning(
+                        f'Failed to check research {pending_research.research_id}: '
+                        f'{research}'
+                    )
+                    research = None
+                await self._handle_research(session, pending_research, research, now)
+            if len(pending_researches) == self.batch_size:
+                # There may be more researches due.
+                return 0
+            next_pending_research = await pending_researches_repo.get_next_due()
+        if next_pending_research is None:
+            return self.poll_interval_seconds
+        seconds_to_next_check = next_pending_research.next_check_at - datetime.now(
+            timezone.utc
+        )
+        return min(
+            self.poll_interval_seconds,
+            max(seconds_to_next_check.total_seconds(), 0),
+        )
+
+    async def _handle_research(
+        self,
+        session: AsyncSession,
+        pending_research: PendingResearchDomain,
+        research: ResearchExtended | None,
+        now: datetime,
+    ) -> None:
+        pending_researches_repo = PendingResearchRepository(session)
+        if pending_research.id is None:
+            raise ValueError('Pending research ID not found. This should never happen.')
+        status = research.status if research is not None else None
+        if status == ResearchRequestStatusEnum.COMPLETED:
+            # The research is no longer tracked if its business was deleted while it
+            # was being checked. Rescheduling or deleting it is a no-op then.
+            if await pending_researches_repo.get(pending_research.id) is None:
+                logger.info(
+                    f'Research {pending_research.research_id} completed, but it is no '
+                    'longer tracked. It is not stored.'
+                )
+                return
+            job = await JobRepository(session).create(
+                JobDomain(
+                    type=JobTypeEnum.BUSINESS_RESEARCH_STORE,
+                    params={
+                        'research_id': pending_research.research_id,
+                        'business_id': pending_research.business_id,
+                    },
+                )
+            )
+            if job.id is not None:
+                job_queue.enqueue(job.id)
+            await pending_researches_repo.delete(pending_research.id)
+        elif status == ResearchRequestStatusEnum.FAILED:
+            logger.warning(f'Research {pending_research.research_id} failed.')
+            await pending_researches_repo.delete(pending_research.id)
+        elif (now - pending_research.created_at).total_seconds() > (
+            self.expire_after_seconds
+        ):
+            logger.warning(
+                f'Research {pending_research.research_id} not completed after '
+                f'{self.expire_after_seconds} seconds. It is no longer tracked.'
+            )
+            await pending_researches_repo.delete(pending_research.id)
+        else:
+            backoff_seconds = min(
+                self.initial_backoff_seconds * 2 ** (pending_research.attempts + 1),
+                self.max_backoff_seconds,
+            )
+            await pending_researches_repo.reschedule(
+                pending_research_id=pending_research.id,
+                attempts=pending_research.attempts + 1,
+                next_check_at=now + timedelta(seconds=backoff_seconds),
+            )
+
+    async def _poll_forever(self) -> None:
+        while True:
+            try:
+                sleep_seconds = await self.poll()
+            except Exception:
+                logger.exception('Failed to poll pending researches')
+                sleep_seconds = self.poll_interval_seconds
+            await asyncio.sleep(sleep_seconds)
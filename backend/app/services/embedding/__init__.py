@@ -1,2 +1,3 @@
 from .base import EmbeddingProvider
 from .openai import EmbeddingOpenAI
+from .cache import EmbeddingCached
@@ -1,10 +1,36 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
 
 
 class EmbeddingProvider(ABC):
     """Base class for embedding providers."""
 
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Name of the model used to create the embeddings."""
+        raise NotImplementedError
+
     @abstractmethod
     def create_embedding(self, text: str) -> list[float]:
         """Create an embedding for the given text."""
         raise NotImplementedError
+
+    async def async_create_embedding(self, text: str) -> list[float]:
+        """Create an embedding for the given text without blocking the event loop.
+
+        Providers with a native async client should overwrite this method. By default,
+        the sync implementation is run in a worker thread.
+        """
+        return await asyncio.to_thread(self.create_embedding, text=text)
+
+    def create_embeddings(self, texts: Iterable[str]) -> Iterator[list[float]]:
+        """Create the embeddings for the given texts, preserving their order.
+
+        Providers that support batched requests should overwrite this method. The
+        embeddings are yielded as soon as they are available, so callers can start
+        consuming them before all the texts have been embedded.
+        """
+        for text in texts:
+            yield self.create_embedding(text=text)
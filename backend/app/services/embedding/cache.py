@@ -0,0 +1,212 @@
+import asyncio
+import hashlib
+import sqlite3
+from array import array
+from collections import Counter
+from itertools import islice
+from threading import Lock
+from typing import Iterable, Iterator
+
+from app.cache import LRUCache
+from app.services.embedding.base import EmbeddingProvider
+
+
+class EmbeddingCached(EmbeddingProvider):
+    """Embedding provider that caches the embeddings of another provider.
+
+    Embeddings are content addressed: the cache key is a hash of the model name and
+    the embedded text, so the same text is never embedded twice with the same model.
+    The cache has two tiers:
+    - An in-memory LRU tier, bounded by a maximum number of entries.
+    - An optional persistent tier in a SQLite database, shared across processes and
+      restarts. It is only used if a `persistent_path` is provided, and it is bounded
+      by a maximum number of entries, removing the oldest ones first.
+    """
+
+    # Number of texts looked up in the cache at once when embedding several texts.
+    LOOKUP_WINDOW_SIZE = 256
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        memory_max_entries: int,
+        persistent_path: str = '',
+        persistent_max_entries: int = 1000000,
+    ):
+        super().__init__()
+        self.provider = provider
+        # Embeddings are stored as float32 arrays, which take 4 bytes per dimension
+        # instead of the ~32 bytes per dimension of a list of Python floats.
+        self._memory_cache: LRUCache[str, array] = LRUCache(
+            max_entries=memory_max_entries
+        )
+        self._persistent_cache = (
+            _EmbeddingSQLiteStore(
+                path=persistent_path,
+                max_entries=persistent_max_entries,
+            )
+            if persistent_path
+            else None
+        )
+        # Lookups also run in threads, from async_create_embedding
+        self._counts: Counter[str] = Counter()
+        self._counts_lock = Lock()
+
+    @property
+    def model_name(self) -> str:
+        return self.provider.model_name
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the hit and miss counters of the cache."""
+        with self._counts_lock:
+            return {
+                'memory_hits': self._counts['memory_hits'],
+                'persistent_hits': self._counts['persistent_hits'],
+                'misses': self._counts['misses'],
+                'memory_entries': len(self._memory_cache),
+            }
+
+    def create_embedding(self, text: str) -> list[float]:
+        key = self._get_key(text=text)
+        if (embedding := self._get_cached(key=key)) is not None:
+            return embedding
+        embedding = self.provider.create_embedding(text=text)
+        self._set_cached(key=key, embedding=embedding)
+        return embedding
+
+    async def async_create_embedding(self, text: str) -> list[float]:
+        key = self._get_key(text=text)
+        embedding = self._get_from_memory(key=key)
+        # The persistent tier does blocking IO, so it is not queried from the loop.
+        if embedding is None and self._persistent_cache is not None:
+            embedding = await asyncio.to_thread(self._get_from_persistent, key=key)
+        if embedding is not None:
+            return embedding
+        self._count('misses')
+        embedding = await self.provider.async_create_embedding(text=text)
+        if self._persistent_cache is not None:
+            await asyncio.to_thread(self._set_cached, key=key, embedding=embedding)
+        else:
+            self._set_cached(key=key, embedding=embedding)
+        return embedding
+
+    def create_embeddings(self, texts: Iterable[str]) -> Iterator[list[float]]:
+        # Texts are looked up in windows, so they are consumed lazily.
+        texts_iterator = iter(texts)
+        while window := list(islice(texts_iterator, self.LOOKUP_WINDOW_SIZE)):
+            yield from self._create_embeddings_window(texts=window)
+
+    def _create_embeddings_window(self, texts: list[str]) -> Iterator[list[float]]:
+        keys = [self._get_key(text=text) for text in texts]
+        cached_embeddings = [self._get_cached(key=key) for key in keys]
+        # Only the texts that are not cached are sent to the provider, which keeps
+        # batching and yielding them lazily.
+        new_embeddings = self.provider.create_embeddings(
+            texts=(
+                text
+                for text, embedding in zip(texts, cached_embeddings)
+                if embedding is None
+            )
+        )
+        for key, embedding in zip(keys, cached_embeddings):
+            if embedding is None:
+                embedding = next(new_embeddings)
+                self._set_cached(key=key, embedding=embedding)
+            yield embedding
+
+    def _get_key(self, text: str) -> str:
+        content = f'{self.model_name}\n{text}'.encode()
+        return hashlib.sha256(content).hexdigest()
+
+    def _get_cached(self, key: str) -> list[float] | None:
+        embedding = self._get_from_memory(key=key)
+        if embedding is None and self._persistent_cache is not None:
+            embedding = self._get_from_persistent(key=key)
+        if embedding is None:
+            self._count('misses')
+        return embedding
+
+    def _get_from_memory(self, key: str) -> list[float] | None:
+        if (embedding := self._memory_cache.get(key)) is None:
+            return None
+        self._count('memory_hits')
+        return embedding.tolist()
+
+    def _get_from_persistent(self, key: str) -> list[float] | None:
+        if self._persistent_cache is None:
+            return None
+        if (embedding := self._persistent_cache.get(key)) is None:
+            return None
+        self._count('persistent_hits')
+        self._memory_cache.set(key, embedding)
+        return embedding.tolist()
+
+    def _count(self, counter: str) -> None:
+        with self._counts_lock:
+            self._counts[counter] += 1
+
+    def _set_cached(self, key: str, embedding: list[float]) -> None:
+        embedding_array = array('f', embedding)
+        self._memory_cache.set(key, embedding_array)
+        if self._persistent_cache is not None:
+            self._persistent_cache.set(key, embedding_array)
+
+
+class _EmbeddingSQLiteStore:
+    """Persistent key-value store of embeddings in a SQLite database.
+
+    The store keeps at most max_entries embeddings. Rows are pruned every
+    PRUNE_INTERVAL writes, removing the ones stored first, as SQLite assigns
+    increasing row IDs to new rows.
+    """
+
+    PRUNE_INTERVAL = 1000
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = Lock()
+        self._writes = 0
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings '
+                '(key TEXT PRIMARY KEY, embedding BLOB NOT NULL)'
+            )
+            self._prune()
+
+    def get(self, key: str) -> array | None:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT embedding FROM embeddings WHERE key = ?',
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        embedding = array('f')
+        embedding.frombytes(row[0])
+        return embedding
+
+    def set(self, key: str, embedding: array) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO embeddings (key, embedding) VALUES (?, ?)',
+                (key, embedding.tobytes()),
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def _prune(self) -> None:
+        """Remove the oldest embeddings beyond max_entries."""
+        if self.max_entries <= 0:
+            self._connection.execute('DELETE FROM embeddings')
+            return
+        # Keep the rows from the max_entries-th newest one
+        self._connection.execute(
+            'DELETE FROM embeddings WHERE rowid < ('
+            'SELECT rowid FROM embeddings ORDER BY rowid DESC LIMIT 1 OFFSET ?)',
+            (self.max_entries - 1,),
+        )
@@ -1,4 +1,8 @@
-from openai import OpenAI
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from openai import AsyncOpenAI, OpenAI
+from tiktoken import Encoding, encoding_for_model
 
 from app.services.embedding import EmbeddingProvider
 from app.settings import OpenAIEmbeddingSettings
@@ -12,6 +16,11 @@ class EmbeddingOpenAI(EmbeddingProvider):
     def __init__(self):
         super().__init__()
         self.client = OpenAI(api_key=settings.API_KEY)
+        self.async_client = AsyncOpenAI(api_key=settings.API_KEY)
+
+    @property
+    def model_name(self) -> str:
+        return settings.MODEL_NAME
 
     def create_embedding(self, text: str) -> list[float]:
         embedded_response = self.client.embeddings.create(
@@ -19,3 +28,51 @@ class EmbeddingOpenAI(EmbeddingProvider):
             input=text,
         )
         return embedded_response.data[0].embedding
+
+    async def async_create_embedding(self, text: str) -> list[float]:
+        embedded_response = await self.async_client.embeddings.create(
+            model=settings.MODEL_NAME,
+            input=text,
+        )
+        return embedded_response.data[0].embedding
+
+    def create_embeddings(self, texts: Iterable[str]) -> Iterator[list[float]]:
+        for batch in self._batch_texts(texts=texts):
+            embedded_response = self.client.embeddings.create(
+                model=settings.MODEL_NAME,
+                input=batch,
+            )
+            # Sort by index, as the order of the returned embeddings is not
+            # guaranteed to match the order of the inputs.
+            for embedding in sorted(embedded_response.data, key=lambda e: e.index):
+                yield embedding.embedding
+
+    @staticmethod
+    def _batch_texts(texts: Iterable[str]) -> Iterator[list[str]]:
+        """Group texts in batches that respect the OpenAI request limits.
+
+        Open AI limits both the number of inputs and the total number of tokens of a
+        single embeddings request. Batches are closed as soon as adding the next text
+        would exceed any of the two limits.
+        """
+        tokenizer = _get_tokenizer()
+        batch: list[str] = []
+        batch_tokens = 0
+        for text in texts:
+            text_tokens = len(tokenizer.encode_ordinary(text))
+            if batch and (
+                len(batch) >= settings.BATCH_MAX_INPUTS
+                or batch_tokens + text_tokens > settings.BATCH_MAX_TOKENS
+            ):
+                yield batch
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += text_tokens
+        if batch:
+            yield batch
+
+
+@lru_cache
+def _get_tokenizer() -> Encoding:
+    return encoding_for_model(model_name=settings.MODEL_NAME)
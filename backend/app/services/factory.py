@@ -20,17 +20,28 @@ from app.services.chat_ai_model import (
 from app.services.deep_research import DeepResearchPerplexity, DeepResearchProvider
 from app.services.deep_research_handler import (
     DeepResearchHandlerAWSStepFunction,
+    DeepResearchHandlerLocal,
     DeepResearchHandlerProvider,
 )
-from app.services.embedding import EmbeddingOpenAI, EmbeddingProvider
+from app.services.embedding import (
+    EmbeddingCached,
+    EmbeddingOpenAI,
+    EmbeddingProvider,
+)
 from app.services.identity import IdentityFirebaseAuth, IdentityProvider
 from app.services.scheduler import SchedulerProvider, SchedulerAWSEventBridge
 from app.services.storage import StorageAWSS3, StorageProvider
-from app.services.vector_database import VectorDatabasePinecone, VectorDatabaseProvider
-from app.settings import ServicesSettings
+from app.services.vector_database import (
+    VectorDatabaseLocal,
+    VectorDatabasePinecone,
+    VectorDatabaseProvider,
+    VectorDatabaseTiered,
+)
+from app.settings import EmbeddingCacheSettings, ServicesSettings
 
 
 settings = ServicesSettings()
+embedding_cache_settings = EmbeddingCacheSettings()
 
 
 class ServicesFactory:
@@ -97,6 +108,13 @@ class ServicesFactory:
                 self._deep_research_handler_provider = (
                     DeepResearchHandlerAWSStepFunction()
                 )
+            elif (
+                settings.DEEP_RESEARCH_HANDLER_PROVIDER
+                == DeepResearchHandlerProviderEnum.LOCAL
+            ):
+                self._deep_research_handler_provider = DeepResearchHandlerLocal(
+                    deep_research_provider=self.get_deep_research_provider(),
+                )
             else:
                 raise ValueError(
                     f'Unexpected deep research handler provider: '
@@ -112,6 +130,15 @@ class ServicesFactory:
                 raise ValueError(
                     f'Unexpected embedding provider: {settings.EMBEDDING_PROVIDER}'
                 )
+            if embedding_cache_settings.ENABLED:
+                self._embedding_provider = EmbeddingCached(
+                    provider=self._embedding_provider,
+                    memory_max_entries=embedding_cache_settings.MEMORY_MAX_ENTRIES,
+                    persistent_path=embedding_cache_settings.PERSISTENT_PATH,
+                    persistent_max_entries=(
+                        embedding_cache_settings.PERSISTENT_MAX_ENTRIES
+                    ),
+                )
         return self._embedding_provider
 
     def get_identity_provider(self) -> IdentityProvider:
@@ -148,6 +175,15 @@ class ServicesFactory:
         if self._vector_database_provider is None:
             if settings.VECTOR_DATABASE_PROVIDER == VectorDatabaseProviderEnum.PINECONE:
                 self._vector_database_provider = VectorDatabasePinecone()
+            elif (
+                settings.VECTOR_DATABASE_PROVIDER
+                == VectorDatabaseProviderEnum.PINECONE_TIERED
+            ):
+                self._vector_database_provider = VectorDatabaseTiered(
+                    cold_provider=VectorDatabasePinecone(),
+                )
+            elif settings.VECTOR_DATABASE_PROVIDER == VectorDatabaseProviderEnum.LOCAL:
+                self._vector_database_provider = VectorDatabaseLocal()
             else:
                 raise ValueError(
                     f'Unexpected vector database provider: '
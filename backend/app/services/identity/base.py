@@ -23,3 +23,9 @@ class IdentityProvider(ABC):
     def generate_impersonation_token(original_sub: str, impersonated_sub: str) -> str:
         """Generate an impersonation token."""
         raise NotImplementedError
+
+    async def start(self) -> None:
+        """Start the background work of the provider, if any."""
+
+    async def stop(self) -> None:
+        """Stop the background work of the provider, if any."""
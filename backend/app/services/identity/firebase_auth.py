@@ -1,8 +1,13 @@
+import asyncio
+import hashlib
 import logging
+import time
 
 from fastapi import HTTPException, status
 from firebase_admin import auth as firebase_auth, credentials, get_app, initialize_app
+from firebase_admin._token_gen import ID_TOKEN_CERT_URI
 
+from app.cache import TTLCache
 from app.schemas import TokenData
 from app.services.identity import IdentityProvider
 from app.settings import FirebaseAuthSettings
@@ -10,12 +15,28 @@ from app.settings import FirebaseAuthSettings
 logger = logging.getLogger(__name__)
 settings = FirebaseAuthSettings()
 
+# Decoded tokens by the SHA-256 hash of the token, so tokens are not kept in memory
+_verified_tokens: TTLCache[str, TokenData] = TTLCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
 
 class IdentityFirebaseAuth(IdentityProvider):
-    """Firebase Auth identity provider implementation."""
+    """Firebase Auth identity provider implementation.
+
+    Verified tokens are cached until they expire, so the signature of a token is not
+    verified on every request. The public certificates used to verify the tokens
+    are refreshed in the background, so they are not fetched while verifying one.
+    """
 
-    def __init__(self):
+    def __init__(
+        self,
+        certificates_refresh_seconds: float = settings.CERTIFICATES_REFRESH_SECONDS,
+    ):
         super().__init__()
+        self.certificates_refresh_seconds = certificates_refresh_seconds
+        self._certificates_refresher: asyncio.Task | None = None
         # Initialize Firebase Admin SDK if not already initialized
         try:
             get_app()
@@ -23,9 +44,26 @@ class IdentityFirebaseAuth(IdentityProvider):
             cred = credentials.Certificate(settings.PRIVATE_KEY)
             initialize_app(credential=cred)
 
+    async def start(self) -> None:
+        if self._certificates_refresher is None:
+            self._certificates_refresher = asyncio.create_task(
+                self._refresh_certificates_forever()
+            )
+
+    async def stop(self) -> None:
+        if self._certificates_refresher is not None:
+            self._certificates_refresher.cancel()
+            await asyncio.gather(self._certificates_refresher, return_exceptions=True)
+            self._certificates_refresher = None
+
     @staticmethod
     def verify_and_decode_auth_token(token: str) -> TokenData:
         """Return the decoded Firebase from the provided token."""
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        token_data = _verified_tokens.get(token_hash)
+        if token_data is not None:
+            return token_data
+
         try:
             decoded_firebase_token = firebase_auth.verify_id_token(id_token=token)
         except firebase_auth.ExpiredIdTokenError:
@@ -45,7 +83,34 @@ class IdentityFirebaseAuth(IdentityProvider):
                 detail='Invalid Firebase token',
             ) from e
 
-        return TokenData(sub=decoded_firebase_token['sub'])
+        token_data = TokenData(sub=decoded_firebase_token['sub'])
+        _verified_tokens.set(
+            token_hash,
+            token_data,
+            ttl_seconds=min(
+                settings.TOKEN_CACHE_TTL_SECONDS,
+                decoded_firebase_token['exp'] - time.time(),
+            ),
+        )
+        return token_data
+
+    @staticmethod
+    def refresh_certificates() -> None:
+        """Fetch the public certificates used to verify the tokens.
+
+        They are fetched bypassing the HTTP cache of the session used by Firebase
+        to verify the tokens, so the certificates cached in it are replaced.
+
+        Note: It relies on private attributes of Firebase Admin, which are checked
+        by the tests, so an upgrade that changes them is noticed.
+        """
+        # Firebase does not expose its certificates cache, only its token verifier.
+        request = firebase_auth._get_client(get_app())._token_verifier.request
+        response = request(url=ID_TOKEN_CERT_URI, headers={'Cache-Control': 'no-cache'})
+        if response.status != status.HTTP_200_OK:
+            raise ValueError(
+                f'Failed to fetch Firebase certificates. Status: {response.status}'
+            )
 
     @staticmethod
     def create_user(email: str, password: str) -> str:
@@ -83,3 +148,18 @@ class IdentityFirebaseAuth(IdentityProvider):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail='Failed to generate impersonation token',
             ) from e
+
+    async def _refresh_certificates_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh_certificates)
+            except AttributeError:
+                # Retrying would not help, as the Firebase internals changed.
+                logger.exception(
+                    'Firebase certificates can not be refreshed in the background. '
+                    'They are fetched while verifying the tokens instead.'
+                )
+                return
+            except Exception:
+                logger.exception('Failed to refresh Firebase certificates')
+            await asyncio.sleep(self.certificates_refresh_seconds)
@@ -5,6 +5,10 @@ from app.settings import StripeSettings
 
 # ToDo (pduran): Refactor this into the ServiceFactory
 
+# Requests to Stripe are made with the async methods of the SDK, which use a shared
+# httpx client, so they do not block the event loop. Verifying a webhook signature
+# does not make any request.
+
 
 settings = StripeSettings()
 stripe.api_key = settings.API_KEY
@@ -15,7 +19,7 @@ async def get_checkout_session(
 ) -> stripe.checkout.Session | None:
     """Retrieve a Stripe checkout session by its ID."""
     try:
-        return stripe.checkout.Session.retrieve(id=session_id)
+        return await stripe.checkout.Session.retrieve_async(id=session_id)
     except Exception:
         # Checkout session not found
         return None
@@ -27,7 +31,7 @@ async def create_checkout_session(
     price_id: str,
     customer_id: str,
 ) -> stripe.checkout.Session:
-    return stripe.checkout.Session.create(
+    return await stripe.checkout.Session.create_async(
         customer=customer_id,
         payment_method_types=['card'],
         mode='subscription',
@@ -43,14 +47,14 @@ async def create_checkout_session(
 
 
 async def get_subscription(subscription_id: str) -> stripe.Subscription:
-    return stripe.Subscription.retrieve(id=subscription_id)
+    return await stripe.Subscription.retrieve_async(id=subscription_id)
 
 
 async def get_portal_session(
     customer_id: str,
     return_url: str,
 ) -> stripe.billing_portal.Session:
-    return stripe.billing_portal.Session.create(
+    return await stripe.billing_portal.Session.create_async(
         customer=customer_id,
         return_url=return_url,
     )
@@ -69,7 +73,7 @@ async def verify_webhook_signature(payload: bytes, sig_header: str) -> stripe.Ev
 
 
 async def create_customer(email: str, name: str | None = None) -> stripe.Customer:
-    return stripe.Customer.create(
+    return await stripe.Customer.create_async(
         email=email,
         name=name if name is not None else email,
         description='Created from the Backend application. Address hardcoded.',
@@ -1,2 +1,4 @@
 from .base import VectorDatabaseProvider
+from .local import LocalVectorIndex, VectorDatabaseLocal
 from .pinecone import VectorDatabasePinecone
+from .tiered import VectorDatabaseTiered
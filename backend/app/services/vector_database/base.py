@@ -1,4 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Iterable
 
 
 class VectorDatabaseProvider(ABC):
@@ -15,14 +17,76 @@ class VectorDatabaseProvider(ABC):
         """Search for vectors in a vector database."""
         raise NotImplementedError
 
+    async def async_search_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        query_vector: list[float],
+        top_k: int,
+    ) -> list[str]:
+        """Search for vectors in a vector database without blocking the event loop.
+
+        Providers with a native async client should overwrite this method. By default,
+        the sync implementation is run in a worker thread.
+        """
+        return await asyncio.to_thread(
+            self.search_vectors,
+            index_name=index_name,
+            namespace=namespace,
+            query_vector=query_vector,
+            top_k=top_k,
+        )
+
     @abstractmethod
     def upload_vectors(
         self,
         index_name: str,
         namespace: str,
-        vectors: list[tuple[str, list[float], dict[str, str]]],
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        """Upload vectors to a namespace, replacing all the vectors it had before."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def upsert_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        """Insert or update vectors of a namespace, keeping the rest of vectors."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_vector_ids(self, index_name: str, namespace: str) -> set[str]:
+        """List the IDs of all the vectors of a namespace."""
+        raise NotImplementedError
+
+    def count_vectors(self, index_name: str, namespace: str) -> int:
+        """Count the vectors of a namespace.
+
+        Providers that can count the vectors without listing them should overwrite
+        this method.
+        """
+        return len(self.list_vector_ids(index_name=index_name, namespace=namespace))
+
+    @abstractmethod
+    def fetch_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> list[tuple[str, list[float], dict[str, str]]]:
+        """Fetch all the vectors of a namespace, with their values and metadata."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_vectors_by_id(
+        self,
+        index_name: str,
+        namespace: str,
+        vector_ids: Iterable[str],
     ) -> None:
-        """Upload vectors to a vector database."""
+        """Delete the vectors with the given IDs from a namespace."""
         raise NotImplementedError
 
     @abstractmethod
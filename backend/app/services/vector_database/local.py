@@ -0,0 +1,277 @@
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from threading import Lock
+from typing import Iterable
+
+import numpy as np
+
+from app.services.vector_database.base import VectorDatabaseProvider
+from app.settings import VectorDatabaseLocalSettings
+
+
+settings = VectorDatabaseLocalSettings()
+
+
+class LocalVectorIndex:
+    """In-memory index of the vectors of a single namespace.
+
+    Vectors are stored L2-normalized as rows of a float32 matrix, so the cosine
+    similarity of a query against all of them is a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        vector_ids: list[str] | None = None,
+        metadata: list[dict[str, str]] | None = None,
+        matrix: np.ndarray | None = None,
+    ):
+        self.vector_ids = vector_ids or []
+        self.metadata = metadata or []
+        self.matrix = matrix if matrix is not None else np.empty((0, 0), np.float32)
+        self._positions = {vector_id: i for i, vector_id in enumerate(self.vector_ids)}
+
+    def __len__(self) -> int:
+        return len(self.vector_ids)
+
+    def copy(self) -> 'LocalVectorIndex':
+        # The matrix is never modified in place, so it does not need to be copied.
+        return LocalVectorIndex(
+            vector_ids=list(self.vector_ids),
+            metadata=list(self.metadata),
+            matrix=self.matrix,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the index, in bytes."""
+        metadata_bytes = sum(
+            len(vector_id) + sum(len(v) for v in metadata.values())
+            for vector_id, metadata in zip(self.vector_ids, self.metadata)
+        )
+        return self.matrix.nbytes + metadata_bytes
+
+    def upsert(self, vectors: Iterable[tuple[str, list[float], dict[str, str]]]) -> None:
+        new_rows: dict[str, tuple[list[float], dict[str, str]]] = {}
+        for vector_id, values, metadata in vectors:
+            new_rows[vector_id] = (values, metadata)
+        if not new_rows:
+            return
+        updated_positions = [
+            (self._positions[vector_id], values, metadata)
+            for vector_id, (values, metadata) in new_rows.items()
+            if vector_id in self._positions
+        ]
+        inserted = [
+            (vector_id, values, metadata)
+            for vector_id, (values, metadata) in new_rows.items()
+            if vector_id not in self._positions
+        ]
+        # The matrix may be a read-only memory map, so it is always copied.
+        matrix = np.array(self.matrix, dtype=np.float32)
+        for position, values, metadata in updated_positions:
+            matrix[position] = self._normalize(np.asarray([values], np.float32))[0]
+            self.metadata[position] = metadata
+        if inserted:
+            inserted_matrix = self._normalize(
+                np.asarray([values for _, values, _ in inserted], np.float32)
+            )
+            matrix = (
+                np.vstack([matrix, inserted_matrix]) if len(self) else inserted_matrix
+            )
+            for vector_id, _, metadata in inserted:
+                self._positions[vector_id] = len(self.vector_ids)
+                self.vector_ids.append(vector_id)
+                self.metadata.append(metadata)
+        self.matrix = matrix
+
+    def delete(self, vector_ids: Iterable[str]) -> None:
+        deleted_positions = {
+            self._positions[vector_id]
+            for vector_id in vector_ids
+            if vector_id in self._positions
+        }
+        if not deleted_positions:
+            return
+        kept_positions = [i for i in range(len(self)) if i not in deleted_positions]
+        self.matrix = self.matrix[kept_positions]
+        self.vector_ids = [self.vector_ids[i] for i in kept_positions]
+        self.metadata = [self.metadata[i] for i in kept_positions]
+        self._positions = {vector_id: i for i, vector_id in enumerate(self.vector_ids)}
+
+    def search(self, query_vector: list[float], top_k: int) -> list[dict[str, str]]:
+        """Return the metadata of the top_k most similar vectors, by cosine."""
+        if len(self) == 0 or top_k <= 0:
+            return []
+        query = self._normalize(np.asarray([query_vector], np.float32))[0]
+        scores = self.matrix @ query
+        if top_k < len(self):
+            # Select the top_k candidates in linear time, then sort only those.
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(len(self))
+        best_positions = candidates[np.argsort(-scores[candidates])]
+        return [self.metadata[i] for i in best_positions]
+
+    def save(self, path: Path) -> None:
+        """Persist the index in a directory, replacing the previous version atomically.
+
+        Each version is written to its own files, and the `current` file, which names
+        the version to load, is replaced last. If saving is interrupted, the previous
+        version is still the one loaded.
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        version = uuid.uuid4().hex
+        np.save(path / f'vectors-{version}.npy', self.matrix)
+        with open(path / f'metadata-{version}.json', 'w') as metadata_file:
+            json.dump(
+                {'vector_ids': self.vector_ids, 'metadata': self.metadata},
+                metadata_file,
+            )
+        (path / 'current.tmp').write_text(version)
+        os.replace(path / 'current.tmp', path / 'current')
+        # Remove the files of the previous versions, and of any interrupted save.
+        for version_path in path.glob('*-*.*'):
+            if version_path.stem.split('-', 1)[1] != version:
+                version_path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: Path) -> 'LocalVectorIndex':
+        """Load an index from a directory, memory-mapping the vectors matrix."""
+        if not (path / 'current').exists():
+            return cls()
+        version = (path / 'current').read_text()
+        with open(path / f'metadata-{version}.json') as metadata_file:
+            stored_metadata = json.load(metadata_file)
+        return cls(
+            vector_ids=stored_metadata['vector_ids'],
+            metadata=stored_metadata['metadata'],
+            matrix=np.load(path / f'vectors-{version}.npy', mmap_mode='r'),
+        )
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+
+class VectorDatabaseLocal(VectorDatabaseProvider):
+    """Implementation of VectorDatabaseProvider with in-process NumPy indexes.
+
+    Each namespace is kept in memory as a `LocalVectorIndex`. If a storage path is
+    configured, namespaces are persisted to disk and memory-mapped when loaded, so
+    they survive restarts. Only the cosine metric is supported.
+    """
+
+    def __init__(self, storage_path: str = settings.STORAGE_PATH):
+        super().__init__()
+        self.storage_path = Path(storage_path) if storage_path else None
+        # Indexes are replaced instead of modified in place (copy-on-write), so
+        # searches can run on them concurrently without holding the lock.
+        self._namespaces: dict[tuple[str, str], LocalVectorIndex] = {}
+        self._lock = Lock()
+
+    def search_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        query_vector: list[float],
+        top_k: int,
+    ) -> list[str]:
+        with self._lock:
+            namespace_index = self._get_namespace(index_name, namespace)
+        matches = namespace_index.search(query_vector=query_vector, top_k=top_k)
+        return [metadata['text'] for metadata in matches]
+
+    def upload_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        namespace_index = LocalVectorIndex()
+        namespace_index.upsert(vectors=vectors)
+        with self._lock:
+            self._set_namespace(index_name, namespace, namespace_index)
+
+    def upsert_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        vectors = list(vectors)
+        with self._lock:
+            namespace_index = self._get_namespace(index_name, namespace).copy()
+            namespace_index.upsert(vectors=vectors)
+            self._set_namespace(index_name, namespace, namespace_index)
+
+    def list_vector_ids(self, index_name: str, namespace: str) -> set[str]:
+        with self._lock:
+            return set(self._get_namespace(index_name, namespace).vector_ids)
+
+    def count_vectors(self, index_name: str, namespace: str) -> int:
+        with self._lock:
+            return len(self._get_namespace(index_name, namespace))
+
+    def fetch_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> list[tuple[str, list[float], dict[str, str]]]:
+        with self._lock:
+            namespace_index = self._get_namespace(index_name, namespace)
+        # Note: The values are returned normalized, as they are stored.
+        return list(
+            zip(
+                namespace_index.vector_ids,
+                namespace_index.matrix.tolist(),
+                namespace_index.metadata,
+            )
+        )
+
+    def delete_vectors_by_id(
+        self,
+        index_name: str,
+        namespace: str,
+        vector_ids: Iterable[str],
+    ) -> None:
+        with self._lock:
+            namespace_index = self._get_namespace(index_name, namespace).copy()
+            namespace_index.delete(vector_ids=vector_ids)
+            self._set_namespace(index_name, namespace, namespace_index)
+
+    def delete_vectors(self, index_name: str, namespace: str) -> None:
+        with self._lock:
+            self._namespaces.pop((index_name, namespace), None)
+            if self.storage_path is not None:
+                shutil.rmtree(
+                    self._get_namespace_path(index_name, namespace),
+                    ignore_errors=True,
+                )
+
+    def _get_namespace(self, index_name: str, namespace: str) -> LocalVectorIndex:
+        if (index_name, namespace) not in self._namespaces:
+            self._namespaces[(index_name, namespace)] = (
+                LocalVectorIndex.load(self._get_namespace_path(index_name, namespace))
+                if self.storage_path is not None
+                else LocalVectorIndex()
+            )
+        return self._namespaces[(index_name, namespace)]
+
+    def _set_namespace(
+        self,
+        index_name: str,
+        namespace: str,
+        namespace_index: LocalVectorIndex,
+    ) -> None:
+        if self.storage_path is not None:
+            namespace_index.save(self._get_namespace_path(index_name, namespace))
+        self._namespaces[(index_name, namespace)] = namespace_index
+
+    def _get_namespace_path(self, index_name: str, namespace: str) -> Path:
+        if self.storage_path is None:
+            raise ValueError('Local vector database has no storage path configured.')
+        return self.storage_path / index_name / namespace
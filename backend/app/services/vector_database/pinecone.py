@@ -1,10 +1,19 @@
-from pinecone.grpc import GRPCIndex, PineconeGRPC as Pinecone
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator
+
+from pinecone.exceptions import PineconeException
+from pinecone.grpc import GRPCIndex, GRPCVector, PineconeGRPC as Pinecone
+from pinecone.grpc.vector_factory_grpc import VectorFactoryGRPC
 from pinecone.models import ServerlessSpec
 
 from app.services.vector_database.base import VectorDatabaseProvider
 from app.settings import GeneralRAGSettings, PineconeSettings, RAGSettings
 
 
+logger = logging.getLogger(__name__)
 pinecone_settings = PineconeSettings()
 rag_settings = RAGSettings()
 general_rag_settings = GeneralRAGSettings()
@@ -16,6 +25,12 @@ class VectorDatabasePinecone(VectorDatabaseProvider):
     def __init__(self):
         """Initialize Pinecone vector database connection."""
         super().__init__()
+        # Upserts are blocking gRPC calls, so they are parallelized in threads. The
+        # gRPC channel of an index is thread-safe.
+        self._upsert_executor = ThreadPoolExecutor(
+            max_workers=pinecone_settings.UPSERT_MAX_CONCURRENCY,
+            thread_name_prefix='pinecone-upsert',
+        )
         self.pc = Pinecone(
             api_key=pinecone_settings.API_KEY,
             environment=pinecone_settings.REGION,
@@ -45,23 +60,71 @@ class VectorDatabasePinecone(VectorDatabaseProvider):
         self,
         index_name: str,
         namespace: str,
-        vectors: list[tuple[str, list[float], dict[str, str]]],
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
     ) -> None:
         index = self.pc.Index(index_name)
+        previous_vector_ids = self._do_list_vector_ids(index=index, namespace=namespace)
+        uploaded_vector_ids = self._do_upsert_vectors(
+            index=index,
+            namespace=namespace,
+            vectors=vectors,
+        )
+        # Previous vectors are deleted only after the new ones have been stored, so the
+        # namespace is never left empty while the vectors are being uploaded.
+        self._do_delete_vectors_by_id(
+            index=index,
+            namespace=namespace,
+            vector_ids=previous_vector_ids - uploaded_vector_ids,
+        )
 
-        # Delete the index if it exists and create a new one. This way, every time
-        # we upload vectors, we ensure that the index is clean and contains only the
-        # latest vectors.
-        self._do_delete_vectors(index=index, namespace=namespace)
+    def upsert_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        index = self.pc.Index(index_name)
+        self._do_upsert_vectors(index=index, namespace=namespace, vectors=vectors)
+
+    def list_vector_ids(self, index_name: str, namespace: str) -> set[str]:
+        index = self.pc.Index(index_name)
+        return self._do_list_vector_ids(index=index, namespace=namespace)
 
-        # Store the vectors in batches.
-        # Note: Pinecone has a gRPC message size limit of
-        # PineconeSettings.MESSAGE_LIMIT_MB MB. Thus, the upload of vectors is done in
-        # batches to avoid exceeding this limit.
+    def count_vectors(self, index_name: str, namespace: str) -> int:
+        index = self.pc.Index(index_name)
+        namespace_summary = index.describe_index_stats().namespaces.get(namespace)
+        return namespace_summary.vector_count if namespace_summary is not None else 0
+
+    def fetch_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> list[tuple[str, list[float], dict[str, str]]]:
+        index = self.pc.Index(index_name)
+        vector_ids = iter(self._do_list_vector_ids(index=index, namespace=namespace))
+        vectors: list[tuple[str, list[float], dict[str, str]]] = []
+        # Fetch responses are also subject to the gRPC message size limit.
         batch_size = self._compute_safe_batch_size()
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i : i + batch_size]
-            index.upsert(vectors=batch, namespace=namespace)
+        while batch := list(islice(vector_ids, batch_size)):
+            response = index.fetch(ids=batch, namespace=namespace)
+            vectors.extend(
+                (vector.id, vector.values, vector.metadata)
+                for vector in response.vectors.values()
+            )
+        return vectors
+
+    def delete_vectors_by_id(
+        self,
+        index_name: str,
+        namespace: str,
+        vector_ids: Iterable[str],
+    ) -> None:
+        index = self.pc.Index(index_name)
+        self._do_delete_vectors_by_id(
+            index=index,
+            namespace=namespace,
+            vector_ids=vector_ids,
+        )
 
     def search_vectors(
         self,
@@ -92,8 +155,116 @@ class VectorDatabasePinecone(VectorDatabaseProvider):
         if namespace in index.describe_index_stats().namespaces:
             index.delete(delete_all=True, namespace=namespace)
 
+    def _do_upsert_vectors(
+        self,
+        index: GRPCIndex,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> set[str]:
+        """Upsert the vectors in parallel batches and return the upserted IDs.
+
+        At most PineconeSettings.UPSERT_MAX_CONCURRENCY batches are in flight at the
+        same time. Batches are generated lazily, so the vectors are not consumed
+        faster than they can be uploaded. If a batch fails, its error is raised once
+        the rest of batches in flight have finished.
+        """
+        upserted_vector_ids: set[str] = set()
+        in_flight: set[Future] = set()
+        try:
+            for batch in self._batch_vectors(vectors=vectors):
+                if len(in_flight) >= pinecone_settings.UPSERT_MAX_CONCURRENCY:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                in_flight.add(
+                    self._upsert_executor.submit(
+                        self._upsert_batch,
+                        index=index,
+                        namespace=namespace,
+                        batch=batch,
+                    )
+                )
+                upserted_vector_ids.update(vector.id for vector in batch)
+            for future in wait(in_flight).done:
+                future.result()
+        except BaseException:
+            # The batches not started yet are cancelled and the running ones awaited,
+            # so no upsert is left running once the error is raised.
+            for future in in_flight:
+                future.cancel()
+            wait(in_flight)
+            raise
+        return upserted_vector_ids
+
+    @staticmethod
+    def _upsert_batch(index: GRPCIndex, namespace: str, batch: list[GRPCVector]) -> None:
+        """Upsert a batch of vectors, retrying with exponential backoff on errors."""
+        for attempt in range(pinecone_settings.UPSERT_MAX_RETRIES + 1):
+            try:
+                index.upsert(vectors=batch, namespace=namespace)
+                return
+            except PineconeException as e:
+                if attempt == pinecone_settings.UPSERT_MAX_RETRIES:
+                    raise
+                logger.warning(
+                    f'Upsert of {len(batch)} vectors in namespace {namespace} failed '
+                    f'(attempt {attempt + 1}), retrying: {e}'
+                )
+                time.sleep(pinecone_settings.UPSERT_RETRY_BACKOFF_SECONDS * 2**attempt)
+
+    @staticmethod
+    def _do_list_vector_ids(index: GRPCIndex, namespace: str) -> set[str]:
+        return {
+            vector_id
+            for vector_ids_page in index.list(namespace=namespace)
+            for vector_id in vector_ids_page
+        }
+
+    @staticmethod
+    def _do_delete_vectors_by_id(
+        index: GRPCIndex,
+        namespace: str,
+        vector_ids: Iterable[str],
+    ) -> None:
+        vector_ids_iterator = iter(vector_ids)
+        while batch := list(
+            islice(vector_ids_iterator, pinecone_settings.DELETE_BATCH_SIZE)
+        ):
+            index.delete(ids=batch, namespace=namespace)
+
+    @staticmethod
+    def _batch_vectors(
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> Iterator[list[GRPCVector]]:
+        """Group the vectors in batches that fit in a single upsert request.
+
+        Note: Pinecone has a gRPC message size limit of
+        PineconeSettings.MESSAGE_LIMIT_BYTES bytes and a limit of vectors per upsert.
+        Batches are sized with the actual serialized size of their vectors.
+        """
+        # Use 90% of the limit, leaving room for the rest of fields of the request.
+        max_batch_bytes = int(pinecone_settings.MESSAGE_LIMIT_BYTES * 0.9)
+        batch: list[GRPCVector] = []
+        batch_bytes = 0
+        for vector in vectors:
+            grpc_vector = VectorFactoryGRPC.build(vector)
+            # Each vector is encoded as a length-delimited field of the request, which
+            # adds a few bytes of tag and length prefix to its own size.
+            vector_bytes = grpc_vector.ByteSize() + 8
+            if batch and (
+                batch_bytes + vector_bytes > max_batch_bytes
+                or len(batch) >= pinecone_settings.UPSERT_MAX_BATCH_VECTORS
+            ):
+                yield batch
+                batch = []
+                batch_bytes = 0
+            batch.append(grpc_vector)
+            batch_bytes += vector_bytes
+        if batch:
+            yield batch
+
     def _compute_safe_batch_size(self) -> int:
-        """Estimate a safe batch size for Pinecone upsert to avoid gRPC limit."""
+        """Estimate a safe batch size for Pinecone fetch to avoid gRPC limit."""
         # Estimate the size of a single vector. This function can be used to upload
         # vectors for both RAG and General RAG settings, so the maximum size is used
         # to be safe.
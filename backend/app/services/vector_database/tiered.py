@@ -0,0 +1,230 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterable
+
+from app.services.vector_database.base import VectorDatabaseProvider
+from app.services.vector_database.local import LocalVectorIndex
+from app.settings import VectorDatabaseTieredSettings
+
+
+settings = VectorDatabaseTieredSettings()
+
+
+class VectorDatabaseTiered(VectorDatabaseProvider):
+    """Vector database that keeps hot namespaces of another provider in memory.
+
+    The first query to a namespace loads all its vectors from the cold provider into
+    a `LocalVectorIndex`, and the following queries are answered from memory. Hot
+    namespaces are evicted in LRU order to stay within a memory budget, and expire
+    after a TTL, which bounds how stale they can be when the namespace is written by
+    another process. Namespaces that are empty or too large to be loaded are
+    remembered for the same TTL, and queried in the cold provider directly. Writes
+    always go to the cold provider and invalidate the namespace in memory.
+    """
+
+    def __init__(
+        self,
+        cold_provider: VectorDatabaseProvider,
+        memory_budget_bytes: int = settings.MEMORY_BUDGET_BYTES,
+        max_namespace_vectors: int = settings.MAX_NAMESPACE_VECTORS,
+        ttl_seconds: int = settings.TTL_SECONDS,
+    ):
+        super().__init__()
+        self.cold_provider = cold_provider
+        self.memory_budget_bytes = memory_budget_bytes
+        self.max_namespace_vectors = max_namespace_vectors
+        self.ttl_seconds = ttl_seconds
+        # Hot namespaces, with the time they were loaded at and their size in bytes.
+        self._hot_namespaces: OrderedDict[
+            tuple[str, str], tuple[LocalVectorIndex, float, int]
+        ] = OrderedDict()
+        self._hot_bytes = 0
+        # Namespaces that are not loaded in memory, with the time they were checked at.
+        self._cold_namespaces: dict[tuple[str, str], float] = {}
+        # Number of times each namespace has been invalidated. It is used to discard
+        # loads that started before a write finished.
+        self._generations: dict[tuple[str, str], int] = {}
+        self._lock = Lock()
+
+    def search_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        query_vector: list[float],
+        top_k: int,
+    ) -> list[str]:
+        namespace_index = self._get_hot_namespace(index_name, namespace)
+        if namespace_index is None and not self._is_cold_namespace(
+            index_name, namespace
+        ):
+            namespace_index = self._load_hot_namespace(index_name, namespace)
+        if namespace_index is None:
+            return self.cold_provider.search_vectors(
+                index_name=index_name,
+                namespace=namespace,
+                query_vector=query_vector,
+                top_k=top_k,
+            )
+        matches = namespace_index.search(query_vector=query_vector, top_k=top_k)
+        return [metadata['text'] for metadata in matches]
+
+    def upload_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        self.cold_provider.upload_vectors(
+            index_name=index_name,
+            namespace=namespace,
+            vectors=vectors,
+        )
+        self._invalidate(index_name, namespace)
+
+    def upsert_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+        vectors: Iterable[tuple[str, list[float], dict[str, str]]],
+    ) -> None:
+        self.cold_provider.upsert_vectors(
+            index_name=index_name,
+            namespace=namespace,
+            vectors=vectors,
+        )
+        self._invalidate(index_name, namespace)
+
+    def list_vector_ids(self, index_name: str, namespace: str) -> set[str]:
+        return self.cold_provider.list_vector_ids(
+            index_name=index_name,
+            namespace=namespace,
+        )
+
+    def count_vectors(self, index_name: str, namespace: str) -> int:
+        return self.cold_provider.count_vectors(
+            index_name=index_name,
+            namespace=namespace,
+        )
+
+    def fetch_vectors(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> list[tuple[str, list[float], dict[str, str]]]:
+        return self.cold_provider.fetch_vectors(
+            index_name=index_name,
+            namespace=namespace,
+        )
+
+    def delete_vectors_by_id(
+        self,
+        index_name: str,
+        namespace: str,
+        vector_ids: Iterable[str],
+    ) -> None:
+        self.cold_provider.delete_vectors_by_id(
+            index_name=index_name,
+            namespace=namespace,
+            vector_ids=vector_ids,
+        )
+        self._invalidate(index_name, namespace)
+
+    def delete_vectors(self, index_name: str, namespace: str) -> None:
+        self.cold_provider.delete_vectors(index_name=index_name, namespace=namespace)
+        self._invalidate(index_name, namespace)
+
+    def _get_hot_namespace(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> LocalVectorIndex | None:
+        key = (index_name, namespace)
+        with self._lock:
+            if key not in self._hot_namespaces:
+                return None
+            namespace_index, loaded_at, _ = self._hot_namespaces[key]
+            if time.monotonic() - loaded_at > self.ttl_seconds:
+                self._pop(key)
+                return None
+            self._hot_namespaces.move_to_end(key)
+            return namespace_index
+
+    def _is_cold_namespace(self, index_name: str, namespace: str) -> bool:
+        key = (index_name, namespace)
+        with self._lock:
+            if key not in self._cold_namespaces:
+                return False
+            if time.monotonic() - self._cold_namespaces[key] > self.ttl_seconds:
+                del self._cold_namespaces[key]
+                return False
+            return True
+
+    def _load_hot_namespace(
+        self,
+        index_name: str,
+        namespace: str,
+    ) -> LocalVectorIndex | None:
+        """Load a namespace in memory. Return None if it does not fit in the budget.
+
+        The vectors are counted before fetching them, so namespaces that are empty or
+        too large are never downloaded.
+        """
+        key = (index_name, namespace)
+        with self._lock:
+            generation = self._generations.get(key, 0)
+        num_vectors = self.cold_provider.count_vectors(
+            index_name=index_name,
+            namespace=namespace,
+        )
+        if num_vectors == 0 or num_vectors > self.max_namespace_vectors:
+            self._set_cold_namespace(key, generation)
+            return None
+        vectors = self.cold_provider.fetch_vectors(
+            index_name=index_name,
+            namespace=namespace,
+        )
+        if not vectors or len(vectors) > self.max_namespace_vectors:
+            self._set_cold_namespace(key, generation)
+            return None
+        namespace_index = LocalVectorIndex()
+        namespace_index.upsert(vectors=vectors)
+        namespace_bytes = namespace_index.nbytes
+        if namespace_bytes > self.memory_budget_bytes:
+            self._set_cold_namespace(key, generation)
+            return None
+        with self._lock:
+            if self._generations.get(key, 0) != generation:
+                # The namespace was written while it was being loaded, so the loaded
+                # vectors may be stale. They are used for this query, but not kept.
+                return namespace_index
+            self._pop(key)
+            while self._hot_namespaces and (
+                self._hot_bytes + namespace_bytes > self.memory_budget_bytes
+            ):
+                self._pop(next(iter(self._hot_namespaces)))
+            self._hot_namespaces[key] = (
+                namespace_index,
+                time.monotonic(),
+                namespace_bytes,
+            )
+            self._hot_bytes += namespace_bytes
+        return namespace_index
+
+    def _set_cold_namespace(self, key: tuple[str, str], generation: int) -> None:
+        with self._lock:
+            # A namespace written while it was being checked may fit now.
+            if self._generations.get(key, 0) == generation:
+                self._cold_namespaces[key] = time.monotonic()
+
+    def _invalidate(self, index_name: str, namespace: str) -> None:
+        key = (index_name, namespace)
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._pop(key)
+            self._cold_namespaces.pop(key, None)
+
+    def _pop(self, key: tuple[str, str]) -> None:
+        if key in self._hot_namespaces:
+            _, _, namespace_bytes = self._hot_namespaces.pop(key)
+            self._hot_bytes -= namespace_bytes
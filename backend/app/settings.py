@@ -2,10 +2,12 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from app.enums import (
     ChatAIModelProviderEnum,
+    ChunkingStrategyEnum,
     DeepResearchHandlerProviderEnum,
     DeepResearchProviderEnum,
     EmbeddingProviderEnum,
     IdentityProviderEnum,
+    RAGUploadModeEnum,
     SchedulerProviderEnum,
     StorageProviderEnum,
     VectorDatabaseProviderEnum,
@@ -21,6 +23,18 @@ class GeneralSettings(BaseSettings):
     model_config = SettingsConfigDict(env_file='.env', env_prefix='GENERAL_')
 
 
+class BackgroundJobsSettings(BaseSettings):
+    """Load background jobs settings from environment or .env."""
+
+    NUM_WORKERS: int = 4
+    # Running jobs older than this are considered orphaned by a stopped process.
+    STALE_AFTER_SECONDS: int = 3600
+    # Businesses processed at a time by jobs run for all businesses of a user.
+    BUSINESSES_CONCURRENCY: int = 4
+
+    model_config = SettingsConfigDict(env_file='.env', env_prefix='BACKGROUND_JOBS_')
+
+
 class ServicesSettings(BaseSettings):
     """Load Services settings from environment or .env."""
 
@@ -66,6 +80,10 @@ class FirebaseAuthSettings(BaseSettings):
 
     PRIVATE_KEY: dict = {}
     API_KEY: dict = {}
+    # Verified tokens are cached until they expire, for this time at most.
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    CERTIFICATES_REFRESH_SECONDS: int = 3600
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='FIREBASE_AUTH_')
 
@@ -100,6 +118,14 @@ class AnthropicSettings(BaseSettings):
     MODEL_NAME: str = 'claude-sonnet-4-20250514'
     MAX_TOKENS: int = 8192
     TEMPERATURE: float = 1
+    # Token budget of the chat history sent with each message. When it is exceeded,
+    # the oldest messages are summarized, keeping the latest ones within
+    # CONTEXT_RECENT_TOKENS, so summaries are not made on every message.
+    CONTEXT_MAX_TOKENS: int = 16000
+    CONTEXT_RECENT_TOKENS: int = 8000
+    # Model used to summarize the oldest messages of the chats
+    SUMMARY_MODEL_NAME: str = 'claude-3-5-haiku-20241022'
+    SUMMARY_MAX_TOKENS: int = 1024
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='ANTHROPIC_')
 
@@ -109,16 +135,39 @@ class OpenAIEmbeddingSettings(BaseSettings):
 
     API_KEY: str = ''
     MODEL_NAME: str = ''
+    # Limits of a single embeddings request, defined by the Open AI API.
+    BATCH_MAX_INPUTS: int = 2048
+    BATCH_MAX_TOKENS: int = 300000
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='OPEN_AI_EMBEDDING_')
 
 
+class EmbeddingCacheSettings(BaseSettings):
+    """Load Embedding cache settings from environment or .env."""
+
+    ENABLED: bool = True
+    MEMORY_MAX_ENTRIES: int = 10000
+    # Path of the SQLite database of the persistent tier. Disabled if empty.
+    PERSISTENT_PATH: str = ''
+    # The oldest embeddings of the persistent tier are removed beyond this number.
+    PERSISTENT_MAX_ENTRIES: int = 1000000
+
+    model_config = SettingsConfigDict(env_file='.env', env_prefix='EMBEDDING_CACHE_')
+
+
 class PerplexitySettings(BaseSettings):
     """Load Perplexity settings from environment or .env."""
 
     API_URL: str = ''
     API_URL_ASYNC: str = ''
     API_KEY: str = ''
+    CONNECT_TIMEOUT_SECONDS: float = 10
+    TIMEOUT_SECONDS: float = 60
+    # Synchronous deep research keeps the request open until the research is done.
+    DEEP_RESEARCH_TIMEOUT_SECONDS: float = 1800
+    MAX_CONNECTIONS: int = 20
+    MAX_KEEPALIVE_CONNECTIONS: int = 10
+    KEEPALIVE_EXPIRY_SECONDS: float = 30
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='PERPLEXITY_')
 
@@ -130,21 +179,54 @@ class PineconeSettings(BaseSettings):
     REGION: str = ''
     CLOUD: str = ''
     MESSAGE_LIMIT_BYTES: int = 2 * 1024 * 1024  # 2MB
+    DELETE_BATCH_SIZE: int = 1000
+    UPSERT_MAX_BATCH_VECTORS: int = 1000
+    UPSERT_MAX_CONCURRENCY: int = 4
+    UPSERT_MAX_RETRIES: int = 3
+    UPSERT_RETRY_BACKOFF_SECONDS: float = 1
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='PINECONE_')
 
 
+class VectorDatabaseLocalSettings(BaseSettings):
+    """Load Vector Database Local settings from environment or .env."""
+
+    # Directory where the namespaces are persisted. In memory only if empty.
+    STORAGE_PATH: str = ''
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_prefix='SERVICES_VECTOR_DATABASE_LOCAL_',
+    )
+
+
+class VectorDatabaseTieredSettings(BaseSettings):
+    """Load Vector Database Tiered settings from environment or .env."""
+
+    MEMORY_BUDGET_BYTES: int = 256 * 1024 * 1024  # 256MB
+    # Namespaces with more vectors are never loaded in memory.
+    MAX_NAMESPACE_VECTORS: int = 20000
+    TTL_SECONDS: int = 600
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_prefix='SERVICES_VECTOR_DATABASE_TIERED_',
+    )
+
+
 class RAGSettings(BaseSettings):
     """Load RAG settings from environment or .env."""
 
+    CHUNKING_STRATEGY: ChunkingStrategyEnum = ChunkingStrategyEnum.TOKEN_WINDOW
     MAX_TOKENS: int = 600
     OVERLAP: int = 170
-    VECTOR_ID: str = 'doc{doc_index}_chunk{chunk_index}'
+    VECTOR_ID: str = 'chunk_{content_hash}'
     NAMESPACE_ID: str = 'business_{business_id}'
     INDEX_NAME: str = 'veyra-index'
     INDEX_DIMENSION: int = 1536
     INDEX_METRIC: str = 'cosine'
     TOP_K: int = 1
+    UPLOAD_MODE: RAGUploadModeEnum = RAGUploadModeEnum.INCREMENTAL
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='RAG_')
 
@@ -175,6 +257,26 @@ class DeepResearchHandlerAWSStepFunctionSettings(BaseSettings):
     )
 
 
+class DeepResearchHandlerLocalSettings(BaseSettings):
+    """Load Deep Research Handler Local settings from environment or .env."""
+
+    # Time between polls, when no research is due sooner.
+    POLL_INTERVAL_SECONDS: float = 30
+    # A research is checked after these seconds, doubling until the maximum.
+    INITIAL_BACKOFF_SECONDS: float = 60
+    MAX_BACKOFF_SECONDS: float = 900
+    BATCH_SIZE: int = 20
+    # Time a research is reserved for the process checking it.
+    LEASE_SECONDS: float = 300
+    # Researches not completed after this time are no longer tracked.
+    EXPIRE_AFTER_SECONDS: float = 86400
+
+    model_config = SettingsConfigDict(
+        env_file='.env',
+        env_prefix='SERVICES_DEEP_RESEARCH_HANDLER_LOCAL_',
+    )
+
+
 class SchedulerAWSEventBridgeSettings(BaseSettings):
     """Load Scheduler AWS Event Bridge settings from environment or .env."""
 
@@ -198,5 +300,34 @@ class StripeSettings(BaseSettings):
 
     API_KEY: str = ''
     WEBHOOK_SECRET: str = ''
+    # Webhook events still processing after this time are considered failed, so
+    # they are processed again when Stripe retries them.
+    WEBHOOK_PROCESSING_TIMEOUT_SECONDS: int = 300
 
     model_config = SettingsConfigDict(env_file='.env', env_prefix='STRIPE_')
+
+
+class PlanCacheSettings(BaseSettings):
+    """Load Plan cache settings from environment or .env."""
+
+    # Plans are cached per process, so changes made by other processes are seen
+    # after this time at most.
+    TTL_SECONDS: int = 300
+    MAX_ENTRIES: int = 100
+
+    model_config = SettingsConfigDict(env_file='.env', env_prefix='PLAN_CACHE_')
+
+
+class EntityCacheSettings(BaseSettings):
+    """Load the cache settings of users and businesses from environment or .env."""
+
+    # Entries are invalidated when they are written by this process only, so the
+    # cache is disabled by default, as several processes may serve the app. Cached
+    # entries may then be stale for up to TTL_SECONDS, so they must not be written
+    # back: writes that depend on their current values, like subtracting credits, are
+    # done with a single UPDATE statement instead.
+    ENABLED: bool = False
+    TTL_SECONDS: int = 60
+    MAX_ENTRIES: int = 10000
+
+    model_config = SettingsConfigDict(env_file='.env', env_prefix='ENTITY_CACHE_')
@@ -0,0 +1,92 @@
+import asyncio
+import uuid
+from contextlib import contextmanager
+from typing import AsyncGenerator, Callable, ContextManager, Iterator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event, text
+
+from app.database import async_session
+from app.database.postgresql import engine
+from app.deps import get_current_active_user
+from app.domain import (
+    UserExtended as UserExtendedDomain,
+    UserWithSecret as UserWithSecretDomain,
+)
+from app.enums import UserLanguageEnum, UserRoleEnum
+from app.main import app
+from app.models import User
+from app.repositories import UserRepository
+
+
+class StatementCounter:
+    """Record the SQL statements run by the database engine."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def require_database() -> AsyncGenerator[None, None]:
+    """Skip the integration tests if the database is not reachable."""
+    try:
+        async with engine.connect() as connection:
+            await asyncio.wait_for(connection.execute(text('SELECT 1')), timeout=5)
+    except Exception as e:
+        pytest.skip(f'Database not reachable: {e}')
+    yield
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_user() -> AsyncGenerator[UserExtendedDomain, None]:
+    """Create a user, authenticated as the current user of the requests."""
+    name = f'integration-{uuid.uuid4().hex[:8]}'
+    async with async_session() as session:
+        user = await UserRepository(session).create(
+            UserWithSecretDomain(
+                username=name,
+                email=f'{name}@test.com',
+                full_name=name,
+                is_active=True,
+                role=UserRoleEnum.BASIC,
+                language=UserLanguageEnum.ES,
+                external_id=name,
+            )
+        )
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    yield user
+    app.dependency_overrides.clear()
+    async with async_session() as session:
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+
+@pytest.fixture
+def count_statements() -> Callable[[], ContextManager[StatementCounter]]:
+    """Count the SQL statements run within a context.
+
+    Examples
+    --------
+    >>> with count_statements() as counter:  # doctest: +SKIP
+    ...     await async_client.get('/businesses')
+    >>> assert len(counter) == 1  # doctest: +SKIP
+    """
+
+    @contextmanager
+    def _count_statements() -> Iterator[StatementCounter]:
+        counter = StatementCounter()
+        event.listen(engine.sync_engine, 'before_cursor_execute', counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine.sync_engine, 'before_cursor_execute', counter)
+
+    return _count_statements
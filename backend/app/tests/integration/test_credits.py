@@ -0,0 +1,35 @@
+# noqa: D100
+from sqlalchemy import update
+
+from app.database import async_session
+from app.models import User
+from app.repositories import UserRepository
+
+
+async def test_subtract_credits(db_user):
+    async with async_session() as session:
+        await session.execute(
+            update(User).where(User.id == db_user.id).values(available_credits=5)
+        )
+        await session.commit()
+        users_repo = UserRepository(session)
+
+        assert await users_repo.subtract_credits(user_id=db_user.id, credits=3)
+        # The remaining credits are not enough, and they are left unchanged
+        assert not await users_repo.subtract_credits(user_id=db_user.id, credits=3)
+        assert await users_repo.subtract_credits(user_id=db_user.id, credits=2)
+
+        user = await users_repo.get(user_id=db_user.id)
+        assert user is not None
+        assert user.available_credits == 0
+
+
+async def test_subtract_credits_without_credits_limit(db_user):
+    async with async_session() as session:
+        users_repo = UserRepository(session)
+
+        assert await users_repo.subtract_credits(user_id=db_user.id, credits=3)
+
+        user = await users_repo.get(user_id=db_user.id)
+        assert user is not None
+        assert user.available_credits is None
@@ -0,0 +1,106 @@
+# noqa: D100
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.database import async_session
+from app.domain import (
+    BusinessIdea as BusinessIdeaDomain,
+    Job as JobDomain,
+    PendingResearch as PendingResearchDomain,
+    PlanBase as PlanBaseDomain,
+    Research as ResearchDomain,
+    UserWithSecret as UserWithSecretDomain,
+)
+from app.enums import (
+    BusinessStageEnum,
+    JobTypeEnum,
+    UserLanguageEnum,
+    UserPlanEnum,
+    UserRoleEnum,
+)
+from app.models import Job, PendingResearch
+from app.repositories import (
+    BusinessRepository,
+    JobRepository,
+    PendingResearchRepository,
+    PlanRepository,
+    ResearchRepository,
+    UserRepository,
+)
+
+
+async def test_delete_business_with_research(db_user):
+    response_id = f'research-{uuid.uuid4().hex}'
+    now = datetime.now(timezone.utc)
+    async with async_session() as session:
+        business_repo = BusinessRepository(session)
+        business = await business_repo.create_idea(
+            BusinessIdeaDomain(
+                user_id=db_user.id,
+                stage=BusinessStageEnum.IDEA,
+                name='Veyra',
+                location='Spain',
+            )
+        )
+        assert business.id is not None
+        await ResearchRepository(session).upsert(
+            ResearchDomain(response_id=response_id, business_id=business.id)
+        )
+        await PendingResearchRepository(session).create(
+            PendingResearchDomain(
+                research_id=response_id,
+                business_id=business.id,
+                created_at=now,
+                next_check_at=now,
+            )
+        )
+
+        await business_repo.delete_idea(business_id=business.id)
+
+        # The research is kept, and it is no longer tracked
+        research = await ResearchRepository(session).get(response_id=response_id)
+        assert research is not None
+        assert research.business_id is None
+        pending_research = await session.scalar(
+            select(PendingResearch).where(PendingResearch.research_id == response_id)
+        )
+        assert pending_research is None
+
+
+async def test_delete_plan_with_user_jobs():
+    name = f'integration-{uuid.uuid4().hex[:8]}'
+    async with async_session() as session:
+        plans_repo = PlanRepository(session)
+        plan = await plans_repo.create(
+            PlanBaseDomain(name=UserPlanEnum.FOUNDER, is_active=False, price=0.0)
+        )
+        user = await UserRepository(session).create(
+            UserWithSecretDomain(
+                username=name,
+                email=f'{name}@test.com',
+                full_name=name,
+                is_active=True,
+                role=UserRoleEnum.BASIC,
+                language=UserLanguageEnum.ES,
+                external_id=name,
+                plan_id=plan.id,
+            )
+        )
+        job = await JobRepository(session).create(
+            JobDomain(
+                type=JobTypeEnum.BUSINESS_RESEARCH_STORE,
+                params={},
+                user_id=user.id,
+            )
+        )
+
+        await plans_repo.delete(plan_id=plan.id)
+
+        # The job is kept without its user
+        stored_job = await session.scalar(select(Job).where(Job.id == job.id))
+        assert stored_job is not None
+        assert stored_job.user_id is None
+        await session.delete(stored_job)
+        await session.commit()
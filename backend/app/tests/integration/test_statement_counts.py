@@ -0,0 +1,140 @@
+# noqa: D100
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncGenerator
+
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+
+from app.database import async_session
+from app.domain import (
+    BusinessIdea as BusinessIdeaDomain,
+    Chat as ChatDomain,
+    ChatMessage as ChatMessageDomain,
+)
+from app.enums import BusinessStageEnum, ChatMessageSenderEnum
+from app.repositories import BusinessRepository, ChatRepository
+
+
+@pytest_asyncio.fixture
+async def db_chat(db_user) -> AsyncGenerator[ChatDomain, None]:
+    async with async_session() as session:
+        business_repo = BusinessRepository(session)
+        business = await business_repo.create_idea(
+            BusinessIdeaDomain(
+                user_id=db_user.id,
+                stage=BusinessStageEnum.IDEA,
+                name='Veyra',
+                location='Spain',
+            )
+        )
+        assert business.id is not None
+        chats_repo = ChatRepository(session)
+        chat = await chats_repo.create(
+            ChatDomain(
+                internal_id=uuid.uuid4().hex,
+                title='Chat',
+                start_time=datetime.now(timezone.utc),
+                business_id=business.id,
+            )
+        )
+        assert chat.id is not None
+        for sender in (ChatMessageSenderEnum.USER, ChatMessageSenderEnum.AI_MODEL):
+            await chats_repo.add_message(
+                ChatMessageDomain(
+                    chat_id=chat.id,
+                    time=datetime.now(timezone.utc),
+                    sender=sender,
+                    content='Hello',
+                )
+            )
+    yield chat
+    async with async_session() as session:
+        await BusinessRepository(session).delete_idea(business_id=business.id)
+
+
+async def test_list_businesses_statement_count(
+    async_client: AsyncClient,
+    db_chat,
+    count_statements,
+):
+    with count_statements() as counter:
+        response = await async_client.get('/businesses')
+
+    assert response.status_code == status.HTTP_200_OK
+    # The chats and messages of the businesses are not loaded
+    assert len(counter) == 1, counter.statements
+
+
+async def test_list_chats_statement_count(
+    async_client: AsyncClient,
+    db_chat,
+    count_statements,
+):
+    with count_statements() as counter:
+        response = await async_client.get(f'/businesses/{db_chat.business_id}/chats')
+
+    assert response.status_code == status.HTTP_200_OK
+    # Business and chats, without their messages
+    assert len(counter) == 2, counter.statements
+
+
+async def test_get_chat_statement_count(
+    async_client: AsyncClient,
+    db_chat,
+    count_statements,
+):
+    with count_statements() as counter:
+        response = await async_client.get(
+            f'/businesses/{db_chat.business_id}/chats/{db_chat.id}'
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['messages']) == 2
+    # Business, chat and its messages
+    assert len(counter) == 3, counter.statements
+
+
+async def test_list_chat_messages_statement_count(
+    async_client: AsyncClient,
+    db_chat,
+    count_statements,
+):
+    with count_statements() as counter:
+        response = await async_client.get(
+            f'/businesses/{db_chat.business_id}/chats/{db_chat.id}/messages',
+            params={'limit': 1},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()['messages']) == 1
+    assert response.json()['next_cursor'] is not None
+    # Business, chat and one page of its messages
+    assert len(counter) == 3, counter.statements
+
+
+async def test_get_chat_for_new_message_statement_count(db_chat, count_statements):
+    assert db_chat.id is not None
+    async with async_session() as session:
+        chats_repo = ChatRepository(session)
+        # Newest first
+        messages = await chats_repo.get_messages(chat_id=db_chat.id, limit=2)
+        assert messages[-1].id is not None
+        await chats_repo.update_summary(
+            chat_id=db_chat.id,
+            summary='Hello',
+            summary_until_message_id=messages[-1].id,
+        )
+        with count_statements() as counter:
+            chat = await chats_repo.get_for_new_message(
+                business_id=db_chat.business_id,
+                chat_id=db_chat.id,
+            )
+
+    assert chat is not None
+    assert chat.num_messages == 2
+    assert chat.messages is not None
+    assert [message.id for message in chat.messages] == [messages[0].id]
+    # Chat with its number of messages, and the messages not in its summary
+    assert len(counter) == 2, counter.statements
@@ -0,0 +1,23 @@
+import pytest
+
+from app.services.embedding import EmbeddingProvider
+
+
+class FakeEmbeddingProvider(EmbeddingProvider):
+    """Embedding provider that records the texts it embeds."""
+
+    def __init__(self) -> None:
+        self.embedded_texts: list[str] = []
+
+    @property
+    def model_name(self) -> str:
+        return 'fake-model'
+
+    def create_embedding(self, text: str) -> list[float]:
+        self.embedded_texts.append(text)
+        return [float(len(text)), 1.0]
+
+
+@pytest.fixture
+def fake_embedding_provider() -> FakeEmbeddingProvider:
+    return FakeEmbeddingProvider()
@@ -0,0 +1,70 @@
+# noqa: D100
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+from app.background_jobs import BackgroundJobQueue
+from app.domain import Job as JobDomain
+from app.enums import JobStatusEnum, JobTypeEnum
+from app.repositories import JobRepository
+
+
+@asynccontextmanager
+async def fake_session_factory():
+    yield AsyncMock()
+
+
+TEST_JOB = JobDomain(
+    id=3,
+    type=JobTypeEnum.BUSINESS_DEEP_RESEARCH,
+    status=JobStatusEnum.RUNNING,
+    params={'business_id': 5},
+)
+
+
+@patch.object(JobRepository, 'finish')
+@patch.object(JobRepository, 'claim')
+async def test_run_job_stores_handler_result(mock_claim, mock_finish):
+    mock_claim.return_value = TEST_JOB
+    handler = AsyncMock(return_value={'research': 'done'})
+    job_queue = BackgroundJobQueue(session_factory=fake_session_factory)
+    job_queue.register(JobTypeEnum.BUSINESS_DEEP_RESEARCH, handler)
+
+    await job_queue.run_job(job_id=3)
+
+    assert handler.await_args.args[0] == {'business_id': 5}
+    mock_finish.assert_awaited_once_with(
+        job_id=3,
+        status=JobStatusEnum.COMPLETED,
+        result={'research': 'done'},
+    )
+
+
+@patch.object(JobRepository, 'finish')
+@patch.object(JobRepository, 'claim')
+async def test_run_job_stores_handler_error(mock_claim, mock_finish):
+    mock_claim.return_value = TEST_JOB
+    handler = AsyncMock(side_effect=RuntimeError('Perplexity is down'))
+    job_queue = BackgroundJobQueue(session_factory=fake_session_factory)
+    job_queue.register(JobTypeEnum.BUSINESS_DEEP_RESEARCH, handler)
+
+    await job_queue.run_job(job_id=3)
+
+    mock_finish.assert_awaited_once_with(
+        job_id=3,
+        status=JobStatusEnum.FAILED,
+        error='Perplexity is down',
+    )
+
+
+@patch.object(JobRepository, 'finish')
+@patch.object(JobRepository, 'claim')
+async def test_run_job_skips_jobs_already_claimed(mock_claim, mock_finish):
+    mock_claim.return_value = None
+    handler = AsyncMock()
+    job_queue = BackgroundJobQueue(session_factory=fake_session_factory)
+    job_queue.register(JobTypeEnum.BUSINESS_DEEP_RESEARCH, handler)
+
+    await job_queue.run_job(job_id=3)
+
+    handler.assert_not_awaited()
+    mock_finish.assert_not_awaited()
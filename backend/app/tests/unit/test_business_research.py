@@ -0,0 +1,152 @@
+# noqa: D100
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.background_jobs import job_queue
+from app.domain import (
+    BusinessIdea as BusinessIdeaDomain,
+    Job as JobDomain,
+    Research as ResearchDomain,
+)
+from app.enums import (
+    BusinessStageEnum,
+    JobStatusEnum,
+    JobTypeEnum,
+    ResearchRequestStatusEnum,
+)
+from app.helpers import helpers_rag
+from app.repositories import BusinessRepository, JobRepository, ResearchRepository
+
+
+@pytest.fixture
+def test_business_idea() -> BusinessIdeaDomain:
+    return BusinessIdeaDomain(
+        id=5,
+        user_id=1,
+        stage=BusinessStageEnum.IDEA,
+        name='Veyra',
+        location='Spain',
+        description='Veyra is super cool!',
+        goal='Help entrepreneurs',
+        team_size=3,
+        team_description='Super nice guys.',
+        user_position='CTO and backend developer',
+    )
+
+
+@pytest.fixture
+def test_job() -> JobDomain:
+    return JobDomain(
+        id=3,
+        type=JobTypeEnum.BUSINESS_DEEP_RESEARCH,
+        status=JobStatusEnum.PENDING,
+        params={'max_tokens': 100, 'business_id': 5, 'sync_generation': True},
+        user_id=1,
+        created_at=datetime(2025, 9, 1, tzinfo=timezone.utc),
+    )
+
+
+@patch.object(job_queue, 'enqueue')
+@patch.object(JobRepository, 'create')
+@patch.object(BusinessRepository, 'get_child')
+async def test_create_research_sync_generation_returns_job(
+    mock_get_child,
+    mock_create,
+    mock_enqueue,
+    test_business_idea,
+    test_job,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get_child.return_value = test_business_idea
+    mock_create.return_value = test_job
+
+    actual_response = await async_client.post(
+        '/researches',
+        json={'max_tokens': 100, 'business_id': 5, 'sync_generation': True},
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_201_CREATED == actual_response.status_code
+    assert actual_response.json()['id'] == test_job.id
+    assert actual_response.json()['status'] == JobStatusEnum.PENDING.value
+    mock_enqueue.assert_called_once_with(test_job.id)
+
+
+@patch.object(JobRepository, 'get')
+async def test_get_research_job_by_id_not_found(
+    mock_get,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get.return_value = None
+
+    expected_response = {'detail': 'Job not found'}
+    actual_response = await async_client.get(
+        '/researches/jobs/99',
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_404_NOT_FOUND == actual_response.status_code
+    assert expected_response == actual_response.json()
+
+
+@patch.object(helpers_rag, 'get_deep_research_async')
+@patch.object(ResearchRepository, 'get')
+async def test_get_research_by_id_completed_is_served_from_database(
+    mock_get,
+    mock_get_deep_research_async,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get.return_value = ResearchDomain(
+        id=1,
+        response_id='research_1',
+        business_id=5,
+        status=ResearchRequestStatusEnum.COMPLETED,
+        research='Research text',
+    )
+
+    actual_response = await async_client.get(
+        '/researches/research_1',
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_200_OK == actual_response.status_code
+    assert actual_response.json()['research'] == 'Research text'
+    mock_get_deep_research_async.assert_not_called()
+
+
+@patch.object(helpers_rag, 'chunk_and_upload_text')
+@patch.object(ResearchRepository, 'get')
+async def test_store_research_by_id_already_stored_does_nothing(
+    mock_get,
+    mock_chunk_and_upload_text,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get.return_value = ResearchDomain(
+        id=1,
+        response_id='research_1',
+        business_id=5,
+        status=ResearchRequestStatusEnum.COMPLETED,
+        research='Research text',
+        stored_at=datetime(2025, 9, 1, tzinfo=timezone.utc),
+    )
+
+    actual_response = await async_client.post(
+        '/researches/research_1/store',
+        json={'business_id': 5},
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_201_CREATED == actual_response.status_code
+    mock_chunk_and_upload_text.assert_not_called()
@@ -0,0 +1,82 @@
+# noqa: D100
+from unittest.mock import patch
+
+from app.cache import TTLCache, VersionedCache
+from app.domain import Plan as PlanDomain, UserExtended as UserExtendedDomain
+from app.enums import UserPlanEnum
+from app.repositories import PlanRepository, UserRepository
+from app.repositories.plans import _active_plans_by_price_id
+
+
+def test_ttl_cache_expires_entries():
+    now = 0.0
+    cache = TTLCache(max_entries=2, ttl_seconds=10, timer=lambda: now)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    now = 10.0
+    assert cache.get('b') is None
+    assert len(cache) == 1
+
+
+@patch.object(PlanRepository, 'get_multi')
+async def test_plan_repository_caches_plans_by_price_id(mock_get_multi):
+    _active_plans_by_price_id.clear()
+    plan = PlanDomain(
+        id=1,
+        name=UserPlanEnum.FOUNDER,
+        is_active=True,
+        price=10,
+        payment_service_price_id='price_1',
+        monthly_credits=100,
+    )
+    mock_get_multi.return_value = [plan]
+    plans_repo = PlanRepository(None)
+
+    assert await plans_repo.get_active_by_payment_service_price_id('price_1') == plan
+    assert await plans_repo.get_active_by_payment_service_price_id('price_1') == plan
+    mock_get_multi.assert_awaited_once_with(
+        is_active=True,
+        payment_service_price_id='price_1',
+    )
+    _active_plans_by_price_id.clear()
+
+
+def test_versioned_cache_skips_values_read_before_invalidation():
+    cache = VersionedCache(max_entries=10, ttl_seconds=60)
+    cache.set('a', 1, version=cache.version('a'))
+    version = cache.version('a')
+
+    cache.invalidate('a')
+    cache.set('a', 1, version=version)
+
+    assert cache.get('a') is None
+    assert cache.version('a') == version + 1
+
+
+@patch.object(UserRepository, '_get_by_external_id')
+async def test_user_repository_caches_users_by_external_id(
+    mock_get_by_external_id,
+    test_user,
+):
+    mock_get_by_external_id.return_value = UserExtendedDomain(
+        **test_user.model_dump(exclude={'available_credits'}),
+        available_credits=10,
+        external_id='external_id',
+    )
+    users_repo = UserRepository(None)
+
+    with patch(
+        'app.repositories.user._users_by_external_id',
+        VersionedCache(max_entries=10, ttl_seconds=60),
+    ):
+        user = await users_repo.get_by_external_id('external_id')
+        user.available_credits = 0
+        cached_user = await users_repo.get_by_external_id('external_id')
+
+    assert cached_user is not None
+    assert cached_user.available_credits == 10
+    mock_get_by_external_id.assert_awaited_once_with(external_id='external_id')
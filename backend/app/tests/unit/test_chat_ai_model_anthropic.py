@@ -0,0 +1,106 @@
+# noqa: D100
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.domain import (
+    BusinessIdea as BusinessIdeaDomain,
+    Chat as ChatDomain,
+    ChatMessage as ChatMessageDomain,
+)
+from app.enums import BusinessStageEnum, ChatMessageSenderEnum
+from app.services.chat_ai_model import anthropic
+from app.services.chat_ai_model.anthropic import ChatAIModelAnthropic
+
+
+@pytest.fixture
+def test_business() -> BusinessIdeaDomain:
+    return BusinessIdeaDomain(
+        id=1,
+        user_id=1,
+        stage=BusinessStageEnum.IDEA,
+        name='Veyra',
+        location='Spain',
+        description='Veyra is super cool!',
+        goal='Help entrepreneurs',
+        team_size=3,
+        team_description='Super nice guys.',
+    )
+
+
+@pytest.fixture
+def test_chat() -> ChatDomain:
+    # Each message is 4 tokens long
+    return ChatDomain(
+        id=1,
+        internal_id='id_test',
+        title='Chat A',
+        start_time=datetime.fromisoformat('2020-05-08T13:00:00+00:00'),
+        business_id=1,
+        messages=[
+            ChatMessageDomain(
+                id=message_id,
+                chat_id=1,
+                time=datetime.fromisoformat('2020-05-08T13:00:00+00:00'),
+                sender=(
+                    ChatMessageSenderEnum.USER
+                    if message_id % 2
+                    else ChatMessageSenderEnum.AI_MODEL
+                ),
+                content=f'Test message {message_id}',
+            )
+            for message_id in range(1, 5)
+        ],
+    )
+
+
+@patch.object(anthropic.settings, 'CONTEXT_RECENT_TOKENS', 5)
+@patch.object(anthropic.settings, 'CONTEXT_MAX_TOKENS', 10)
+async def test_update_chat_summary_summarizes_oldest_messages(test_chat):
+    chat_ai_model = ChatAIModelAnthropic()
+    chat_ai_model.client = AsyncMock()
+    chat_ai_model.client.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(type='text', text='Summary')],
+    )
+
+    chat = await chat_ai_model.update_chat_summary(test_chat)
+
+    assert chat.summary == 'Summary'
+    assert chat.summary_until_message_id == 3
+    request = chat_ai_model.client.messages.create.await_args.kwargs
+    conversation = request['messages'][0]['content'][1]['text']
+    assert 'Test message 3' in conversation
+    assert 'Test message 4' not in conversation
+
+
+@patch.object(anthropic.settings, 'CONTEXT_MAX_TOKENS', 16)
+async def test_update_chat_summary_keeps_chat_within_budget(test_chat):
+    chat_ai_model = ChatAIModelAnthropic()
+    chat_ai_model.client = AsyncMock()
+
+    chat = await chat_ai_model.update_chat_summary(test_chat)
+
+    assert chat == test_chat
+    chat_ai_model.client.messages.create.assert_not_awaited()
+
+
+@patch.object(anthropic.settings, 'CONTEXT_MAX_TOKENS', 4)
+def test_build_messages_history_sends_summary_and_latest_messages(
+    test_business,
+    test_chat,
+):
+    test_chat.summary = 'Summary'
+    test_chat.summary_until_message_id = 2
+
+    messages = ChatAIModelAnthropic()._build_messages_history(
+        business=test_business,
+        chat=test_chat,
+        content='New message',
+    )
+
+    assert [message['role'] for message in messages] == ['user', 'assistant', 'user']
+    assert 'Summary' in messages[0]['content'][1]['text']
+    assert messages[1]['content'][0]['text'] == 'Test message 4'
+    assert messages[2]['content'][0]['text'] == 'New message'
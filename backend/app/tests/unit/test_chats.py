@@ -1,9 +1,10 @@
 # noqa: D100
+import base64
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from fastapi import status
+from fastapi import HTTPException, status
 from httpx import AsyncClient
 
 from app.domain import (
@@ -12,9 +13,10 @@ from app.domain import (
     ChatMessage as ChatMessageDomain,
 )
 from app.enums import BusinessStageEnum, ChatMessageSenderEnum
-from app.repositories import ChatRepository, BusinessRepository
+from app.repositories import ChatRepository, BusinessRepository, UserRepository
 from app.services.chat_ai_model import openai
 from app import deps
+from app.helpers import helpers_chat
 
 
 @pytest.fixture
@@ -215,7 +217,7 @@ async def test_create_chat(
 )
 @patch.object(openai, 'add_message_to_chat_and_get_response')
 @patch.object(ChatRepository, 'add_message')
-@patch.object(ChatRepository, 'get')
+@patch.object(ChatRepository, 'get_for_new_message')
 @patch.object(BusinessRepository, 'get')
 async def test_create_message(
     mock_get_chat,
@@ -297,3 +299,208 @@ async def test_create_message_bad_request(
 
     assert status.HTTP_422_UNPROCESSABLE_ENTITY == actual_response.status_code
     assert expected_response == actual_response.json()['detail'][0]['msg']
+
+
+@patch.object(ChatRepository, 'get_messages')
+@patch.object(ChatRepository, 'get')
+@patch.object(BusinessRepository, 'get')
+async def test_list_chat_messages(
+    mock_get_business,
+    mock_get,
+    mock_get_messages,
+    test_business,
+    test_chat,
+    test_message,
+    test_message_response,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get_business.return_value = test_business
+    mock_get.return_value = test_chat
+    # Newest first, with one more message than the page size
+    mock_get_messages.return_value = [test_message_response, test_message]
+
+    first_page = await async_client.get(
+        '/businesses/1/chats/1/messages?limit=1',
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_200_OK == first_page.status_code
+    assert [message['id'] for message in first_page.json()['messages']] == [2]
+    assert first_page.json()['next_cursor'] is not None
+    mock_get_messages.assert_awaited_with(chat_id=1, limit=2, before=None)
+
+    mock_get_messages.return_value = [test_message]
+    second_page = await async_client.get(
+        '/businesses/1/chats/1/messages',
+        params={'limit': 1, 'cursor': first_page.json()['next_cursor']},
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_200_OK == second_page.status_code
+    assert [message['id'] for message in second_page.json()['messages']] == [1]
+    assert second_page.json()['next_cursor'] is None
+    mock_get_messages.assert_awaited_with(
+        chat_id=1,
+        limit=2,
+        before=(test_message_response.time, test_message_response.id),
+    )
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    [
+        'invalid',
+        # Cursor with a time without time zone
+        base64.urlsafe_b64encode(b'2020-05-08T13:00:00|2').decode(),
+    ],
+)
+@patch.object(ChatRepository, 'get')
+@patch.object(BusinessRepository, 'get')
+async def test_list_chat_messages_invalid_cursor(
+    mock_get_business,
+    mock_get,
+    cursor,
+    test_business,
+    test_chat,
+    override_get_current_active_user,
+    superuser_token_headers,
+    async_client: AsyncClient,
+):
+    mock_get_business.return_value = test_business
+    mock_get.return_value = test_chat
+
+    actual_response = await async_client.get(
+        '/businesses/1/chats/1/messages',
+        params={'cursor': cursor},
+        headers=superuser_token_headers,
+    )
+
+    assert status.HTTP_400_BAD_REQUEST == actual_response.status_code
+
+
+@patch.object(ChatRepository, 'add_messages')
+@patch.object(helpers_chat, '_get_rag_context')
+@patch.object(helpers_chat, 'chat_ai_model_service')
+async def test_add_store_message_and_get_store_response_stores_messages_together(
+    mock_chat_ai_model_service,
+    mock_get_rag_context,
+    mock_add_messages,
+    test_business,
+    test_chat,
+    test_message,
+    test_message_response,
+    test_user,
+):
+    mock_chat_ai_model_service.update_chat_summary = AsyncMock(return_value=test_chat)
+    mock_chat_ai_model_service.add_message_to_chat_and_get_response = AsyncMock(
+        return_value=test_message_response.content,
+    )
+    mock_get_rag_context.return_value = ('', '')
+    mock_add_messages.return_value = [test_message, test_message_response]
+
+    response_message = await helpers_chat.add_store_message_and_get_store_response(
+        business=test_business,
+        chat=test_chat,
+        message=test_message,
+        user=test_user,
+        chats_repo=ChatRepository(None),
+        plans_repo=None,
+    )
+
+    assert response_message == test_message_response
+    mock_add_messages.assert_awaited_once()
+    stored_messages = mock_add_messages.await_args.args[0]
+    assert [message.sender for message in stored_messages] == [
+        ChatMessageSenderEnum.USER,
+        ChatMessageSenderEnum.AI_MODEL,
+    ]
+
+
+@patch.object(ChatRepository, 'update_summary')
+@patch.object(ChatRepository, 'add_messages')
+@patch.object(helpers_chat, '_get_rag_context')
+@patch.object(helpers_chat, 'chat_ai_model_service')
+async def test_add_store_message_and_get_store_response_stores_chat_summary(
+    mock_chat_ai_model_service,
+    mock_get_rag_context,
+    mock_add_messages,
+    mock_update_summary,
+    test_business,
+    test_chat,
+    test_message,
+    test_message_response,
+    test_user,
+):
+    summarized_chat = test_chat.model_copy(
+        update={'summary': 'Summary', 'summary_until_message_id': test_message.id},
+    )
+    mock_chat_ai_model_service.update_chat_summary = AsyncMock(
+        return_value=summarized_chat,
+    )
+    mock_chat_ai_model_service.add_message_to_chat_and_get_response = AsyncMock(
+        return_value=test_message_response.content,
+    )
+    mock_get_rag_context.return_value = ('', '')
+    mock_add_messages.return_value = [test_message, test_message_response]
+
+    await helpers_chat.add_store_message_and_get_store_response(
+        business=test_business,
+        chat=test_chat,
+        message=test_message,
+        user=test_user,
+        chats_repo=ChatRepository(None),
+        plans_repo=None,
+    )
+
+    mock_update_summary.assert_awaited_once_with(
+        chat_id=test_chat.id,
+        summary='Summary',
+        summary_until_message_id=test_message.id,
+    )
+    model_call = mock_chat_ai_model_service.add_message_to_chat_and_get_response
+    assert model_call.await_args.kwargs['chat'] == summarized_chat
+
+
+@patch.object(UserRepository, 'subtract_credits')
+@patch.object(helpers_chat, 'chat_ai_model_service')
+async def test_subtract_user_credits_for_new_message_in_chat(
+    mock_chat_ai_model_service,
+    mock_subtract_credits,
+    test_chat,
+    test_user,
+):
+    mock_chat_ai_model_service.get_new_message_credit_cost.return_value = 3
+    mock_subtract_credits.return_value = True
+    # The credits of the user may be stale, so they are checked in the database
+    user = test_user.model_copy(update={'available_credits': 0})
+
+    await helpers_chat.subtract_user_credits_for_new_message_in_chat(
+        user=user,
+        chat=test_chat,
+        users_repo=UserRepository(None),
+    )
+
+    mock_subtract_credits.assert_awaited_once_with(user_id=user.id, credits=3)
+
+
+@patch.object(UserRepository, 'subtract_credits')
+@patch.object(helpers_chat, 'chat_ai_model_service')
+async def test_subtract_user_credits_for_new_message_in_chat_not_enough_credits(
+    mock_chat_ai_model_service,
+    mock_subtract_credits,
+    test_chat,
+    test_user,
+):
+    mock_chat_ai_model_service.get_new_message_credit_cost.return_value = 3
+    mock_subtract_credits.return_value = False
+
+    with pytest.raises(HTTPException) as exc_info:
+        await helpers_chat.subtract_user_credits_for_new_message_in_chat(
+            user=test_user,
+            chat=test_chat,
+            users_repo=UserRepository(None),
+        )
+
+    assert exc_info.value.status_code == status.HTTP_402_PAYMENT_REQUIRED
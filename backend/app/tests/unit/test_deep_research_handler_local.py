@@ -0,0 +1,123 @@
+# noqa: D100
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+from app.background_jobs import job_queue
+from app.domain import Job as JobDomain, PendingResearch as PendingResearchDomain
+from app.enums import JobTypeEnum, ResearchRequestStatusEnum
+from app.repositories import JobRepository, PendingResearchRepository
+from app.schemas import ResearchExtended
+from app.services.deep_research_handler import DeepResearchHandlerLocal
+
+
+@asynccontextmanager
+async def fake_session_factory():
+    yield AsyncMock()
+
+
+def get_pending_research(pending_research_id: int, attempts: int = 0):
+    now = datetime.now(timezone.utc)
+    return PendingResearchDomain(
+        id=pending_research_id,
+        research_id=f'research_{pending_research_id}',
+        business_id=5,
+        attempts=attempts,
+        created_at=now - timedelta(minutes=5),
+        next_check_at=now,
+    )
+
+
+@patch.object(job_queue, 'enqueue')
+@patch.object(JobRepository, 'create')
+@patch.object(PendingResearchRepository, 'get_next_due')
+@patch.object(PendingResearchRepository, 'get')
+@patch.object(PendingResearchRepository, 'reschedule')
+@patch.object(PendingResearchRepository, 'delete')
+@patch.object(PendingResearchRepository, 'claim_due')
+async def test_poll_stores_completed_and_backs_off_pending_researches(
+    mock_claim_due,
+    mock_delete,
+    mock_reschedule,
+    mock_get,
+    mock_get_next_due,
+    mock_create_job,
+    mock_enqueue,
+):
+    mock_claim_due.return_value = [
+        get_pending_research(1),
+        get_pending_research(2, attempts=2),
+    ]
+    mock_get.return_value = get_pending_research(1)
+    mock_get_next_due.return_value = None
+    mock_create_job.return_value = JobDomain(
+        id=7,
+        type=JobTypeEnum.BUSINESS_RESEARCH_STORE,
+        params={},
+    )
+    deep_research_provider = AsyncMock()
+    deep_research_provider.get_deep_research_async.side_effect = [
+        ResearchExtended(
+            response_id='research_1',
+            status=ResearchRequestStatusEnum.COMPLETED,
+        ),
+        ResearchExtended(
+            response_id='research_2',
+            status=ResearchRequestStatusEnum.IN_PROGRESS,
+        ),
+    ]
+    dr_handler_provider = DeepResearchHandlerLocal(
+        deep_research_provider=deep_research_provider,
+        poll_interval_seconds=30,
+        initial_backoff_seconds=60,
+        max_backoff_seconds=400,
+        batch_size=10,
+        session_factory=fake_session_factory,
+    )
+
+    assert await dr_handler_provider.poll() == 30
+
+    assert mock_create_job.await_args.args[0].params == {
+        'research_id': 'research_1',
+        'business_id': 5,
+    }
+    mock_enqueue.assert_called_once_with(7)
+    mock_delete.assert_awaited_once_with(1)
+    reschedule_kwargs = mock_reschedule.await_args.kwargs
+    assert reschedule_kwargs['pending_research_id'] == 2
+    assert reschedule_kwargs['attempts'] == 3
+    backoff = reschedule_kwargs['next_check_at'] - datetime.now(timezone.utc)
+    assert timedelta(seconds=390) < backoff <= timedelta(seconds=400)
+
+
+@patch.object(JobRepository, 'create')
+@patch.object(PendingResearchRepository, 'get_next_due')
+@patch.object(PendingResearchRepository, 'get')
+@patch.object(PendingResearchRepository, 'delete')
+@patch.object(PendingResearchRepository, 'claim_due')
+async def test_poll_skips_completed_researches_no_longer_tracked(
+    mock_claim_due,
+    mock_delete,
+    mock_get,
+    mock_get_next_due,
+    mock_create_job,
+):
+    mock_claim_due.return_value = [get_pending_research(1)]
+    # Its business was deleted while the research was being checked
+    mock_get.return_value = None
+    mock_get_next_due.return_value = None
+    deep_research_provider = AsyncMock()
+    deep_research_provider.get_deep_research_async.return_value = ResearchExtended(
+        response_id='research_1',
+        status=ResearchRequestStatusEnum.COMPLETED,
+    )
+    dr_handler_provider = DeepResearchHandlerLocal(
+        deep_research_provider=deep_research_provider,
+        batch_size=10,
+        session_factory=fake_session_factory,
+    )
+
+    await dr_handler_provider.poll()
+
+    mock_create_job.assert_not_awaited()
+    mock_delete.assert_not_awaited()
@@ -0,0 +1,24 @@
+# noqa: D100
+import httpx
+
+from app.enums import ResearchRequestStatusEnum
+from app.services.deep_research import DeepResearchPerplexity
+
+
+async def test_get_deep_research_async_returns_none_if_not_found():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith('/found'):
+            return httpx.Response(200, json={'id': 'found', 'status': 'CREATED'})
+        return httpx.Response(404)
+
+    deep_research_provider = DeepResearchPerplexity()
+    deep_research_provider.client = httpx.AsyncClient(
+        base_url='https://perplexity.test',
+        transport=httpx.MockTransport(handler),
+    )
+
+    research = await deep_research_provider.get_deep_research_async('found')
+    assert research is not None
+    assert research.response_id == 'found'
+    assert research.status == ResearchRequestStatusEnum.CREATED
+    assert await deep_research_provider.get_deep_research_async('missing') is None
@@ -0,0 +1,122 @@
+# noqa: D100
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.embedding import EmbeddingCached
+
+
+def test_embedding_cached_memory_tier(fake_embedding_provider):
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider, memory_max_entries=10
+    )
+
+    assert cached_provider.create_embedding('hello') == [5.0, 1.0]
+    assert cached_provider.create_embedding('hello') == [5.0, 1.0]
+    assert fake_embedding_provider.embedded_texts == ['hello']
+    assert cached_provider.stats['memory_hits'] == 1
+    assert cached_provider.stats['misses'] == 1
+
+
+async def test_embedding_cached_async(fake_embedding_provider):
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider, memory_max_entries=10
+    )
+
+    assert await cached_provider.async_create_embedding('hello') == [5.0, 1.0]
+    assert cached_provider.create_embedding('hello') == [5.0, 1.0]
+    assert fake_embedding_provider.embedded_texts == ['hello']
+
+
+def test_embedding_cached_batch_only_embeds_missing_texts(fake_embedding_provider):
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider, memory_max_entries=10
+    )
+    cached_provider.create_embedding('b')
+
+    embeddings = list(cached_provider.create_embeddings(['a', 'b', 'cc']))
+
+    assert embeddings == [[1.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+    assert fake_embedding_provider.embedded_texts == ['b', 'a', 'cc']
+
+
+def test_embedding_cached_persistent_tier(fake_embedding_provider, tmp_path):
+    persistent_path = str(tmp_path / 'embeddings.sqlite')
+    EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+        persistent_path=persistent_path,
+    ).create_embedding('hello')
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+        persistent_path=persistent_path,
+    )
+
+    assert cached_provider.create_embedding('hello') == [5.0, 1.0]
+    assert fake_embedding_provider.embedded_texts == ['hello']
+    assert cached_provider.stats['persistent_hits'] == 1
+
+
+def test_embedding_cached_persistent_tier_removes_oldest_entries(
+    fake_embedding_provider,
+    tmp_path,
+):
+    persistent_path = str(tmp_path / 'embeddings.sqlite')
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+        persistent_path=persistent_path,
+        persistent_max_entries=2,
+    )
+    for text in ['a', 'b', 'c']:
+        cached_provider.create_embedding(text)
+
+    # Oldest entries are removed when the store is opened again
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+        persistent_path=persistent_path,
+        persistent_max_entries=2,
+    )
+    for text in ['b', 'c', 'a']:
+        cached_provider.create_embedding(text)
+
+    assert fake_embedding_provider.embedded_texts == ['a', 'b', 'c', 'a']
+
+
+def test_embedding_cached_persistent_tier_without_entries(
+    fake_embedding_provider,
+    tmp_path,
+):
+    persistent_path = str(tmp_path / 'embeddings.sqlite')
+    EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+        persistent_path=persistent_path,
+    ).create_embedding('a')
+
+    # Stored entries are removed, and new ones are not stored
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=0,
+        persistent_path=persistent_path,
+        persistent_max_entries=0,
+    )
+    for text in ['a', 'b', 'b']:
+        cached_provider.create_embedding(text)
+
+    assert fake_embedding_provider.embedded_texts == ['a', 'a', 'b', 'b']
+    assert cached_provider.stats['persistent_hits'] == 0
+
+
+def test_embedding_cached_stats_from_threads(fake_embedding_provider):
+    cached_provider = EmbeddingCached(
+        provider=fake_embedding_provider,
+        memory_max_entries=10,
+    )
+    cached_provider.create_embedding('hello')
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cached_provider.create_embedding, ['hello'] * 1000))
+
+    assert cached_provider.stats['memory_hits'] == 1000
+    assert cached_provider.stats['misses'] == 1
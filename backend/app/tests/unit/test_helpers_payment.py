@@ -0,0 +1,122 @@
+# noqa: D100
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain import BusinessIdea as BusinessIdeaDomain
+from app.enums import BusinessStageEnum, PaymentWebhookEventStatusEnum
+from app.exceptions.subscriptions import SubscriptionWebhookErrors
+from app.helpers import helpers_payment
+from app.repositories import BusinessRepository, PaymentWebhookEventRepository
+
+
+def get_business_idea(business_id: int) -> BusinessIdeaDomain:
+    return BusinessIdeaDomain(
+        id=business_id,
+        user_id=1,
+        stage=BusinessStageEnum.IDEA,
+        name='Veyra',
+        location='Spain',
+        description='Veyra is super cool!',
+        goal='Help entrepreneurs',
+        team_size=3,
+        team_description='Super nice guys.',
+        user_position='CTO and backend developer',
+    )
+
+
+@patch.object(helpers_payment.background_jobs_settings, 'BUSINESSES_CONCURRENCY', 2)
+@patch.object(BusinessRepository, 'get_multi')
+async def test_run_for_user_businesses_bounds_concurrency_and_collects_errors(
+    mock_get_multi,
+):
+    mock_get_multi.return_value = [get_business_idea(i) for i in range(1, 6)]
+    running_business_ids = set()
+    max_running = 0
+    done_business_ids = []
+
+    async def task(business, business_id):
+        nonlocal max_running
+        running_business_ids.add(business_id)
+        max_running = max(max_running, len(running_business_ids))
+        await asyncio.sleep(0.01)
+        running_business_ids.remove(business_id)
+        if business_id == 3:
+            raise RuntimeError('Perplexity is down')
+        done_business_ids.append(business_id)
+
+    with pytest.raises(SubscriptionWebhookErrors) as exc_info:
+        await helpers_payment._run_for_user_businesses(
+            user_id=1,
+            business_repo=BusinessRepository(None),
+            tasks=[task],
+        )
+
+    assert max_running == 2
+    assert sorted(done_business_ids) == [1, 2, 4, 5]
+    assert [error.business_id for error in exc_info.value.errors] == [3]
+
+
+def get_webhook_request() -> MagicMock:
+    request = MagicMock()
+    request.body = AsyncMock(return_value=b'{}')
+    request.headers = {'stripe-signature': 'signature'}
+    return request
+
+
+@patch.object(helpers_payment, '_handle_subscription_event')
+@patch.object(PaymentWebhookEventRepository, 'update_status')
+@patch.object(PaymentWebhookEventRepository, 'claim')
+@patch.object(helpers_payment, 'verify_webhook_signature')
+async def test_handle_subscription_webhook_skips_claimed_events(
+    mock_verify_webhook_signature,
+    mock_claim,
+    mock_update_status,
+    mock_handle_subscription_event,
+):
+    mock_verify_webhook_signature.return_value = MagicMock(id='evt_1')
+    mock_claim.return_value = False
+
+    await helpers_payment.handle_subscription_webhook(
+        request=get_webhook_request(),
+        users_repo=MagicMock(),
+        plans_repo=MagicMock(),
+        jobs_repo=MagicMock(),
+        payment_webhook_events_repo=PaymentWebhookEventRepository(None),
+    )
+
+    mock_handle_subscription_event.assert_not_called()
+    mock_update_status.assert_not_called()
+
+
+@patch.object(helpers_payment, '_handle_subscription_event')
+@patch.object(PaymentWebhookEventRepository, 'rollback')
+@patch.object(PaymentWebhookEventRepository, 'update_status')
+@patch.object(PaymentWebhookEventRepository, 'claim')
+@patch.object(helpers_payment, 'verify_webhook_signature')
+async def test_handle_subscription_webhook_marks_failed_events(
+    mock_verify_webhook_signature,
+    mock_claim,
+    mock_update_status,
+    mock_rollback,
+    mock_handle_subscription_event,
+):
+    mock_verify_webhook_signature.return_value = MagicMock(id='evt_1')
+    mock_claim.return_value = True
+    mock_handle_subscription_event.side_effect = RuntimeError('Stripe is down')
+
+    with pytest.raises(RuntimeError):
+        await helpers_payment.handle_subscription_webhook(
+            request=get_webhook_request(),
+            users_repo=MagicMock(),
+            plans_repo=MagicMock(),
+            jobs_repo=MagicMock(),
+            payment_webhook_events_repo=PaymentWebhookEventRepository(None),
+        )
+
+    mock_rollback.assert_awaited_once()
+    mock_update_status.assert_awaited_once_with(
+        event_id='evt_1',
+        status=PaymentWebhookEventStatusEnum.FAILED,
+    )
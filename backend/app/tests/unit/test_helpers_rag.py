@@ -0,0 +1,141 @@
+# noqa: D100
+from unittest.mock import patch
+
+import pytest
+import tiktoken
+
+from app.enums import RAGUploadModeEnum
+from app.helpers import helpers_rag
+from app.services import ServicesFactory
+from app.services.vector_database import VectorDatabaseLocal
+from app.settings import RAGSettings
+
+
+@pytest.fixture(autouse=True)
+def byte_tokenizer():
+    """Patch the tokenizer with a byte-level one, which needs no downloaded files."""
+    tokenizer = tiktoken.Encoding(
+        name='bytes',
+        pat_str=r'\S+|\s+',
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={},
+    )
+    with patch.object(helpers_rag, '_get_tokenizer', return_value=tokenizer):
+        yield tokenizer
+
+
+@pytest.fixture
+def fake_embedding_provider(fake_embedding_provider):
+    """Patch the services factory with the fake embedding provider of the conftest."""
+    with patch.object(
+        ServicesFactory,
+        'get_embedding_provider',
+        return_value=fake_embedding_provider,
+    ):
+        yield fake_embedding_provider
+
+
+@pytest.fixture
+def local_vector_database():
+    local_vector_database = VectorDatabaseLocal(storage_path='')
+    with patch.object(
+        ServicesFactory,
+        'get_vector_database_provider',
+        return_value=local_vector_database,
+    ):
+        yield local_vector_database
+
+
+def test_chunk_text_with_overlap():
+    assert helpers_rag.chunk_text(text='abcdefghij', max_tokens=6, overlap=2) == [
+        'abcdef',
+        'efghij',
+    ]
+    assert helpers_rag.chunk_text(text='abc', max_tokens=6, overlap=2) == ['abc']
+
+
+def test_chunk_text_does_not_split_characters():
+    assert helpers_rag.chunk_text(text='añb€x', max_tokens=4, overlap=1) == [
+        'añb',
+        'b€',
+        '€x',
+    ]
+
+
+def test_iter_chunk_text_is_lazy(byte_tokenizer):
+    text = 'first paragraph\n\nsecond paragraph'
+    with patch.object(
+        byte_tokenizer,
+        'encode_ordinary',
+        wraps=byte_tokenizer.encode_ordinary,
+    ) as mock_encode:
+        chunks = helpers_rag.iter_chunk_text(text=text, max_tokens=5, overlap=0)
+        assert next(chunks) == 'first'
+        mock_encode.assert_called_once_with('first paragraph\n\n')
+
+
+def test_iter_chunk_text_by_sentences_packs_whole_sentences():
+    text = 'One two. Three four! Five six?\nSeven.'
+    chunks = helpers_rag.iter_chunk_text_by_sentences(
+        text=text,
+        max_tokens=22,
+        overlap=12,
+    )
+
+    assert list(chunks) == [
+        'One two. Three four!',
+        'Three four! Five six?',
+        'Five six?\nSeven.',
+    ]
+
+
+def test_iter_chunk_text_by_sentences_splits_long_sentences():
+    chunks = helpers_rag.iter_chunk_text_by_sentences(
+        text='Short. abcdefghij',
+        max_tokens=6,
+        overlap=0,
+    )
+
+    assert list(chunks) == ['Short.', 'abcdef', 'ghij']
+
+
+def test_iter_chunk_text_by_headings_prefixes_section_heading():
+    text = 'Intro.\n## Market\nBig market. Growing fast.\n## Risks\nMany risks.'
+    chunks = helpers_rag.iter_chunk_text_by_headings(
+        text=text,
+        max_tokens=25,
+        overlap=0,
+    )
+
+    assert list(chunks) == [
+        'Intro.',
+        '## Market\nBig market.',
+        '## Market\nGrowing fast.',
+        '## Risks\nMany risks.',
+    ]
+
+
+@pytest.mark.parametrize('upload_mode', list(RAGUploadModeEnum))
+def test_chunk_and_upload_text_only_embeds_new_chunks(
+    upload_mode,
+    fake_embedding_provider,
+    local_vector_database,
+):
+    settings = RAGSettings(MAX_TOKENS=4, OVERLAP=0, UPLOAD_MODE=upload_mode)
+    helpers_rag._chunk_and_upload_text(text='aaaabbbb', settings=settings, namespace='n')
+    fake_embedding_provider.embedded_texts.clear()
+
+    helpers_rag._chunk_and_upload_text(text='aaaacccc', settings=settings, namespace='n')
+
+    stored_texts = [
+        metadata['text']
+        for _, _, metadata in local_vector_database.fetch_vectors(
+            index_name=settings.INDEX_NAME,
+            namespace='n',
+        )
+    ]
+    assert sorted(stored_texts) == ['aaaa', 'cccc']
+    if upload_mode == RAGUploadModeEnum.INCREMENTAL:
+        assert fake_embedding_provider.embedded_texts == ['cccc']
+    else:
+        assert fake_embedding_provider.embedded_texts == ['aaaa', 'cccc']
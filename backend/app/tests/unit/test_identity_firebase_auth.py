@@ -0,0 +1,48 @@
+# noqa: D100
+import time
+from unittest.mock import patch
+
+from firebase_admin import get_app
+from firebase_admin._token_gen import ID_TOKEN_CERT_URI
+
+from app.services.identity import IdentityFirebaseAuth
+from app.services.identity.firebase_auth import _verified_tokens, firebase_auth
+
+
+@patch.object(firebase_auth, 'verify_id_token')
+def test_verify_and_decode_auth_token_caches_tokens(mock_verify_id_token):
+    _verified_tokens.clear()
+    mock_verify_id_token.return_value = {'sub': 'user_1', 'exp': time.time() + 3600}
+
+    for _ in range(2):
+        token_data = IdentityFirebaseAuth.verify_and_decode_auth_token('token')
+        assert token_data.sub == 'user_1'
+    mock_verify_id_token.assert_called_once_with(id_token='token')
+    _verified_tokens.clear()
+
+
+@patch.object(firebase_auth, 'verify_id_token')
+def test_verify_and_decode_auth_token_does_not_cache_expired_tokens(
+    mock_verify_id_token,
+):
+    _verified_tokens.clear()
+    mock_verify_id_token.return_value = {'sub': 'user_1', 'exp': time.time() - 1}
+
+    for _ in range(2):
+        IdentityFirebaseAuth.verify_and_decode_auth_token('token')
+    assert mock_verify_id_token.call_count == 2
+
+
+def test_refresh_certificates_fetches_certificates_without_cache():
+    IdentityFirebaseAuth()
+    # Private Firebase Admin attributes used by the refresh. Patching them fails if
+    # they no longer exist.
+    token_verifier = firebase_auth._get_client(get_app())._token_verifier
+    with patch.object(token_verifier, 'request') as mock_request:
+        mock_request.return_value.status = 200
+        IdentityFirebaseAuth.refresh_certificates()
+
+    mock_request.assert_called_once_with(
+        url=ID_TOKEN_CERT_URI,
+        headers={'Cache-Control': 'no-cache'},
+    )
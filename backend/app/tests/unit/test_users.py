@@ -1,12 +1,14 @@
 from unittest.mock import patch
 
 import pytest
-from fastapi import status
+from fastapi import Request, status
 from httpx import AsyncClient
 
+from app.deps import get_current_user
 from app.domain import Plan as PlanDomain, User as UserDomain
 from app.enums import UserLanguageEnum, UserPlanEnum, UserRoleEnum
 from app.repositories import PlanRepository, UserRepository
+from app.schemas import TokenData
 
 
 @pytest.fixture
@@ -504,3 +506,22 @@ async def test_update_user_bad_request(
 
     assert status.HTTP_422_UNPROCESSABLE_ENTITY == actual_response.status_code
     assert expected_response == actual_response.json()['detail'][0]['msg']
+
+
+@patch.object(UserRepository, 'get_by_external_id')
+async def test_get_current_user_is_looked_up_once_per_request(
+    mock_get_by_external_id,
+    test_user,
+    superuser_token,
+):
+    request = Request(scope={'type': 'http', 'state': {}})
+    mock_get_by_external_id.return_value = test_user
+
+    for _ in range(2):
+        user = await get_current_user(
+            request=request,
+            token_data=TokenData(sub=superuser_token),
+            users_repo=UserRepository(None),
+        )
+        assert user == test_user
+    mock_get_by_external_id.assert_awaited_once_with(external_id=superuser_token)
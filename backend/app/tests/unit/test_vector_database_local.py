@@ -0,0 +1,96 @@
+# noqa: D100
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.services.vector_database import VectorDatabaseLocal
+
+
+VECTORS = [
+    ('a', [1.0, 0.0, 0.0], {'text': 'first'}),
+    ('b', [0.0, 1.0, 0.0], {'text': 'second'}),
+    ('c', [0.7, 0.7, 0.0], {'text': 'third'}),
+]
+
+
+def test_local_search_vectors_returns_top_k_by_cosine():
+    vector_database = VectorDatabaseLocal(storage_path='')
+    vector_database.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+
+    assert vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[2.0, 0.1, 0.0],
+        top_k=2,
+    ) == ['first', 'third']
+    assert (
+        vector_database.search_vectors(
+            index_name='i',
+            namespace='other',
+            query_vector=[2.0, 0.1, 0.0],
+            top_k=2,
+        )
+        == []
+    )
+
+
+def test_local_upsert_and_delete_vectors_by_id():
+    vector_database = VectorDatabaseLocal(storage_path='')
+    vector_database.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+
+    vector_database.upsert_vectors(
+        index_name='i',
+        namespace='n',
+        vectors=[('b', [1.0, 0.0, 0.0], {'text': 'second v2'})],
+    )
+    vector_database.delete_vectors_by_id(index_name='i', namespace='n', vector_ids=['a'])
+
+    assert vector_database.list_vector_ids(index_name='i', namespace='n') == {'b', 'c'}
+    assert vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[1.0, 0.0, 0.0],
+        top_k=1,
+    ) == ['second v2']
+
+
+def test_local_vectors_are_persisted(tmp_path):
+    VectorDatabaseLocal(storage_path=str(tmp_path)).upload_vectors(
+        index_name='i',
+        namespace='n',
+        vectors=VECTORS,
+    )
+    vector_database = VectorDatabaseLocal(storage_path=str(tmp_path))
+
+    assert vector_database.list_vector_ids(index_name='i', namespace='n') == {
+        'a',
+        'b',
+        'c',
+    }
+    vector_database.delete_vectors(index_name='i', namespace='n')
+    assert (
+        VectorDatabaseLocal(storage_path=str(tmp_path)).list_vector_ids(
+            index_name='i',
+            namespace='n',
+        )
+        == set()
+    )
+
+
+def test_local_vectors_keep_previous_version_if_save_is_interrupted(tmp_path):
+    vector_database = VectorDatabaseLocal(storage_path=str(tmp_path))
+    vector_database.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+
+    with patch.object(os, 'replace', side_effect=OSError('Interrupted')):
+        with pytest.raises(OSError):
+            vector_database.upload_vectors(
+                index_name='i',
+                namespace='n',
+                vectors=[('d', [0.0, 0.0, 1.0], {'text': 'fourth'})],
+            )
+
+    assert VectorDatabaseLocal(storage_path=str(tmp_path)).list_vector_ids(
+        index_name='i',
+        namespace='n',
+    ) == {'a', 'b', 'c'}
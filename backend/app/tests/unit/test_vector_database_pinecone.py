@@ -0,0 +1,140 @@
+# noqa: D100
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from pinecone.exceptions import PineconeException
+from pinecone.grpc.vector_factory_grpc import VectorFactoryGRPC
+
+from app.services.vector_database import VectorDatabasePinecone
+from app.services.vector_database import pinecone as vector_database_pinecone
+
+
+VECTORS = [(f'v{i}', [float(i), 0.0, 1.0], {'text': f'text {i}'}) for i in range(5)]
+
+
+class FakeGRPCIndex:
+    """Index that records the upserted batches, optionally failing or slowing down."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0):
+        self.batches: list[list[str]] = []
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures = failures
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace):
+        with self._lock:
+            self.calls += 1
+            fails = self.calls <= self._failures
+        if fails:
+            # Failures take half the time, so they happen while other upserts run
+            time.sleep(self._delay / 2)
+            raise PineconeException('Upsert failed')
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self._delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.batches.append([vector.id for vector in vectors])
+
+
+@pytest.fixture
+def vector_database():
+    with patch.object(vector_database_pinecone, 'Pinecone'):
+        yield VectorDatabasePinecone()
+
+
+def vector_bytes(vector: tuple[str, list[float], dict[str, str]]) -> int:
+    return VectorFactoryGRPC.build(vector).ByteSize() + 8
+
+
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_BATCH_VECTORS', 2)
+def test_pinecone_batch_vectors_splits_by_count():
+    batches = VectorDatabasePinecone._batch_vectors(vectors=VECTORS)
+
+    assert [[vector.id for vector in batch] for batch in batches] == [
+        ['v0', 'v1'],
+        ['v2', 'v3'],
+        ['v4'],
+    ]
+
+
+def test_pinecone_batch_vectors_splits_by_size():
+    # The 90% of the limit used for batches fits two vectors, but not three
+    message_limit_bytes = int(2.5 * vector_bytes(VECTORS[0]) / 0.9)
+
+    with patch.object(
+        vector_database_pinecone.pinecone_settings,
+        'MESSAGE_LIMIT_BYTES',
+        message_limit_bytes,
+    ):
+        batches = list(VectorDatabasePinecone._batch_vectors(vectors=VECTORS))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+@patch.object(
+    vector_database_pinecone.pinecone_settings, 'UPSERT_RETRY_BACKOFF_SECONDS', 0
+)
+def test_pinecone_upsert_batch_retries_errors():
+    index = FakeGRPCIndex(failures=1)
+    batch = [VectorFactoryGRPC.build(VECTORS[0])]
+
+    VectorDatabasePinecone._upsert_batch(index=index, namespace='n', batch=batch)
+
+    assert index.calls == 2
+    assert index.batches == [['v0']]
+
+
+@patch.object(
+    vector_database_pinecone.pinecone_settings, 'UPSERT_RETRY_BACKOFF_SECONDS', 0
+)
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_RETRIES', 2)
+def test_pinecone_upsert_batch_raises_after_max_retries():
+    index = FakeGRPCIndex(failures=3)
+    batch = [VectorFactoryGRPC.build(VECTORS[0])]
+
+    with pytest.raises(PineconeException):
+        VectorDatabasePinecone._upsert_batch(index=index, namespace='n', batch=batch)
+
+    assert index.calls == 3
+    assert index.batches == []
+
+
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_BATCH_VECTORS', 1)
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_CONCURRENCY', 2)
+def test_pinecone_upsert_vectors_caps_batches_in_flight(vector_database):
+    # The executor has more workers than the batches allowed in flight
+    index = FakeGRPCIndex(delay=0.05)
+
+    upserted_vector_ids = vector_database._do_upsert_vectors(
+        index=index,
+        namespace='n',
+        vectors=VECTORS,
+    )
+
+    assert upserted_vector_ids == {'v0', 'v1', 'v2', 'v3', 'v4'}
+    assert sorted(batch for batches in index.batches for batch in batches) == sorted(
+        upserted_vector_ids
+    )
+    assert index.max_in_flight == 2
+
+
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_RETRIES', 0)
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_BATCH_VECTORS', 1)
+@patch.object(vector_database_pinecone.pinecone_settings, 'UPSERT_MAX_CONCURRENCY', 2)
+def test_pinecone_upsert_vectors_awaits_batches_in_flight_on_error(vector_database):
+    # The first batch fails while the second one is being upserted, and the third
+    # one is not sent
+    index = FakeGRPCIndex(failures=1, delay=0.1)
+
+    with pytest.raises(PineconeException):
+        vector_database._do_upsert_vectors(index=index, namespace='n', vectors=VECTORS)
+
+    assert index.in_flight == 0
+    assert index.batches == [['v1']]
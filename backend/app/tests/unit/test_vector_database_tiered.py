@@ -0,0 +1,125 @@
+# noqa: D100
+from unittest.mock import patch
+
+from app.services.vector_database import VectorDatabaseLocal, VectorDatabaseTiered
+
+
+VECTORS = [
+    ('a', [1.0, 0.0], {'text': 'first'}),
+    ('b', [0.0, 1.0], {'text': 'second'}),
+]
+
+
+def test_tiered_search_loads_namespace_once():
+    cold_provider = VectorDatabaseLocal(storage_path='')
+    cold_provider.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+    vector_database = VectorDatabaseTiered(cold_provider=cold_provider)
+
+    with patch.object(
+        cold_provider,
+        'fetch_vectors',
+        wraps=cold_provider.fetch_vectors,
+    ) as mock_fetch_vectors:
+        for _ in range(3):
+            assert vector_database.search_vectors(
+                index_name='i',
+                namespace='n',
+                query_vector=[0.1, 1.0],
+                top_k=1,
+            ) == ['second']
+
+    mock_fetch_vectors.assert_called_once()
+
+
+def test_tiered_writes_invalidate_namespace():
+    cold_provider = VectorDatabaseLocal(storage_path='')
+    cold_provider.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+    vector_database = VectorDatabaseTiered(cold_provider=cold_provider)
+    vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[1.0, 0.0],
+        top_k=1,
+    )
+
+    vector_database.upsert_vectors(
+        index_name='i',
+        namespace='n',
+        vectors=[('c', [1.0, 0.1], {'text': 'third'})],
+    )
+
+    assert vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[1.0, 0.1],
+        top_k=1,
+    ) == ['third']
+
+
+def test_tiered_evicts_namespaces_over_memory_budget():
+    cold_provider = VectorDatabaseLocal(storage_path='')
+    cold_provider.upload_vectors(index_name='i', namespace='n1', vectors=VECTORS)
+    cold_provider.upload_vectors(index_name='i', namespace='n2', vectors=VECTORS)
+    vector_database = VectorDatabaseTiered(
+        cold_provider=cold_provider,
+        memory_budget_bytes=50,
+    )
+
+    for namespace in ['n1', 'n2']:
+        vector_database.search_vectors(
+            index_name='i',
+            namespace=namespace,
+            query_vector=[1.0, 0.0],
+            top_k=1,
+        )
+
+    assert list(vector_database._hot_namespaces) == [('i', 'n2')]
+
+
+def test_tiered_does_not_fetch_namespaces_over_max_vectors():
+    cold_provider = VectorDatabaseLocal(storage_path='')
+    cold_provider.upload_vectors(index_name='i', namespace='n', vectors=VECTORS)
+    vector_database = VectorDatabaseTiered(
+        cold_provider=cold_provider,
+        max_namespace_vectors=1,
+    )
+
+    with patch.object(
+        cold_provider,
+        'count_vectors',
+        wraps=cold_provider.count_vectors,
+    ) as mock_count_vectors, patch.object(
+        cold_provider,
+        'fetch_vectors',
+    ) as mock_fetch_vectors:
+        for _ in range(3):
+            assert vector_database.search_vectors(
+                index_name='i',
+                namespace='n',
+                query_vector=[0.1, 1.0],
+                top_k=1,
+            ) == ['second']
+
+    mock_count_vectors.assert_called_once()
+    mock_fetch_vectors.assert_not_called()
+
+
+def test_tiered_writes_invalidate_cold_namespace():
+    cold_provider = VectorDatabaseLocal(storage_path='')
+    vector_database = VectorDatabaseTiered(cold_provider=cold_provider)
+    vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[1.0, 0.0],
+        top_k=1,
+    )
+
+    vector_database.upsert_vectors(index_name='i', namespace='n', vectors=VECTORS)
+    vector_database.search_vectors(
+        index_name='i',
+        namespace='n',
+        query_vector=[1.0, 0.0],
+        top_k=1,
+    )
+
+    assert list(vector_database._hot_namespaces) == [('i', 'n')]